@@ -5,6 +5,7 @@ import statistics
 from pathlib import Path
 from collections import defaultdict
 from typing import Any
+from streaming_analysis import StreamingAnalysis, GroupedStats, BestRows
 
 OUTPUT_DIR: Path = Path("output/experiments")
 ANALYSIS_DIR: Path = Path("output/analysis")
@@ -23,21 +24,22 @@ def analyze_constructive() -> None:
         print(f"No constructive results found at {csv_file}")
         return
 
-    with open(csv_file, "r") as f:
-        reader = csv.DictReader(f)
-        results: list[dict[str, str]] = list(reader)
-    
-    # Group by instance + method so we compute per-instance statistics first
-    by_instance_and_method: defaultdict[str, list[dict[str, float]]] = defaultdict(list)
-    for row in results:
+    analysis = StreamingAnalysis()
+    by_instance_and_method: GroupedStats = _add_constructive(analysis)
+    analysis.run(OUTPUT_DIR)
+    _report_constructive(by_instance_and_method)
+
+# Group by instance + method so we compute per-instance statistics first
+def _add_constructive(analysis: StreamingAnalysis) -> GroupedStats:
+    by_instance_and_method = GroupedStats()
+    def consume(row: dict[str, str], index: int) -> None:
         instance = row.get("instance_file") or ""
         method = row.get("method") or ""
-        key = f"{instance} | {method}"
-        by_instance_and_method[key].append({
-            "benefit": float(row.get("benefit", 0.0)),
-            "time": float(row.get("time", 0.0))
-        })
+        by_instance_and_method.add(f"{instance} | {method}", float(row.get("benefit", 0.0)), float(row.get("time", 0.0)))
+    analysis.add_consumer("constructive.csv", consume)
+    return by_instance_and_method
 
+def _report_constructive(by_instance_and_method: GroupedStats) -> None:
     # Print header for per-instance constructive results
     print("="*50)
     print("CONSTRUCTIVE METHODS ANALYSIS")
@@ -49,13 +51,11 @@ def analyze_constructive() -> None:
     summary_rows: list[dict[str, Any]] = []
     per_method_medians: defaultdict[str, dict[str, float]] = defaultdict(dict)
 
-    for key, runs in sorted(by_instance_and_method.items()):
+    for key, (benefit_stats, time_stats) in sorted(by_instance_and_method.items()):
         instance, method = key.split(" | ")
-        benefits = [r["benefit"] for r in runs]
-        times = [r["time"] for r in runs]
 
-        stats = _get_benefit_stats(benefits)
-        avg_time = statistics.mean(times) if times else 0.0
+        stats = benefit_stats.get_stats()
+        avg_time = time_stats.mean
 
         print(f"{instance.split('/')[-1]:<30} {method:<40} {stats['count']:>6} {stats['best']:>10.0f} {stats['median']:>8.0f} {stats['avg']:>10.2f} {stats['std']:>10.2f} {avg_time:>10.6f}s")
 
@@ -126,26 +126,32 @@ def analyze_constructive() -> None:
 # Analyze and print local search results
 def analyze_local_search() -> None:
     csv_file: Path = OUTPUT_DIR / "local_search.csv"
-    
-    with open(csv_file, "r") as f:
-        reader = csv.DictReader(f)
-        results: list[dict[str, str]] = list(reader)
-    
-    # Group by instance + configuration to compute per-instance statistics first
-    by_instance_and_config: defaultdict[str, list[dict[str, float]]] = defaultdict(list)
-    for row in results:
+    if not csv_file.exists():
+        print(f"No local search results found at {csv_file}")
+        return
+
+    analysis = StreamingAnalysis()
+    by_instance_and_config: GroupedStats = _add_search_configs(analysis, "local_search.csv")
+    analysis.run(OUTPUT_DIR)
+    _report_local_search(by_instance_and_config)
+
+# Group by instance + configuration to compute per-instance statistics first (local search and ILS rows)
+# Some harness versions write the neighborhood column as `neighborhoods` while others use
+# `neighborhood_names`. Be tolerant and use whichever is present.
+def _add_search_configs(analysis: StreamingAnalysis, file_name: str) -> GroupedStats:
+    by_instance_and_config = GroupedStats()
+    def consume(row: dict[str, str], index: int) -> None:
         instance = row.get("instance_file") or ""
         neighborhoods_field = row.get("neighborhoods") or row.get("neighborhood_names") or ""
         ls_method_field = row.get("ls_method") or row.get("ils_method") or ""
         refinement_field = row.get("refinement_heuristics") or ""
 
         key: str = f"{instance} | {ls_method_field} | {refinement_field} | {neighborhoods_field}"
-        by_instance_and_config[key].append({
-            "final": float(row.get("benefit", row.get("final_benefit", 0.0))),
-            "improvement_pct": float(row.get("improvement_pct", 0.0)),
-            "time": float(row.get("time", 0.0))
-        })
+        by_instance_and_config.add(key, float(row.get("benefit", row.get("final_benefit", 0.0))), float(row.get("time", 0.0)))
+    analysis.add_consumer(file_name, consume)
+    return by_instance_and_config
 
+def _report_local_search(by_instance_and_config: GroupedStats) -> None:
     # Print header for per-instance local search results
     print("="*50)
     print("LOCAL SEARCH ANALYSIS (Per Instance)")
@@ -157,18 +163,15 @@ def analyze_local_search() -> None:
     summary_rows: list[dict[str, Any]] = []
     per_config_medians: defaultdict[str, dict[str, float]] = defaultdict(dict)
 
-    for key, runs in sorted(by_instance_and_config.items()):
+    for key, (benefit_stats, time_stats) in sorted(by_instance_and_config.items()):
         parts = key.split(" | ")
         instance = parts[0]
         ls_method = parts[1]
         refinement = parts[2].replace("['", "").replace("']", "").replace("', '", ",")
         neighborhoods = parts[3].replace("['", "").replace("']", "").replace("', '", ",")
 
-        finals: list[float] = [r["final"] for r in runs]
-        times: list[float] = [r["time"] for r in runs]
-
-        stats = _get_benefit_stats(finals)
-        avg_time: float = statistics.mean(times) if times else 0.0
+        stats = benefit_stats.get_stats()
+        avg_time: float = time_stats.mean
 
         print(f"{instance.split('/')[-1]:<25} {ls_method:<30} {refinement:<25} {neighborhoods:<20} {stats['best']:>8.0f} {stats['median']:>8.2f} {stats['std']:>8.2f} {avg_time:>8.2f}s")
 
@@ -237,49 +240,11 @@ def analyze_local_search() -> None:
     print("="*50 + "\n")
 
 
-def _get_benefit_stats(benefits: list[float]) -> dict[str, Any]:
-    """Helper function to calculate common statistics (Best, Median, Avg, Std Dev, IQR)."""
-    count: int = len(benefits)
-    if count == 0:
-        return {
-            "count": 0, "best": 0.0, "median": 0.0, "avg": 0.0,
-            "std": 0.0, "iqr": 0.0, "outliers_count": 0
-        }
-
-    best_benefit: float = float(max(benefits))
-    median_benefit: float = statistics.median(benefits)
-    avg_benefit: float = statistics.mean(benefits)
-    std_benefit: float = statistics.stdev(benefits) if count > 1 else 0.0
-
-    if count >= 3:
-        # Quantiles requires at least 3 data points
-        quartiles = statistics.quantiles(benefits, n=4)
-        first_quartile = quartiles[0]
-        third_quartile = quartiles[2]
-        interquartile_range: float = third_quartile - first_quartile
-    else:
-        first_quartile = third_quartile = median_benefit
-        interquartile_range = 0.0
-
-    # Outlier detection (1.5 * IQR rule)
-    outliers = [b for b in benefits if (b < first_quartile - 1.5 * interquartile_range) or (b > third_quartile + 1.5 * interquartile_range)] if interquartile_range > 0 else []
-
-    return {
-        "count": count,
-        "best": best_benefit,
-        "median": median_benefit,
-        "avg": avg_benefit,
-        "std": std_benefit,
-        "iqr": interquartile_range,
-        "outliers_count": len(outliers),
-        "outliers_examples": outliers[:3]
-    }
-
-
 def analyze_simulated_annealing() -> None:
     """
     Analyzes Simulated Annealing results grouped by instance file and configuration.
     Configuration parameters used: initial_temp, alpha, and neighborhoods.
+    Serial runs and batched chains (mode column) are kept in separate groups.
     """
     csv_file: Path = OUTPUT_DIR / "simulated_annealing.csv"
     if not csv_file.exists():
@@ -287,18 +252,26 @@ def analyze_simulated_annealing() -> None:
         return
 
     print("Reading Simulated Annealing results...")
-    with open(csv_file, "r") as f:
-        reader = csv.DictReader(f)
-        results: list[dict[str, str]] = list(reader)
-
-    # Group by instance file and configuration
-    by_config: defaultdict[str, list[dict[str, float]]] = defaultdict(list)
-    for row in results:
+    analysis = StreamingAnalysis()
+    by_config: GroupedStats = _add_simulated_annealing(analysis)
+    analysis.run(OUTPUT_DIR)
+    _report_simulated_annealing(by_config)
+
+# Group by instance file and configuration
+def _add_simulated_annealing(analysis: StreamingAnalysis) -> GroupedStats:
+    by_config = GroupedStats()
+    def consume(row: dict[str, str], index: int) -> None:
         # Neighborhoods are stored as a list string in the CSV, clean them up for the key
         neighborhoods = row.get('initial_sol_neighborhood', '[]').replace("['", "").replace("']", "").replace("', '", ",")
         
+        # Rows written before the mode column are serial runs; batched chains share one wall time, so they're never mixed
+        mode: str = row.get('mode') or "serial"
+        if mode != "serial":
+            mode = f"{mode} x{row.get('chains', '?')}"
+
         key: str = (
             f"{row['instance_file']} | "
+            f"Mode:{mode} | "
 
             #f"T0:{float(row['initial_temp']):.0f} | "
             #f"Alpha:{float(row['alpha']):.2f} | "
@@ -308,11 +281,11 @@ def analyze_simulated_annealing() -> None:
             f"Initial temp:{float(row['initial_temp']):.6f} | "
             #f"Nbs:{neighborhoods} | "
         )
-        by_config[key].append({
-            "benefit": int(row["benefit"]),
-            "time": float(row["time"])
-        })
+        by_config.add(key, float(int(row["benefit"])), float(row["time"]))
+    analysis.add_consumer("simulated_annealing.csv", consume)
+    return by_config
 
+def _report_simulated_annealing(by_config: GroupedStats) -> None:
     # Compute and print statistics
     print("\n" + "="*80)
     print("SIMULATED ANNEALING ANALYSIS (Grouped by Instance and Configuration)")
@@ -326,12 +299,9 @@ def analyze_simulated_annealing() -> None:
 
     summary_data: list[dict[str, Any]] = []
 
-    for config, runs in sorted(by_config.items()):
-        benefits: list[float] = [float(r["benefit"]) for r in runs]
-        times: list[float] = [r["time"] for r in runs]
-
-        stats = _get_benefit_stats(benefits)
-        avg_time: float = statistics.mean(times) if times else 0.0
+    for config, (benefit_stats, time_stats) in sorted(by_config.items()):
+        stats = benefit_stats.get_stats()
+        avg_time: float = time_stats.mean
 
         # Extract file name for compact display
         instance_file_parts = config.split(' | ')[0].split('/')
@@ -385,13 +355,15 @@ def analyze_genetic_algorithm() -> None:
         return
 
     print("Reading Genetic Algorithm results...")
-    with open(csv_file, "r") as f:
-        reader = csv.DictReader(f)
-        results: list[dict[str, str]] = list(reader)
-
-    # Group by instance file and configuration
-    by_config: defaultdict[str, list[dict[str, float]]] = defaultdict(list)
-    for row in results:
+    analysis = StreamingAnalysis()
+    by_config: GroupedStats = _add_genetic_algorithm(analysis)
+    analysis.run(OUTPUT_DIR)
+    _report_genetic_algorithm(by_config)
+
+# Group by instance file and configuration
+def _add_genetic_algorithm(analysis: StreamingAnalysis) -> GroupedStats:
+    by_config = GroupedStats()
+    def consume(row: dict[str, str], index: int) -> None:
         # Crossover points might be a list string, clean it up
         crossover = row.get('crossover_points', '[]').replace("['", "").replace("']", "").replace("', '", ",")
 
@@ -403,11 +375,11 @@ def analyze_genetic_algorithm() -> None:
             #f"Sel:{row['parent_selection']} | "
             #f"Crossover:{crossover} | "
         )
-        by_config[key].append({
-            "benefit": int(row["benefit"]),
-            "time": float(row["time"])
-        })
+        by_config.add(key, float(int(row["benefit"])), float(row["time"]))
+    analysis.add_consumer("genetic_algorithm.csv", consume)
+    return by_config
 
+def _report_genetic_algorithm(by_config: GroupedStats) -> None:
     # Compute and print statistics
     print("\n" + "="*80)
     print("GENETIC ALGORITHM ANALYSIS (Grouped by Instance and Configuration)")
@@ -421,12 +393,9 @@ def analyze_genetic_algorithm() -> None:
     
     summary_data: list[dict[str, Any]] = []
 
-    for config, runs in sorted(by_config.items()):
-        benefits: list[float] = [float(r["benefit"]) for r in runs]
-        times: list[float] = [r["time"] for r in runs]
-
-        stats = _get_benefit_stats(benefits)
-        avg_time: float = statistics.mean(times) if times else 0.0
+    for config, (benefit_stats, time_stats) in sorted(by_config.items()):
+        stats = benefit_stats.get_stats()
+        avg_time: float = time_stats.mean
 
         # Extract file name for compact display
         instance_file_parts = config.split(' | ')[0].split('/')
@@ -484,20 +453,22 @@ def compare_GA_SA() -> None:
             print(f"SA results file missing at {sa_file}")
         return
 
-    def get_max_benefit_by_instance(file_path: Path) -> dict[str, int]:
-        """Reads CSV and finds the maximum benefit for each instance_file."""
-        max_benefits: defaultdict[str, int] = defaultdict(int)
-        with open(file_path, "r") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                instance = row['instance_file']
-                benefit = int(row['benefit'])
-                max_benefits[instance] = max(max_benefits[instance], benefit)
-        return dict(max_benefits)
-
-    max_ga_benefits = get_max_benefit_by_instance(ga_file)
-    max_sa_benefits = get_max_benefit_by_instance(sa_file)
-
+    analysis = StreamingAnalysis()
+    max_ga_benefits = _add_max_benefits(analysis, "genetic_algorithm.csv")
+    max_sa_benefits = _add_max_benefits(analysis, "simulated_annealing.csv")
+    analysis.run(OUTPUT_DIR)
+    _report_GA_SA(max_ga_benefits, max_sa_benefits)
+
+# Maximum benefit for each instance_file of file_name, filled by the analysis pass
+def _add_max_benefits(analysis: StreamingAnalysis, file_name: str) -> defaultdict[str, int]:
+    max_benefits: defaultdict[str, int] = defaultdict(int)
+    def consume(row: dict[str, str], index: int) -> None:
+        instance = row['instance_file']
+        max_benefits[instance] = max(max_benefits[instance], int(row['benefit']))
+    analysis.add_consumer(file_name, consume)
+    return max_benefits
+
+def _report_GA_SA(max_ga_benefits: dict[str, int], max_sa_benefits: dict[str, int]) -> None:
     all_instances = sorted(list(set(max_ga_benefits.keys()) | set(max_sa_benefits.keys())))
     
     if not all_instances:
@@ -564,28 +535,12 @@ def analyze_iterated_local_search() -> None:
         print(f"No Iterated Local Search results found at {csv_file}")
         return
 
-    with open(csv_file, "r") as f:
-        reader = csv.DictReader(f)
-        results: list[dict[str, str]] = list(reader)
-    
-    # Group by instance file + configuration. Some harness versions write the
-    # neighborhood column as `neighborhoods` while others use
-    # `neighborhood_names`. Be tolerant and use whichever is present.
-    by_instance_and_config: defaultdict[str, list[dict[str, float]]] = defaultdict(list)
-    for row in results:
-        instance = row.get("instance_file") or ""
-        neighborhoods_field = row.get("neighborhoods") or row.get("neighborhood_names") or ""
-        ls_method_field = row.get("ls_method") or row.get("ils_method") or ""
-        refinement_field = row.get("refinement_heuristics") or ""
+    analysis = StreamingAnalysis()
+    by_instance_and_config: GroupedStats = _add_search_configs(analysis, "iterated_local_search.csv")
+    analysis.run(OUTPUT_DIR)
+    _report_iterated_local_search(by_instance_and_config)
 
-        # Key includes instance so we compute per-instance stats first
-        key: str = f"{instance} | {ls_method_field} | {refinement_field} | {neighborhoods_field}"
-        by_instance_and_config[key].append({
-            "final": float(row.get("benefit", row.get("final_benefit", 0.0))),
-            "improvement_pct": float(row.get("improvement_pct", 0.0)),
-            "time": float(row.get("time", 0.0))
-        })
-    
+def _report_iterated_local_search(by_instance_and_config: GroupedStats) -> None:
     # Compute and print statistics
     print("="*50)
     print("ITERATED LOCAL SEARCH ANALYSIS")
@@ -597,7 +552,7 @@ def analyze_iterated_local_search() -> None:
     summary_data: list[dict[str, Any]] = []
     per_instance_medians: defaultdict[str, dict[str, float]] = defaultdict(dict)
 
-    for key, runs in sorted(by_instance_and_config.items()):
+    for key, (benefit_stats, time_stats) in sorted(by_instance_and_config.items()):
         # Key format: instance | ls_method | refinement | neighborhoods
         parts = key.split(" | ")
         instance = parts[0]
@@ -605,11 +560,8 @@ def analyze_iterated_local_search() -> None:
         refinement = parts[2].replace("['", "").replace("']", "").replace("', '", ",")
         neighborhoods = parts[3].replace("['", "").replace("']", "").replace("', '", ",")
 
-        finals: list[float] = [r["final"] for r in runs]
-        times: list[float] = [r["time"] for r in runs]
-
-        stats = _get_benefit_stats(finals)
-        avg_time: float = statistics.mean(times) if times else 0.0
+        stats = benefit_stats.get_stats()
+        avg_time: float = time_stats.mean
 
         print(f"{instance.split('/')[-1]:<25} {ls_method:<30} {refinement:<25} {neighborhoods:<20} {stats['best']:>8.0f} {stats['median']:>8.2f} {stats['std']:>8.2f} {avg_time:>8.2f}s")
 
@@ -686,8 +638,8 @@ def analyze_best_runs_per_instance(target_files: list[str] | None = None, *, com
     Find and report the best runs per instance.
 
     Behavior:
-    - Scans the standard experiment CSVs (or `target_files` if provided) and
-      collects all rows.
+    - Scans the standard experiment CSVs (or `target_files` if provided) in
+      one streaming pass, keeping only the best row of each group.
     - For each instance, finds the best run for each distinct "method"
       (method name inferred from several possible columns) and prints a
       per-instance section listing each method's best run. Each printed line
@@ -712,60 +664,62 @@ def analyze_best_runs_per_instance(target_files: list[str] | None = None, *, com
 
     files_to_check = target_files if target_files is not None else default_files
 
-    # Collect all rows from the selected files so we can produce cross-method
-    # per-instance summaries.
-    combined_rows: list[dict[str, str]] = []
+    analysis = StreamingAnalysis()
+    file_bests, method_bests = _add_best_runs(analysis, files_to_check)
+    analysis.run(OUTPUT_DIR)
+    _report_best_runs(file_bests, method_bests)
+
+# Best run per instance inside each file and per (instance, method) across all the files
+def _add_best_runs(analysis: StreamingAnalysis, files_to_check: list[str]) -> tuple[dict[str, BestRows], BestRows]:
+    file_bests: dict[str, BestRows] = {} # only files with rows, in reading order
+    method_bests = BestRows()
     for fname in files_to_check:
-        csv_file = OUTPUT_DIR / fname
-        if not csv_file.exists():
-            continue
-        with open(csv_file, "r", newline='') as f:
-            reader = csv.DictReader(f)
-            for i, r in enumerate(reader):
-                # mark source so printed identifiers and CSVs point back to origin
-                r['_source_file'] = fname
-                # ensure there is an easy-to-find run identifier; prefer `run_id`,
-                # fall back to `run_seed` or the row index when missing
-                if not r.get('run_id'):
-                    r['run_id'] = r.get('run_seed') or str(i)
-                combined_rows.append(r)
-
-    if not combined_rows:
+        def consume(row: dict[str, str], index: int, fname: str = fname) -> None:
+            # mark source so printed identifiers and CSVs point back to origin
+            r = {**row, '_source_file': fname}
+            # ensure there is an easy-to-find run identifier; prefer `run_id`,
+            # fall back to `run_seed` or the row index when missing
+            if not r.get('run_id'):
+                r['run_id'] = r.get('run_seed') or str(index)
+            inst = r.get('instance_file') or r.get('instance') or 'unknown'
+            b = _benefit_of(r)
+            t = _time_of(r)
+            file_bests.setdefault(fname, BestRows()).add(inst, r, b, t)
+            method_bests.add((inst, _get_method_name(r) or '<unknown>'), r, b, t)
+        analysis.add_consumer(fname, consume)
+    return file_bests, method_bests
+
+# Best-effort method name for a row
+def _get_method_name(rr: dict[str, str]) -> str:
+    return (rr.get('method') or rr.get('ls_method') or rr.get('ils_method') or
+            rr.get('initial_method') or rr.get('Solution') or rr.get('solver') or '')
+
+def _benefit_of(rr: dict[str, str]) -> float:
+    return float(rr.get('benefit', rr.get('final_benefit', rr.get('final', 0))))
+
+def _time_of(rr: dict[str, str]) -> float:
+    return float(rr.get('time', 0.0))
+
+def _report_best_runs(file_bests: dict[str, BestRows], method_bests: BestRows) -> None:
+    if not method_bests.rows:
         print("No experiment rows found in the selected files.")
         return
 
     # --- Per-file bests: for each CSV (method type) print the best run per instance ---
-    file_map: dict[str, list[dict[str, str]]] = defaultdict(list)
-    for r in combined_rows:
-        src = r.get('_source_file') or '<unknown>'
-        file_map[src].append(r)
-
     print("\n" + "=" * 80)
     print("BEST PER INPUT FILE (best run per instance within each CSV)")
     print("=" * 80)
-    for fname in sorted(file_map.keys()):
-        rows = file_map[fname]
+    for fname in sorted(file_bests.keys()):
         print(f"\nFile: {fname}")
-        # compute best per instance inside this file
-        best_by_instance: dict[str, dict[str, str]] = {}
-        for r in rows:
-            inst = r.get('instance_file') or r.get('instance') or 'unknown'
-            cur = best_by_instance.get(inst)
-            if cur is None:
-                best_by_instance[inst] = r
-                continue
-            b_new = float(r.get('benefit', r.get('final_benefit', r.get('final', 0))))
-            b_cur = float(cur.get('benefit', cur.get('final_benefit', cur.get('final', 0))))
-            if b_new > b_cur or (b_new == b_cur and float(r.get('time', 0.0)) < float(cur.get('time', 0.0))):
-                best_by_instance[inst] = r
+        best_by_instance: dict[str, dict[str, str]] = file_bests[fname].rows
 
         print(f"{'Instance':<30} {'Benefit':>10} {'Time':>10} {'ID':<25}")
         print('-' * 90)
         for inst in sorted(best_by_instance.keys()):
             r = best_by_instance[inst]
             inst_short = inst.split('/')[-1]
-            b = float(r.get('benefit', r.get('final_benefit', r.get('final', 0))))
-            t = float(r.get('time', 0.0))
+            b = _benefit_of(r)
+            t = _time_of(r)
             identifier = f"{r.get('_source_file')}:{r.get('run_id')}"
             print(f"{inst_short:<30} {b:>10.0f} {t:>10.3f} {identifier:<25}")
 
@@ -787,22 +741,10 @@ def analyze_best_runs_per_instance(target_files: list[str] | None = None, *, com
                 writer.writerow(best_by_instance[inst])
         print(f"Wrote per-file bests to {out_file}")
 
-    # Group rows by instance file
-    instance_map: defaultdict[str, list[dict[str, str]]] = defaultdict(list)
-    for r in combined_rows:
-        instance = r.get('instance_file') or r.get('instance') or 'unknown'
-        instance_map[instance].append(r)
-
-    def get_method_name(rr: dict[str, str]) -> str:
-        """Return a best-effort method name for a row (type-hinted)."""
-        return (rr.get('method') or rr.get('ls_method') or rr.get('ils_method') or
-                rr.get('initial_method') or rr.get('Solution') or rr.get('solver') or '')
-
-    def benefit_of(rr: dict[str, str]) -> float:
-        return float(rr.get('benefit', rr.get('final_benefit', rr.get('final', 0))))
-
-    def time_of(rr: dict[str, str]) -> float:
-        return float(rr.get('time', 0.0))
+    # Group the per-method bests by instance file (methods in order of first appearance)
+    instance_map: defaultdict[str, dict[str, dict[str, str]]] = defaultdict(dict)
+    for (instance, m), r in method_bests.rows.items():
+        instance_map[instance][m] = r
 
     # Prepare containers for CSV output
     per_method_best_rows: list[dict[str, str]] = []
@@ -813,30 +755,17 @@ def analyze_best_runs_per_instance(target_files: list[str] | None = None, *, com
     print("BEST RUNS PER INSTANCE (best per method)")
     print("=" * 80)
     for inst in sorted(instance_map.keys()):
-        rows = instance_map[inst]
+        method_best: dict[str, dict[str, str]] = instance_map[inst]
         inst_short = inst.split('/')[-1]
         print(f"\nInstance: {inst_short}")
         print(f"{'Method':<30} {'Benefit':>10} {'Time':>10} {'ID':<25} {'Source':<25}")
         print('-' * 110)
 
-        # find best run per method for this instance
-        method_best: dict[str, dict[str, str]] = {}
-        for r in rows:
-            m = get_method_name(r) or '<unknown>'
-            cur = method_best.get(m)
-            b = benefit_of(r)
-            t = time_of(r)
-            if cur is None:
-                method_best[m] = r
-            else:
-                if b > benefit_of(cur) or (b == benefit_of(cur) and t < time_of(cur)):
-                    method_best[m] = r
-
         # Print and collect per-method bests for this instance
         for m in sorted(method_best.keys()):
             r = method_best[m]
-            b = benefit_of(r)
-            t = time_of(r)
+            b = _benefit_of(r)
+            t = _time_of(r)
             identifier = f"{r.get('_source_file')}:{r.get('run_id')}"
             source = r.get('_source_file', '')
             print(f"{m:<30} {b:>10.0f} {t:>10.3f} {identifier:<25} {source:<25}")
@@ -848,17 +777,17 @@ def analyze_best_runs_per_instance(target_files: list[str] | None = None, *, com
             if best_for_inst is None:
                 best_for_inst = r
                 continue
-            if benefit_of(r) > benefit_of(best_for_inst) or (
-                benefit_of(r) == benefit_of(best_for_inst) and time_of(r) < time_of(best_for_inst)
+            if _benefit_of(r) > _benefit_of(best_for_inst) or (
+                _benefit_of(r) == _benefit_of(best_for_inst) and _time_of(r) < _time_of(best_for_inst)
             ):
                 best_for_inst = r
 
         if best_for_inst is not None:
             # Print best overall for this instance immediately inside the section
             bm = best_for_inst
-            bm_method = get_method_name(bm) or '<unknown>'
-            bm_b = benefit_of(bm)
-            bm_t = time_of(bm)
+            bm_method = _get_method_name(bm) or '<unknown>'
+            bm_b = _benefit_of(bm)
+            bm_t = _time_of(bm)
             bm_id = f"{bm.get('_source_file')}:{bm.get('run_id')}"
             print('\nBest overall for this instance:')
             print(f"{bm_method:<30} {bm_b:>10.0f} {bm_t:>10.3f} {bm_id:<25} {bm.get('_source_file',''):<25}")
@@ -893,8 +822,8 @@ def analyze_best_runs_per_instance(target_files: list[str] | None = None, *, com
     for inst in sorted(best_overall_by_instance.keys()):
         r = best_overall_by_instance[inst]
         inst_short = inst.split('/')[-1]
-        b = benefit_of(r)
-        t = time_of(r)
+        b = _benefit_of(r)
+        t = _time_of(r)
         identifier = f"{r.get('_source_file')}:{r.get('run_id')}"
         source = r.get('_source_file', '')
         print(f"{inst_short:<30} {b:>10.0f} {t:>10.3f} {identifier:<25} {source:<25}")
@@ -918,3 +847,37 @@ def analyze_best_runs_per_instance(target_files: list[str] | None = None, *, com
         print(f"Wrote combined best-runs-per-instance to {out_file}")
 
 
+
+# Every report above from a single pass: each experiment .csv is read once, in chunks, and feeds all the reports that use it
+# Memory depends on the number of groups, not on the number of rows (see streaming_analysis.py)
+def analyze_all(target_files: list[str] | None = None) -> None:
+    analysis = StreamingAnalysis()
+    file_bests, method_bests = _add_best_runs(analysis, target_files if target_files is not None else [
+        "constructive.csv", "local_search.csv", "simulated_annealing.csv", "iterated_local_search.csv", "genetic_algorithm.csv"])
+    constructive = _add_constructive(analysis)
+    local_search = _add_search_configs(analysis, "local_search.csv")
+    simulated_annealing = _add_simulated_annealing(analysis)
+    genetic_algorithm = _add_genetic_algorithm(analysis)
+    max_ga_benefits = _add_max_benefits(analysis, "genetic_algorithm.csv")
+    max_sa_benefits = _add_max_benefits(analysis, "simulated_annealing.csv")
+    iterated_local_search = _add_search_configs(analysis, "iterated_local_search.csv")
+    found: set[str] = analysis.run(OUTPUT_DIR)
+
+    reports = [
+        ("constructive.csv", "constructive", lambda: _report_constructive(constructive)),
+        ("local_search.csv", "local search", lambda: _report_local_search(local_search)),
+        ("simulated_annealing.csv", "Simulated Annealing", lambda: _report_simulated_annealing(simulated_annealing)),
+        ("genetic_algorithm.csv", "Genetic Algorithm", lambda: _report_genetic_algorithm(genetic_algorithm)),
+    ]
+    for file_name, name, report in reports:
+        if file_name in found:
+            report()
+        else:
+            print(f"No {name} results found at {OUTPUT_DIR / file_name}")
+    if "genetic_algorithm.csv" in found and "simulated_annealing.csv" in found:
+        _report_GA_SA(max_ga_benefits, max_sa_benefits)
+    if "iterated_local_search.csv" in found:
+        _report_iterated_local_search(iterated_local_search)
+    else:
+        print(f"No Iterated Local Search results found at {OUTPUT_DIR / 'iterated_local_search.csv'}")
+    _report_best_runs(file_bests, method_bests)
@@ -5,38 +5,84 @@ import random
 import time
 from pathlib import Path
 from typing import Any
+from instance import Instance, build_instance
+import instance_cache
+from fitness_cache import get_fitness_cache, clear_fitness_caches
+from identity_memo import IdentityMemo
+from zobrist import zobrist_hash
 
 ''' Global varibales '''
 
 # Used on every run to track performance
 _evaluation_count:int = 0
+# Lookups of the fitness cache (fitness_cache.py) that found / didn't find the solution
+_fitness_cache_hits:int = 0
+_fitness_cache_misses:int = 0
 
 # Module-level GA debug state to ensure a single CSV writer/file per process
 _ga_debug_state: dict | None = None
 
-# 
+# Compiled instances by pack_dep -> (pack_benefits, dep_sizes, capacity, instance)
+# Keeping the raw lists in the entry keeps them alive, so their ids can't be reused by other lists
+_compiled_instances: IdentityMemo = IdentityMemo()
+# Pack-side instances of get_pack_instance by pack_dep -> (pack_benefits, instance), kept apart so neither memo replaces the other's entry
+_pack_instances: IdentityMemo = IdentityMemo()
+
+# Translation table of list_bool_to_int: byte 0/1 -> character '0'/'1'
+_BIT_CHARS: bytes = bytes.maketrans(b"\x00\x01", b"01")
+
+# Also empties the fitness caches, so a run's evaluations don't depend on the runs before it
 def reset_evaluation_count() -> None:
-    global _evaluation_count
+    global _evaluation_count, _fitness_cache_hits, _fitness_cache_misses
     _evaluation_count = 0
+    _fitness_cache_hits = 0
+    _fitness_cache_misses = 0
+    clear_fitness_caches()
 
 # 
 def get_evaluation_count() -> int:
     return _evaluation_count
 
+# Fitness requests answered by the fitness cache (still counted as evaluations)
+def get_fitness_cache_hits() -> int:
+    return _fitness_cache_hits
+
+# Lookups that needed an evaluation
+def get_fitness_cache_misses() -> int:
+    return _fitness_cache_misses
+
+# Used by delta evaluations that don't go through evaluate_packs
+def add_evaluation_count(count:int = 1) -> None:
+    global _evaluation_count
+    _evaluation_count += count
+
 
 # Evaluates the total benefit of packages related to selected dependencies
+# Every call counts as an evaluation, so budgets and the evaluations column don't depend on the fitness cache;
+# solutions evaluated before come from the cache (counted in get_fitness_cache_hits)
 def evaluate_packs(pack_benefits:list[int], pack_dep:list[tuple[int, int]], select_dep:list[bool]) -> int:
     global _evaluation_count
     _evaluation_count += 1
-    
-    total_benefits: int = 0
-    pack_all_deps: dict[int, set[int]] = get_pack_dict(pack_dep)
-
-    for pack in pack_all_deps:
-        if pack_all_deps[pack].issubset(set(i for i in range(len(select_dep)) if select_dep[i])): # if all dependencies of the package are selected
-            total_benefits += pack_benefits[pack]
+    instance:Instance = get_pack_instance(pack_benefits, pack_dep, len(select_dep))
+    key:int = zobrist_hash(select_dep)
+    benefit:int | None = lookup_fitness(instance, key)
+    if benefit is None:
+        benefit = instance.evaluate(select_dep)
+        store_fitness(instance, key, benefit)
+    return benefit
+
+# Benefit of the solution with this key (zobrist hash) if it's in the instance's fitness cache, counted as a hit or a miss
+def lookup_fitness(instance:Instance, key:int) -> int | None:
+    global _fitness_cache_hits, _fitness_cache_misses
+    benefit:int | None = get_fitness_cache(instance).get(key)
+    if benefit is None:
+        _fitness_cache_misses += 1
+    else:
+        _fitness_cache_hits += 1
+    return benefit
 
-    return total_benefits
+def store_fitness(instance:Instance, key:int, benefit:int) -> None:
+    get_fitness_cache(instance).put(key, benefit)
 
 def get_remaining_capacity(dep_sizes:list[int], selec_dep:list[bool], capacity:int) -> int:
     used_space: int = sum(dep_sizes[i] for i in range(len(selec_dep)) if selec_dep[i])
@@ -73,15 +119,39 @@ def register_results(results: list[list[bool]], pack_benefits:list[int], dep_siz
                 file.write(f"Solution {i+1}: Benefit = {avaluation_values[i]}, Capacity left = {capacities_left[i]}, Selected dependencies = {[index for index, val in enumerate(sol) if val]}\n")
     pass
 
-# Load instance data from file
+# Load instance data from file (already compiled and cached for the functions that use it)
 def load_instance(filename: str) -> tuple[list[int], list[int], list[tuple[int, int]], int]:
-    with open(filename, 'r') as file:
-        num_pack, num_dep, num_pack_dep, capacity = map(int, file.readline().split())
-        pack_benefits: list[int] = list(map(int, file.readline().split()))
-        dep_sizes: list[int] = list(map(int, file.readline().split()))
-        pack_dep: list[tuple[int, int]] = [(p, d) for line in file if len(line.split()) == 2 for p, d in [map(int, line.split())]]
+    pack_benefits, dep_sizes, pack_dep, capacity = instance_cache.read_instance(filename) # binary sidecar, parsed only once
+    compile_instance(pack_benefits, dep_sizes, pack_dep, capacity)
     return pack_benefits, dep_sizes, pack_dep, capacity
 
+# Compiled Instance of the file, same cache as load_instance
+def load_compiled_instance(filename: str) -> Instance:
+    return compile_instance(*instance_cache.read_instance(filename))
+
+# Adapter for the old signatures: returns the compiled Instance of these lists, building it only the first time
+# Also accepts the tuples of an Instance (instance.as_tuple())
+def compile_instance(pack_benefits:list[int], dep_sizes:list[int], pack_dep:list[tuple[int, int]], capacity:int) -> Instance:
+    cached = _compiled_instances.get(pack_dep)
+    if cached is not None and cached[0] is pack_benefits and cached[1] is dep_sizes and cached[2] == capacity:
+        return cached[3]
+    instance: Instance = build_instance(pack_benefits, dep_sizes, pack_dep, capacity)
+    _compiled_instances.put(pack_dep, (pack_benefits, dep_sizes, capacity, instance))
+    _compiled_instances.put(instance.pack_dep, (instance.pack_benefits, instance.dep_sizes, instance.capacity, instance))
+    return instance
+
+# Only the pack side is needed (evaluate_packs doesn't receive dep_sizes): any Instance built from these lists works
+def get_pack_instance(pack_benefits:list[int], pack_dep:list[tuple[int, int]], num_deps:int) -> Instance:
+    cached = _compiled_instances.get(pack_dep)
+    if cached is not None and cached[0] is pack_benefits and cached[3].num_deps >= num_deps:
+        return cached[3]
+    cached = _pack_instances.get(pack_dep)
+    if cached is not None and cached[0] is pack_benefits and cached[1].num_deps >= num_deps:
+        return cached[1]
+    instance: Instance = build_instance(pack_benefits, [0]*num_deps, pack_dep, 0)
+    _pack_instances.put(pack_dep, (pack_benefits, instance))
+    return instance
+
 # Read last run_id from CSV, increment, return new ID
 def get_next_run_id_number(experiment_type: str, output_dir: Path) -> int:
     csv_file: Path = output_dir / f"{experiment_type}.csv"
@@ -137,11 +207,25 @@ def get_next_seed_per_file_name(experiment_type: str, file_name: str, output_dir
         return max(seeds_for_file) + 1
 
 # Append new results to existing .csv or create new file
+# Rows follow the existing header; columns it doesn't have yet are added to it (the file is rewritten once)
 def append_to_csv(experiment_type: str, new_results: list[dict[str, Any]], output_dir) -> None:
     csv_file: Path = output_dir / f"{experiment_type}.csv"
     fieldnames: list[str] = list(new_results[0].keys())
     
     file_exists: bool = csv_file.exists()
+    if file_exists:
+        with open(csv_file, "r", newline='') as f:
+            reader = csv.DictReader(f)
+            header: list[str] = list(reader.fieldnames or [])
+            new_columns: list[str] = [name for name in fieldnames if name not in header]
+            old_rows: list[dict[str, Any]] = list(reader) if new_columns and header else []
+        fieldnames = header + new_columns
+        if new_columns and header:
+            with open(csv_file, "w", newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=fieldnames)
+                writer.writeheader()
+                writer.writerows(old_rows)
+        file_exists = bool(header)
     
     with open(csv_file, "a", newline='') as f: # "a" is for append
         writer = csv.DictWriter(f, fieldnames=fieldnames)
@@ -160,8 +244,8 @@ def list_bool_to_int(sol:list[bool]) -> int:
     # Build bitstring safely and convert. Use a fallback integer build to avoid
     # ValueError from int('', 2) in edge cases.
     try:
-        bits: str = "".join(str(int(bool(b))) for b in sol)
-        return int(bits, 2) if bits else 0
+        bits: bytes = bytes(sol).translate(_BIT_CHARS) # b'\x00\x01' -> b'01', any other value makes int() fail
+        return int(bits, 2)
     except Exception:
         # Fallback: compute integer by shifting bits (most-significant-bit first)
         val: int = 0
@@ -205,31 +289,11 @@ def pack_from_dep_list_bool(dep_sol:list[bool], pack_benefits:list[int], dep_siz
     This mirrors previous helper behaviour: for each pack, mark True if all
     its required dependencies are selected in `dep_sol`.
     """
-    pack_all_deps: dict[int, set[int]] = get_pack_dict(pack_dep)
-    pack_sol: list[bool] = [False] * len(pack_benefits)
-    # compute selected dependency indices once
-    selected_set = set(i for i, v in enumerate(dep_sol) if v)
-
-    for pack in range(len(pack_benefits)):
-        required = pack_all_deps.get(pack, set())
-        if required.issubset(selected_set):
-            pack_sol[pack] = True
-
-    return pack_sol
+    return compile_instance(pack_benefits, dep_sizes, pack_dep, capacity).satisfied_packs(dep_sol)
 
 # 
 def get_package_solution(dep_sol:list[bool], pack_benefits:list[int], pack_dep:list[tuple[int, int]]) -> list[bool]:
-    pack_all_deps: dict[int, set[int]] = get_pack_dict(pack_dep)
-    pack_sol: list[bool] = [False] * len(pack_benefits)
-    # compute selected dependency indices once
-    selected_set = set(i for i, v in enumerate(dep_sol) if v)
-
-    for pack in range(len(pack_benefits)):
-        required = pack_all_deps.get(pack, set())
-        if required.issubset(selected_set):
-            pack_sol[pack] = True
-
-    return pack_sol
+    return get_pack_instance(pack_benefits, pack_dep, len(dep_sol)).satisfied_packs(dep_sol)
 
 '''
 def ga_debug_report(gen: int, population: list[list[bool]], population_fitness: list[int], pack_benefits: list[int], pack_dep: list[tuple[int, int]], dep_sizes: list[int], capacity: int, verbose: bool = False, debug_state: dict | None = None, sample_n: int = 5, print_to_stdout: bool = True) -> dict | None:
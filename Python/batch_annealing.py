@@ -0,0 +1,135 @@
+# Python 3.13.4
+
+import random
+import numpy as np
+
+import auxiliary_functions as aux
+import simulated_annealing as sa
+from batch_evaluation import BatchEvaluator, get_batch_evaluator, population_to_matrix
+from instance import Instance
+from budget import Budget, get_budget
+
+CHAINS_DEFAULT:int = 30
+SWAP_SHARE_DEFAULT:float = 0.5 # part of the proposals that are swaps (one selected dep out, one unselected in) when both are allowed
+
+''' Chain batch '''
+# C independent simulated annealing chains advanced in lockstep: one step proposes, scores and accepts a move in every chain
+# sols: (C x num_deps) bool matrix, missing: (C x num_packs+1) missing dependencies per pack, benefits and used capacity per chain
+# dep_packs is the dep -> packs CSR padded to a (num_deps x max degree) matrix; the padding points to an extra pack
+# without benefit, so padded entries never change a delta (whatever its missing count drifts to)
+# A flip of dep in chain c gains the packs of dep missing only it (addition) or loses the complete ones (removal):
+# one gather of missing[c, dep_packs[dep]] for all chains at once
+# A swap is two flips; the packs the second dep shares with the first see the first flip in their missing count
+# Only flip_bit and swap_bits proposals exist, both as index arrays, and like FeasibleMoveSampler they always fit:
+# flip_bit is uniform over the removals and the additions with size <= free, swap_bits removes a random selected dep and
+# adds a random unselected one with size <= free + size of the removed one
+# Every random choice of a step is the argmax of one (C x num_deps) matrix of random keys over the allowed deps
+
+class ChainBatch:
+    def __init__(self, instance:Instance, sols:np.ndarray) -> None:
+        self.instance:Instance = instance
+        self.num_deps:int = instance.num_deps
+        self.capacity:int = instance.capacity
+        self.pack_benefits:np.ndarray = np.append(np.asarray(instance.pack_benefits, dtype=np.int64), 0) # + padding pack
+        self.dep_sizes:np.ndarray = np.asarray(instance.dep_sizes, dtype=np.int64)
+        max_degree:int = max((len(packs) for packs in instance.dep_packs), default=0)
+        self.dep_packs:np.ndarray = np.full((self.num_deps, max(1, max_degree)), instance.num_packs, dtype=np.intp)
+        for dep, packs in enumerate(instance.dep_packs):
+            self.dep_packs[dep, :len(packs)] = packs
+
+        self.sols:np.ndarray = np.array(sols, dtype=bool)
+        self.rows:np.ndarray = np.arange(len(self.sols))
+        batch:BatchEvaluator = get_batch_evaluator(instance)
+        self.missing:np.ndarray = np.zeros((len(self.sols), instance.num_packs + 1), dtype=np.int32)
+        if len(batch.nonempty_packs):
+            selected_per_pack:np.ndarray = np.add.reduceat(self.sols[:, batch.pack_dep_indices], batch.row_starts, axis=1, dtype=np.int32)
+            self.missing[:, batch.nonempty_packs] = batch.pack_num_deps[batch.nonempty_packs] - selected_per_pack
+        self.benefits:np.ndarray = batch.evaluate(self.sols)
+        self.used:np.ndarray = self.sols @ self.dep_sizes
+
+    # One proposal per chain, accepted with the Metropolis criterion at each chain's temperature -> accepted chains
+    def step(self, temperatures:np.ndarray, swap_share:float, rng:np.random.Generator) -> np.ndarray:
+        chains:int = len(self.sols)
+        free:np.ndarray = self.capacity - self.used
+        keys:np.ndarray = rng.random((chains, self.num_deps))
+        removed:np.ndarray = np.argmax(np.where(self.sols, keys, -1.0), axis=1) # random selected dep
+        fits_swap:np.ndarray = ~self.sols & (self.dep_sizes[None, :] <= (free + self.dep_sizes[removed])[:, None])
+        fits_flip:np.ndarray = self.sols | (self.dep_sizes[None, :] <= free[:, None])
+        is_swap:np.ndarray = (rng.random(chains) < swap_share) & self.sols.any(axis=1) & fits_swap.any(axis=1)
+        # a chain uses either its flip or its swap, and the two deps of a swap come from disjoint sets: one key matrix serves all
+        added:np.ndarray = np.argmax(np.where(fits_swap, keys, -1.0), axis=1)
+        flipped:np.ndarray = np.argmax(np.where(fits_flip, keys, -1.0), axis=1)
+        valid:np.ndarray = is_swap | fits_flip.any(axis=1)
+        first:np.ndarray = np.where(is_swap, removed, flipped)
+        first_adds:np.ndarray = ~self.sols[self.rows, first]
+
+        delta:np.ndarray = self.flip_deltas(first, first_adds)
+        delta += np.where(is_swap, self.flip_deltas(added, np.ones(chains, dtype=bool), first, first_adds), 0)
+        new_used:np.ndarray = self.used + np.where(first_adds, self.dep_sizes[first], -self.dep_sizes[first]) + np.where(is_swap, self.dep_sizes[added], 0)
+        aux.add_evaluation_count(chains)
+
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"): # temperatures can cool down to 0
+            chance:np.ndarray = np.exp(np.minimum(delta / temperatures, 0.0))
+        accept:np.ndarray = valid & (new_used <= self.capacity) & ((delta >= 0) | (rng.random(chains) < chance))
+
+        self._flip(self.rows[accept], first[accept], first_adds[accept])
+        swapped:np.ndarray = accept & is_swap
+        self._flip(self.rows[swapped], added[swapped], np.ones(int(swapped.sum()), dtype=bool))
+        self.benefits += np.where(accept, delta, 0)
+        self.used = np.where(accept, new_used, self.used)
+        return accept
+
+    # Benefit change of flipping deps[c] in every chain c (adds[c]: it's an addition)
+    # previous / previous_adds: a flip of each chain made just before, not applied to missing yet
+    def flip_deltas(self, deps:np.ndarray, adds:np.ndarray, previous:np.ndarray | None = None, previous_adds:np.ndarray | None = None) -> np.ndarray:
+        packs:np.ndarray = self.dep_packs[deps]
+        missing:np.ndarray = self.missing[self.rows[:, None], packs]
+        if previous is not None:
+            shared:np.ndarray = (packs[:, :, None] == self.dep_packs[previous][:, None, :]).any(axis=2)
+            missing = missing - np.where(previous_adds, 1, -1)[:, None] * shared
+        changed:np.ndarray = np.where(adds[:, None], missing == 1, missing == 0) # packs completed / broken by the flip
+        return np.where(adds, 1, -1) * (changed * self.pack_benefits[packs]).sum(axis=1)
+
+    def _flip(self, rows:np.ndarray, deps:np.ndarray, adds:np.ndarray) -> None:
+        self.sols[rows, deps] = adds
+        self.missing[rows[:, None], self.dep_packs[deps]] -= np.where(adds, 1, -1)[:, None].astype(np.int32)
+
+''' Functions '''
+
+# Part of the proposals that are swaps for these neighborhood names ([] or both -> SWAP_SHARE_DEFAULT)
+def get_swap_share(neighborhood_names:list[str]) -> float:
+    names:set[str] = set(neighborhood_names) & {"flip_bit", "swap_bits"}
+    if names == {"flip_bit"}:
+        return 0.0
+    if names == {"swap_bits"}:
+        return 1.0
+    return SWAP_SHARE_DEFAULT
+
+# simulated_annealing on every solution of sols at once, one chain each, sharing the time limit and max_tries
+# initial_temperature: one for every chain or one per chain; each chain cools by alpha per step, as simulated_annealing does
+# -> per chain (best solution, benefit, initial temperature, final temperature, alpha), simulated_annealing's fields
+def multi_chain_simulated_annealing(sols:list[list[bool]], pack_benefits:list[int], dep_sizes:list[int], pack_dep:list[tuple[int, int]], capacity:int, neighborhood_names:list[str] = [], initial_temperature:float | list[float] = sa.INITIAL_TEMPERATURE_DEFAULT, alpha:float = sa.ALPHA_DEFAULT, time_limit:float = sa.TIME_LIMIT_DEFAULT, max_tries:int = sa.MAX_TRIES_DEFAULT, budget:Budget | None = None, seed:int | None = None) -> list[tuple[list[bool], int, float, float, float]]:
+    if not sols:
+        return []
+    budget = get_budget(budget, time_limit)
+    instance:Instance = aux.compile_instance(pack_benefits, dep_sizes, pack_dep, capacity)
+    chains:ChainBatch = ChainBatch(instance, population_to_matrix(sols, instance.num_deps))
+    rng:np.random.Generator = np.random.default_rng(seed if seed is not None else random.getrandbits(64))
+    swap_share:float = get_swap_share(neighborhood_names)
+    initial_temperatures:np.ndarray = np.broadcast_to(np.asarray(initial_temperature, dtype=np.float64), (len(sols),)).copy()
+    temperatures:np.ndarray = initial_temperatures.copy()
+    best_sols:np.ndarray = chains.sols.copy()
+    best_benefits:np.ndarray = chains.benefits.copy()
+    tries:int = 0
+
+    while tries < max_tries and temperatures.max() > 0 and not budget.expired():
+        chains.step(temperatures, swap_share, rng)
+        improved:np.ndarray = chains.benefits > best_benefits
+        if improved.any():
+            best_sols[improved] = chains.sols[improved]
+            best_benefits[improved] = chains.benefits[improved]
+        budget.report(int(best_benefits.max()))
+        tries += 1
+        temperatures *= alpha
+
+    return [(best_sols[chain].tolist(), int(best_benefits[chain]), float(initial_temperatures[chain]), float(temperatures[chain]), alpha) for chain in range(len(sols))]
@@ -0,0 +1,129 @@
+# Python 3.13.4
+
+import random
+import numpy as np
+
+from batch_evaluation import BatchEvaluator, get_batch_evaluator, population_to_matrix
+from zobrist import get_zobrist_keys, flip_hash
+from budget import Budget
+from incremental_evaluation import IncrementalEvaluator
+from instance import Instance
+from repair import repair
+
+OVERSAMPLING_DEFAULT:float = 1.5 # pairs bred per round, relative to the offsprings still needed (some don't fit or repeat)
+
+''' Batch breeding '''
+# Breeds a whole round of offsprings at once (genetic_algorithm.next_generation uses it when numpy is installed)
+# The selected parents become one (parents x num_deps) bool matrix, pairs are two index arrays into it
+# k-point or uniform crossover is a mask per pair (True where offspring 1 takes parent2, offspring 2 parent1) and one np.where
+# Used capacity of every offspring is a single matrix-vector product, zobrist hashes one xor-reduce over the rows
+# Offsprings over the capacity are repaired (repair.py, with counts and losses from two matrix products) or dropped
+# The Generator is seeded from the random module, so a seeded run still repeats
+
+# Generator for one call, drawn from the random module's state
+def get_rng() -> np.random.Generator:
+    return np.random.default_rng(random.getrandbits(64))
+
+# (num_pairs x num_deps) masks, True on the odd segments (the ones offspring 1 takes from parent2)
+# points: genetic_algorithm.get_crossover_points result, the same for every pair; [] -> one random point per pair in [low, high]
+# uniform -> every gene drawn on its own with probability 1/2 (points unused)
+def crossover_masks(num_pairs:int, num_deps:int, points:list[int], low:int, high:int, rng:np.random.Generator, uniform:bool = False) -> np.ndarray:
+    if uniform:
+        return rng.random((num_pairs, num_deps)) < 0.5
+    columns:np.ndarray = np.arange(num_deps)
+    if points:
+        odd:np.ndarray = np.searchsorted(np.asarray(points), columns, side="right") % 2 == 1
+        return np.broadcast_to(odd, (num_pairs, num_deps))
+    cuts:np.ndarray = rng.integers(low, high, size=num_pairs, endpoint=True)
+    return columns[None, :] >= cuts[:, None]
+
+# Offsprings of parents[first[i]] x parents[second[i]], in pair order (offspring 1, offspring 2 of each pair)
+def crossover_matrix(parents:np.ndarray, first:np.ndarray, second:np.ndarray, masks:np.ndarray, two_offsprings:bool) -> np.ndarray:
+    parent1:np.ndarray = parents[first]
+    parent2:np.ndarray = parents[second]
+    offspring1:np.ndarray = np.where(masks, parent2, parent1)
+    if not two_offsprings:
+        return offspring1
+    offsprings:np.ndarray = np.empty((2*len(first), parents.shape[1]), dtype=bool)
+    offsprings[0::2] = offspring1
+    offsprings[1::2] = np.where(masks, parent1, parent2)
+    return offsprings
+
+# Used capacity of each row
+def used_capacity(matrix:np.ndarray, dep_sizes:list[int]) -> np.ndarray:
+    return matrix @ np.asarray(dep_sizes[:matrix.shape[1]], dtype=np.int64)
+
+# repair.repair of every row -> (repaired rows, flipped deps of each)
+# The missing dependencies per pack and the loss of every dep come from matrix products over all the rows at once,
+# so each row's evaluator skips the O(|pack_dep|) reset
+def repair_matrix(instance:Instance, matrix:np.ndarray) -> tuple[list[list[bool]], list[list[int]]]:
+    rows:list[list[bool]] = matrix.tolist()
+    batch:BatchEvaluator = get_batch_evaluator(instance)
+    if batch.incidence is None: # too big for the dense products: plain evaluators
+        evaluators:list[IncrementalEvaluator] = [IncrementalEvaluator.from_instance(instance, row) for row in rows]
+        flipped:list[list[int]] = [repair(evaluator) for evaluator in evaluators]
+        return [evaluator.sol for evaluator in evaluators], flipped
+    missing:np.ndarray = np.rint((~matrix).astype(np.float32) @ batch.incidence).astype(np.int64)
+    complete:np.ndarray = (missing == 0) & (batch.pack_num_deps > 0)
+    loss:np.ndarray = np.rint((complete * batch.pack_benefits.astype(np.float64)) @ batch.incidence.T.astype(np.float64)).astype(np.int64)
+    repaired:list[list[bool]] = []
+    flipped = []
+    for row, row_missing, row_loss in zip(rows, missing.tolist(), loss.tolist()):
+        evaluator = IncrementalEvaluator.from_counts(instance, row, row_missing)
+        flipped.append(repair(evaluator, loss=row_loss))
+        repaired.append(evaluator.sol)
+    return repaired, flipped
+
+# zobrist.zobrist_hash of each row
+def matrix_hashes(matrix:np.ndarray) -> list[int]:
+    keys:np.ndarray = np.asarray(get_zobrist_keys(matrix.shape[1])[:matrix.shape[1]], dtype=np.uint64)
+    return np.bitwise_xor.reduce(np.where(matrix, keys, np.uint64(0)), axis=1).tolist()
+
+''' Functions '''
+
+# Up to needed offsprings that fit the capacity and whose hash isn't in existing_keys (added to it) -> (offsprings, hashes)
+# Pairs of the same individual (equal hashes) are skipped; stops after max_pairs pairs, the caller fills what's missing
+# Offsprings over the capacity are repaired if an instance is given (repair_matrix), dropped otherwise
+def breed_offsprings(selected_parents:list[list[bool]], parent_hashes:list[int], needed:int, points:list[int], low:int, high:int, two_offsprings:bool, dep_sizes:list[int], capacity:int, existing_keys:set[int], max_pairs:int, budget:Budget, repair_instance:Instance | None = None, uniform:bool = False) -> tuple[list[list[bool]], list[int]]:
+    offsprings:list[list[bool]] = []
+    offspring_hashes:list[int] = []
+    if needed <= 0 or not selected_parents:
+        return offsprings, offspring_hashes
+    rng:np.random.Generator = get_rng()
+    num_deps:int = len(selected_parents[0])
+    parents:np.ndarray = population_to_matrix(selected_parents, num_deps)
+    hashes:np.ndarray = np.asarray(parent_hashes, dtype=np.uint64)
+    per_pair:int = 2 if two_offsprings else 1
+    pairs:int = 0
+    while len(offsprings) < needed and pairs < max_pairs:
+        if budget.expired(): print("Expired time - breeding"); break
+        num_pairs:int = min(max_pairs - pairs, max(1, int((needed - len(offsprings)) / per_pair * OVERSAMPLING_DEFAULT) + 1))
+        pairs += num_pairs
+        first:np.ndarray = rng.integers(0, len(selected_parents), size=num_pairs)
+        second:np.ndarray = rng.integers(0, len(selected_parents), size=num_pairs)
+        distinct:np.ndarray = hashes[first] != hashes[second] # avoid crossover with itself
+        first, second = first[distinct], second[distinct]
+        if len(first) == 0:
+            continue
+        kids:np.ndarray = crossover_matrix(parents, first, second, crossover_masks(len(first), num_deps, points, low, high, rng, uniform), two_offsprings)
+        fits:np.ndarray = used_capacity(kids, dep_sizes) <= capacity
+        kid_hashes:list[int] = matrix_hashes(kids)
+        kid_rows:list[list[bool]] = kids.tolist()
+        over:np.ndarray = np.flatnonzero(~fits)
+        if repair_instance is not None and len(over):
+            repaired, flipped = repair_matrix(repair_instance, kids[over])
+            for i, row, row_flipped in zip(over.tolist(), repaired, flipped):
+                kid_rows[i] = row
+                kid_hashes[i] = flip_hash(kid_hashes[i], row_flipped)
+            fits[over] = True
+        for kid, kid_hash, kid_fits in zip(kid_rows, kid_hashes, fits.tolist()):
+            if not kid_fits:
+                continue
+            if kid_hash in existing_keys:
+                continue
+            existing_keys.add(kid_hash)
+            offsprings.append(kid)
+            offspring_hashes.append(kid_hash)
+            if len(offsprings) >= needed:
+                break
+    return offsprings, offspring_hashes
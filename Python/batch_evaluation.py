@@ -0,0 +1,96 @@
+# Python 3.13.4
+
+import numpy as np
+
+import auxiliary_functions as aux
+from instance import Instance
+from identity_memo import IdentityMemo
+
+_batch_evaluators: IdentityMemo = IdentityMemo() # instance -> BatchEvaluator
+DENSE_INCIDENCE_MAX_SIZE: int = 25_000_000 # num_deps * num_packs above this keeps only the sparse CSR path
+
+''' Batch evaluator '''
+
+# Evaluates a whole population at once
+# population: (P x num_deps) bool matrix, one individual per row
+# Missing dependencies per pack = (not population) @ incidence, a single BLAS product
+# When the dense incidence would be too big, the CSR arrays of Instance are gathered and reduced per pack instead
+class BatchEvaluator:
+    def __init__(self, instance:Instance) -> None:
+        self.instance:Instance = instance
+        self.num_deps:int = instance.num_deps
+        self.pack_benefits:np.ndarray = np.asarray(instance.pack_benefits, dtype=np.int64)
+        self.dep_sizes:np.ndarray = np.asarray(instance.dep_sizes, dtype=np.int64)
+        self.pack_dep_indices:np.ndarray = np.asarray(instance.pack_dep_indices, dtype=np.intp)
+
+        offsets:np.ndarray = np.asarray(instance.pack_dep_offsets, dtype=np.intp)
+        self.pack_num_deps:np.ndarray = np.diff(offsets)
+        # packs without dependencies don't count (same as evaluate_packs), so only non-empty rows are reduced
+        self.nonempty_packs:np.ndarray = np.flatnonzero(self.pack_num_deps > 0)
+        self.row_starts:np.ndarray = offsets[self.nonempty_packs]
+
+        # incidence[dep, pack] = 1.0 if pack needs dep (float32 counts are exact and use BLAS)
+        self.incidence:np.ndarray | None = None
+        if self.num_deps * instance.num_packs <= DENSE_INCIDENCE_MAX_SIZE:
+            self.incidence = np.zeros((self.num_deps, instance.num_packs), dtype=np.float32)
+            pack_ids:np.ndarray = np.repeat(np.arange(instance.num_packs), self.pack_num_deps)
+            self.incidence[self.pack_dep_indices, pack_ids] = 1.0
+
+    # (P x num_packs) bool matrix: True where every dependency of the pack is selected
+    def satisfied_packs(self, population:np.ndarray) -> np.ndarray:
+        population = np.asarray(population, dtype=bool).reshape(-1, self.num_deps)
+        satisfied:np.ndarray = np.zeros((population.shape[0], len(self.pack_num_deps)), dtype=bool)
+        if len(self.nonempty_packs) == 0:
+            return satisfied
+        if self.incidence is not None:
+            missing_per_pack:np.ndarray = (~population).astype(np.float32) @ self.incidence
+            satisfied[:, self.nonempty_packs] = missing_per_pack[:, self.nonempty_packs] == 0
+            return satisfied
+        # selected[i, k] = individual i selects the dep of the k-th (pack, dep) entry
+        selected:np.ndarray = population[:, self.pack_dep_indices]
+        selected_per_pack:np.ndarray = np.add.reduceat(selected, self.row_starts, axis=1, dtype=np.int32)
+        satisfied[:, self.nonempty_packs] = selected_per_pack == self.pack_num_deps[self.nonempty_packs]
+        return satisfied
+
+    # Benefit of every individual
+    def evaluate(self, population:np.ndarray) -> np.ndarray:
+        aux.add_evaluation_count(len(population))
+        return self.satisfied_packs(population) @ self.pack_benefits
+
+    # Used capacity of every individual
+    def used_capacity(self, population:np.ndarray) -> np.ndarray:
+        population = np.asarray(population, dtype=bool).reshape(-1, self.num_deps)
+        return population @ self.dep_sizes
+
+    # (satisfied packs, benefit, used capacity) of every individual
+    def evaluate_all(self, population:np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        population = np.asarray(population, dtype=bool).reshape(-1, self.num_deps)
+        aux.add_evaluation_count(len(population))
+        satisfied:np.ndarray = self.satisfied_packs(population)
+        return satisfied, satisfied @ self.pack_benefits, population @ self.dep_sizes
+
+''' Functions '''
+
+# BatchEvaluator of an Instance, built only the first time
+def get_batch_evaluator(instance:Instance) -> BatchEvaluator:
+    return _batch_evaluators.get_or_create(instance, lambda: BatchEvaluator(instance))
+
+# list[list[bool]] -> (P x num_deps) bool matrix, short individuals are padded with unselected deps
+def population_to_matrix(population:list[list[bool]], num_deps:int) -> np.ndarray:
+    matrix:np.ndarray = np.zeros((len(population), num_deps), dtype=bool)
+    if not population:
+        return matrix
+    if all(len(individual) == len(population[0]) for individual in population):
+        rows:np.ndarray = np.array(population, dtype=bool)
+        matrix[:, :rows.shape[1]] = rows
+        return matrix
+    for i, individual in enumerate(population): # ragged population (e.g. empty individuals from tournament_selection)
+        matrix[i, :len(individual)] = individual
+    return matrix
+
+# Drop-in for genetic_algorithm.evaluate_population: same list[int] result, one batched evaluation
+def evaluate_population(population:list[list[bool]], pack_benefits:list[int], pack_dep:list[tuple[int, int]]) -> list[int]:
+    if not population:
+        return []
+    evaluator:BatchEvaluator = get_batch_evaluator(aux.get_pack_instance(pack_benefits, pack_dep, len(population[0])))
+    return evaluator.evaluate(population_to_matrix(population, evaluator.num_deps)).tolist()
@@ -0,0 +1,97 @@
+# Python 3.13.4
+
+import math
+import time
+import auxiliary_functions as aux
+
+CHECK_PERIOD_DEFAULT: float = 0.001 # seconds between clock reads that the check interval adapts to
+MAX_CHECK_INTERVAL: int = 1024 # expired() calls between two clock reads, at most
+
+''' Budget '''
+# One termination controller for a whole search: the same Budget goes from ILS to the local search to the heuristic,
+# so every level stops on the same wall time, CPU time, evaluation count, stagnation or target value
+# expired() is called once per candidate but only reads the clock every k calls: k doubles while k calls take less
+# than half of check_period and halves when they take more, so a deadline is overshot by about check_period at most
+# Evaluations are the ones counted by auxiliary_functions (evaluate_packs and the delta evaluators) since the budget started
+
+class Budget:
+    def __init__(self, time_limit:float = math.inf, cpu_time_limit:float = math.inf, max_evaluations:float = math.inf, stagnation_limit:float = math.inf, target_value:float = math.inf, check_period:float = CHECK_PERIOD_DEFAULT) -> None:
+        self.time_limit:float = time_limit
+        self.cpu_time_limit:float = cpu_time_limit
+        self.max_evaluations:float = max_evaluations
+        self.stagnation_limit:float = stagnation_limit # report() calls in a row without a better value
+        self.target_value:float = target_value
+        self.check_period:float = check_period
+        self.start_time:float = time.perf_counter()
+        self.start_cpu_time:float = time.process_time() if cpu_time_limit < math.inf else 0.0
+        self.start_evaluations:int = aux.get_evaluation_count()
+        self._counts_evaluations:bool = max_evaluations < math.inf
+        self.best_value:float = -math.inf
+        self.stagnation:int = 0
+        self.stop_reason:str = "" # "time", "cpu_time", "evaluations", "stagnation" or "target" once expired
+        self.clock_reads:int = 0
+        self._interval:int = 1
+        self._countdown:int = 1
+        self._last_check:float = self.start_time
+
+    # True once any limit is reached (and from then on)
+    def expired(self) -> bool:
+        if self.stop_reason:
+            return True
+        if self._counts_evaluations and aux.get_evaluation_count() - self.start_evaluations >= self.max_evaluations:
+            return self._stop("evaluations")
+        self._countdown -= 1
+        if self._countdown > 0:
+            return False
+        return self._check_clock()
+
+    # Records the value of the current or best solution, for stagnation and target stopping -> True if it's a new best
+    def report(self, value:float) -> bool:
+        if value > self.best_value:
+            self.best_value = value
+            self.stagnation = 0
+            if value >= self.target_value:
+                self._stop("target")
+            return True
+        self.stagnation += 1
+        if self.stagnation >= self.stagnation_limit:
+            self._stop("stagnation")
+        return False
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start_time
+
+    # Wall time left, for functions that still take a time_limit (reads the clock)
+    def remaining_time(self) -> float:
+        if self.stop_reason:
+            return 0.0
+        return max(0.0, self.time_limit - self.elapsed())
+
+    def evaluations(self) -> int:
+        return aux.get_evaluation_count() - self.start_evaluations
+
+    def _check_clock(self) -> bool:
+        now:float = time.perf_counter()
+        self.clock_reads += 1
+        if now - self.start_time >= self.time_limit:
+            return self._stop("time")
+        if self.cpu_time_limit < math.inf and time.process_time() - self.start_cpu_time >= self.cpu_time_limit:
+            return self._stop("cpu_time")
+        since_last_check:float = now - self._last_check
+        if since_last_check < self.check_period / 2 and self._interval < MAX_CHECK_INTERVAL:
+            self._interval *= 2
+        elif since_last_check > self.check_period and self._interval > 1:
+            self._interval //= 2
+        self._last_check = now
+        self._countdown = self._interval
+        return False
+
+    def _stop(self, reason:str) -> bool:
+        self.stop_reason = reason
+        return True
+
+''' Functions '''
+
+# The budget passed down by the caller, or a new one with only a wall time limit (the old time_limit behaviour)
+def get_budget(budget:Budget | None, time_limit:float) -> Budget:
+    return budget if budget is not None else Budget(time_limit)
@@ -0,0 +1,149 @@
+# Python 3.13.4
+
+from bisect import bisect_right
+from typing import Callable, Generator
+
+from move import neighborhood_generator_type, index_bit, _rotate_region
+from auxiliary_functions import list_bool_to_int
+from packed_neighborhood import PackedMoves, CHUNK_SIZE_DEFAULT, FLIP_BIT, SWAP_BITS, REVERSE_SEGMENT, SHIFT_SEGMENT, MOVE_SEGMENT, opcodes_dict
+
+SEEN_MAX_DEFAULT: int = 200_000 # effects remembered for deduplication, past this only no-ops are skipped (bounds memory)
+
+''' Distinct neighborhoods '''
+# Segment moves over a bit vector repeat themselves: reversing 0110 changes nothing, shifting by p and p + len is the same move,
+# and different segments often give the same solution. Two moves give the same solution exactly when they flip the same
+# positions, so the moves are deduplicated on their effect: new_sol ^ sol as a bitmask (move.py bitmask moves)
+# flip_bit, swap_bits and reverse_segment have canonical forms and need no memory:
+#   swap/reverse only change the solution when the two end bits differ, and then the end bits make the effect unique
+# shift_segment keeps one shift per rotation of each segment, move_segment relies on the seen effects only
+# A seen set can be shared between neighborhoods of the same solution, so a solution reached before is skipped
+# The moves are built packed (packed_neighborhood.PackedMoves chunks), effects straight from int operations on the bitmask:
+# no tuple per candidate, and the candidates of each move type are enumerated by index loops in generate_move's order
+
+# Same moves generate_move(sol, move_name) yields, without no-ops and without repeating a resulting solution
+def generate_distinct_moves(sol:list[bool], move_name:str, seen:set[int] | None = None, seen_max:float = SEEN_MAX_DEFAULT) -> neighborhood_generator_type:
+    for chunk in pack_distinct_moves(sol, move_name, seen, seen_max):
+        for index in range(len(chunk)):
+            yield chunk.get(index)
+
+# generate_distinct_moves as PackedMoves chunks of up to chunk_size moves, built lazily (seen gets the effects of a whole chunk at once)
+def pack_distinct_moves(sol:list[bool], move_name:str, seen:set[int] | None = None, seen_max:float = SEEN_MAX_DEFAULT, chunk_size:int = CHUNK_SIZE_DEFAULT) -> Generator[PackedMoves, None, None]:
+    opcode:int | None = opcodes_dict.get(move_name)
+    if opcode is None:
+        return
+    writer:_ChunkWriter = _ChunkWriter(seen if seen is not None else set(), seen_max, chunk_size)
+    yield from _packers[opcode](sol, list_bool_to_int(sol), writer)
+    if len(writer.chunk):
+        yield writer.take()
+
+# Size of the distinct neighborhood of sol - closed form where there is a canonical form, one pass otherwise
+def count_distinct_moves(sol:list[bool], move_name:str) -> int:
+    match move_name:
+        case "flip_bit":
+            return len(sol)
+        case "swap_bits":
+            ones:int = sum(1 for bit in sol if bit)
+            return ones * (len(sol) - ones)
+        case "reverse_segment": # pairs start < end with different bits
+            count:int = 0
+            ones_after:int = sum(1 for bit in sol if bit)
+            for index, bit in enumerate(sol):
+                if bit: ones_after -= 1
+                zeros_after:int = len(sol) - index - 1 - ones_after
+                count += zeros_after if bit else ones_after
+            return count
+        case _:
+            return sum(1 for _ in generate_distinct_moves(sol, move_name, seen_max=float("inf")))
+
+''' Packers '''
+# One per opcode: the candidates of generate_move that can still be distinct, in its order, each with its effect
+# swap_bits / reverse_segment: same end bits -> no-op (swap) or the same as a shorter reverse, so only the pairs with
+# different end bits are enumerated (the positions of the opposite bit after start, from two sorted lists)
+# shift_segment: every rotation of 00..0 or 11..1 is a no-op, and positions p and p + width are the same rotation, so only
+# positions 1..width-1 within generate_move's range 1..num_bits-width are tried
+
+# Collects the distinct moves into chunks, add -> True when the chunk is full (take it)
+class _ChunkWriter:
+    def __init__(self, seen:set[int], seen_max:float, chunk_size:int) -> None:
+        self.seen:set[int] = seen
+        self.seen_max:float = seen_max
+        self.chunk_size:int = chunk_size
+        self.chunk:PackedMoves = PackedMoves()
+
+    def add(self, effect:int, opcode:int, arg1:int, arg2:int = 0, arg3:int = 0) -> bool:
+        if effect == 0 or effect in self.seen:
+            return False
+        if len(self.seen) < self.seen_max:
+            self.seen.add(effect)
+        self.chunk.append(opcode, arg1, arg2, arg3)
+        return len(self.chunk) >= self.chunk_size
+
+    def take(self) -> PackedMoves:
+        chunk:PackedMoves = self.chunk
+        self.chunk = PackedMoves()
+        return chunk
+
+def _pack_flip_bit(sol:list[bool], mask:int, writer:_ChunkWriter) -> Generator[PackedMoves, None, None]:
+    num_bits:int = len(sol)
+    for index in range(num_bits):
+        if writer.add(index_bit(num_bits, index), FLIP_BIT, index):
+            yield writer.take()
+
+# Every first index with the sorted positions of the opposite bit and where the ones after first begin: the pairs
+# (first, opposite[begin:]) are the pairs with different bits, in generate_swap_bits order
+def _different_pairs(sol:list[bool]) -> Generator[tuple[int, list[int], int], None, None]:
+    positions:dict[bool, list[int]] = {True: [], False: []}
+    for index, bit in enumerate(sol):
+        positions[bool(bit)].append(index)
+    for first, bit in enumerate(sol):
+        opposite:list[int] = positions[not bit]
+        yield first, opposite, bisect_right(opposite, first)
+
+def _pack_swap_bits(sol:list[bool], mask:int, writer:_ChunkWriter) -> Generator[PackedMoves, None, None]:
+    num_bits:int = len(sol)
+    for index1, opposite, begin in _different_pairs(sol):
+        bit1:int = index_bit(num_bits, index1)
+        for position in range(begin, len(opposite)):
+            index2:int = opposite[position]
+            if writer.add(bit1 | index_bit(num_bits, index2), SWAP_BITS, index1, index2):
+                yield writer.take()
+
+def _pack_reverse_segment(sol:list[bool], mask:int, writer:_ChunkWriter) -> Generator[PackedMoves, None, None]:
+    num_bits:int = len(sol)
+    for start, opposite, begin in _different_pairs(sol):
+        for position in range(begin, len(opposite)):
+            end:int = opposite[position]
+            width:int = end - start + 1
+            low:int = num_bits - 1 - end
+            region:int = (mask >> low) & ((1 << width) - 1)
+            effect:int = (int(format(region, f"0{width}b")[::-1], 2) ^ region) << low
+            if writer.add(effect, REVERSE_SEGMENT, start, end):
+                yield writer.take()
+
+def _pack_shift_segment(sol:list[bool], mask:int, writer:_ChunkWriter) -> Generator[PackedMoves, None, None]:
+    num_bits:int = len(sol)
+    for start in range(num_bits - 1):
+        for end in range(start + 1, num_bits):
+            width:int = end - start + 1
+            segment_bits:int = (mask >> (num_bits - 1 - end)) & ((1 << width) - 1)
+            if segment_bits == 0 or segment_bits == (1 << width) - 1:
+                continue # every rotation of 00..0 or 11..1 is a no-op
+            for positions in range(1, min(num_bits - width, width - 1) + 1):
+                if writer.add(_rotate_region(mask, num_bits, start, end, positions) ^ mask, SHIFT_SEGMENT, start, end, positions):
+                    yield writer.take()
+
+# Same ranges as move.generate_move_segment
+def _pack_move_segment(sol:list[bool], mask:int, writer:_ChunkWriter) -> Generator[PackedMoves, None, None]:
+    num_bits:int = len(sol)
+    for start in range(num_bits - 1):
+        for end in range(start + 1, num_bits - 1):
+            width:int = end - start + 1
+            for new_position in range(num_bits - (end + start + 1) + 1):
+                if new_position <= start: # region [new_position, end] becomes segment + sol[new_position:start]
+                    new_sol:int = _rotate_region(mask, num_bits, new_position, end, start - new_position)
+                else: # region [start, new_position + width - 1] becomes sol[end+1:new_position+width] + segment
+                    new_sol = _rotate_region(mask, num_bits, start, new_position + width - 1, width)
+                if writer.add(new_sol ^ mask, MOVE_SEGMENT, start, end, new_position):
+                    yield writer.take()
+
+_packers:list[Callable[[list[bool], int, _ChunkWriter], Generator[PackedMoves, None, None]]] = [_pack_flip_bit, _pack_swap_bits, _pack_reverse_segment, _pack_shift_segment, _pack_move_segment]
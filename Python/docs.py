@@ -50,6 +50,8 @@
         # def get_remaining_capacity(dep_sizes:list[int], selec_dep:list[bool], capacity:int) -> int
         # def get_pack_dict(pack_dep:list[tuple[int, int]]) -> dict[int, set[int]]
         # def get_dep_dict(pack_dep:list[tuple[int, int]]) -> dict[int, set[int]]
+        # def load_instance(filename: str, compiled: bool = False) -> tuple[list[int], list[int], list[tuple[int, int]], int] | Instance
+        # def compile_instance(pack_benefits:list[int], dep_sizes:list[int], pack_dep:list[tuple[int, int]], capacity:int) -> Instance
         # def register_results(results: list[list[bool]], pack_benefits:list[int], dep_sizes:list[int], pack_dep:list[tuple[int, int]], capacity:int, terminal:bool=True, external_file:bool=False, file_name:str="results.txt", file_mode:str="a") -> None
 
 '''move.py:'''
@@ -58,6 +60,10 @@
 #       Five generator of neighborhoods, one for each move, and a generic generator by a move name
 #       Dictionaries for moves and generators
 #       Special types for move, move functions, neighborhood and neighborhood generator
+#       Bitmask versions of the five moves (int solutions), move_by_name_mask, random_move_mask and mask_moves_dict
+#       In-place moves: changed_by (indices a move flips, read from its region only) and apply, which flips them on the solution (ILS perturbation)
+#       changed_by_dict: one changed_by_<move>(sol, arg1, arg2, arg3) per move, the table packed_neighborhood dispatches on
+#       random_neighbor draws a move without applying it; SA, parallel tempering and the refinement heuristics score neighbors from changed_by and copy only what they return
 
 '''first_solution.py:'''
 #       All "create_[...]_solution" functions to start with various greedy and randomic solutions
@@ -70,6 +76,108 @@
 #       Smart Hill Climbing, Random Descent Method, Variable Neighborhood Descent and Randomized Variable Neighborhood Descent
 #
 
+'''instance.py:'''
+#       Instance: immutable compiled instance with CSR pack->deps / dep->packs arrays, per-dep total benefit and degree
+#       aux.load_compiled_instance(file) returns it; aux.compile_instance adapts the old 4-lists signatures (cached)
+
+'''incremental_evaluation.py:'''
+#       IncrementalEvaluator: keeps per-pack missing-dependency counters, benefit and used capacity of one solution
+#       flip, delta_if_flip and undo cost O(packs that depend on the flipped dep) instead of a full evaluate_packs
+
+'''batch_evaluation.py:'''
+#       BatchEvaluator: numpy evaluation of a whole (P x num_deps) population matrix - satisfied packs, benefits and used capacity
+#       genetic_algorithm.evaluate_population uses it when numpy is installed
+
+'''flip_gain.py:'''
+#       FlipGainTracker: gain of every flip_bit move kept in an IndexedMaxHeap, updated only where a flip changes it
+#       refinement_heuristic.absolute_best_step takes its flip_bit move from here (tracker cached between calls)
+#       keep_near also keeps, for the unselected deps, the benefit of the packs missing them and one more dep (tabu_search's tie-breaker)
+
+'''feasible_sampler.py:'''
+#       FeasibleMoveSampler: random moves that always fit the capacity (Fenwick tree of unselected deps by size rank)
+#       Used by simulated_annealing, find_initial_temperature, random_best_step and the GA fill loop
+
+'''swap_neighborhood.py:'''
+#       Swap neighborhood restricted to (selected, unselected) pairs whose added dep completes a pack on its own
+#       find_best_swap scores each pair as two incremental flips (absolute_best_step), find_first_swap keeps generate_swap_bits order (first_best_step)
+
+'''distinct_neighborhood.py:'''
+#       generate_distinct_moves: the moves of generate_move without no-ops or repeated resulting solutions (deduplicated on new_sol ^ sol)
+#       count_distinct_moves: size of that neighborhood, used by first_best_step/absolute_best_step through a shared seen set
+#       pack_distinct_moves: the same moves as lazy PackedMoves chunks, effects from int operations without a tuple per candidate
+
+'''packed_neighborhood.py:'''
+#       PackedMoves: a move set as (opcode, arg1, arg2, arg3) int arrays - slices, chunks, random sampling, get back to the tuple form
+#       changed_table / score_table: callables by opcode; first_improvement and best_improvement scan a chunk for first_best_step/absolute_best_step
+
+'''parallel_neighborhood.py:'''
+#       NeighborhoodPool: persistent worker pool with the instance and the current solution in shared memory (RawArray), PackedMoves chunks sent to the workers as they're built, best move reduced by the caller
+#       Budget expiry stops the running tasks through a shared flag, every task is waited for (all evaluations counted)
+#       absolute_best_step(workers=...) / parallel_absolute_best_step use it for the segment neighborhoods (MIN_PARALLEL_MOVES_DEFAULT moves and up)
+
+'''run_experiment.py:'''
+#       Serial runners for each report (constructive, local search, SA, GA, ILS, tabu search), appending rows to output/experiments/<type>.csv
+#       Parallel runner: expand_*_jobs turns a grid into independent run dicts, run_parallel_experiment runs them on a process pool
+
+'''results_store.py:'''
+#       ResultsStore: SQLite index (output/experiments/results.sqlite) of every row appended to the experiment .csv files
+#       run_ids and seeds come from its counter tables, the existing .csv of an experiment is imported the first time it's used
+
+'''instance_cache.py:'''
+#       Binary sidecars of the instance files (input/.instance_cache/<stem>.<content hash>.bin): header + int64 arrays
+#       aux.load_instance memory-maps them instead of parsing the .txt again, run_parallel_experiment converts the files before starting the pool
+#       Only the parse is saved, not memory: to_lists copies the arrays into the Python lists every process compiles its Instance from,
+#       so neither experiment processes nor parallel_neighborhood workers (which read the instance from shared memory) share those pages
+
+'''streaming_analysis.py:'''
+#       StreamingAnalysis: reads each experiment .csv once, in chunks, feeding per-group accumulators (GroupedStats, BestRows)
+#       RunningStats: Welford mean/std, exact median/quartiles up to EXACT_LIMIT_DEFAULT values, P² sketches past that
+#       analyze_results.analyze_all builds every report from that single pass
+
+'''budget.py:'''
+#       Budget: wall time, CPU time, evaluations, stagnation and target value limits in one object, checked with expired()
+#       Reads the clock every k calls (k adapts to the loop speed); passed down ILS -> local search -> heuristic as budget=
+
+'''tabu_search.py:'''
+#       TabuSearch: flip and swap moves scored from FlipGainTracker gains (a swap also subtracts the packs that need both deps), best allowed move every step
+#       Tabu tenure per dep, visited solutions tabu for revisit_tenure moves (zobrist hashes), aspiration on a new best, optional frequency penalty; run_experiment.run_tabu_search_experiment / "tabu_search" jobs
+#       Stops after get_max_tries moves without a new best (500 per dep by default); 13k-34k moves/s on sukp28/29 depending on the first solution (ratio greedy slowest, pack benefit greedy fastest)
+
+'''island_genetic_algorithm.py:'''
+#       island_genetic_algorithm: K GA populations in K processes (own selection/mutation settings each), genetic_algorithm.next_generation per step
+#       Every migration_interval generations the best individuals go to the neighbours (ring or full topology) through pipes; returns the global best and per-island stats
+
+'''fitness_cache.py:'''
+#       FitnessCache: bounded LRU of benefits by zobrist hash, one per instance, emptied by aux.reset_evaluation_count
+#       aux.evaluate_packs and genetic_algorithm.evaluate_population look it up first; hits/misses in aux.get_fitness_cache_hits/misses
+#       A hit still counts as an evaluation (budgets and the evaluations column are the same with or without the cache), rows report cache_hits
+
+'''zobrist.py:'''
+#       64-bit zobrist hash of a solution (xor of the keys of its selected deps): O(1) per flipped bit, crossover offsprings from the parents' hashes
+#       Key of the fitness cache, GA population uniqueness (hashes carried by next_generation) and tabu_search's visited-solution memory
+
+'''batch_breeding.py:'''
+#       breed_offsprings: numpy breeding rounds - parent matrix, k-point or uniform crossover masks per pair, capacity of every offspring in one matrix-vector product
+#       genetic_algorithm.next_generation uses it when numpy is installed (Generator seeded from random), the per-pair loop otherwise
+
+'''repair.py:'''
+#       repair: greedy repair on an IncrementalEvaluator - drops the deps with the worst loss / size until the solution fits, then adds deps that complete packs
+#       GA offsprings and mutants over the capacity (batch_breeding.repair_matrix with numpy) and ILS perturbations are repaired instead of discarded
+
+'''parallel_tempering.py:'''
+#       parallel_tempering: R SA replicas in R processes at a fixed temperature ladder, adjacent states swapped with the Metropolis criterion every exchange_interval moves
+#       Ladder from a short random walk (no find_initial_temperature phase), swap acceptance per temperature pair recorded and used by tune_ladder (auto_tune)
+
+'''batch_annealing.py:'''
+#       ChainBatch / multi_chain_simulated_annealing: C SA chains in lockstep in one process (numpy), flip and swap proposals as index arrays, always feasible
+#       Deltas from a padded dep -> packs matrix for all chains at once, one vectorized acceptance draw; run_experiment.run_batch_simulated_annealing_experiment
+#       Its rows in simulated_annealing.csv have mode "batch" (serial runs: "serial") and chains, time is the batch's wall time
+#       evaluations are each chain's own, batch_evaluations the whole call's (shared temperature search included)
+
+'''identity_memo.py:'''
+#       IdentityMemo: bounded map from an object (by identity, plus extra key parts) to state derived from it, the entry keeps the object alive
+#       One per derived object: aux compiled instances, batch evaluators, samplers, flip gain trackers, fitness caches, SA temperatures, worker pools
+
 '''experiment.py'''
 #       
 #
\ No newline at end of file
@@ -0,0 +1,182 @@
+# Python 3.13.4
+
+import random
+from bisect import bisect_right
+import move
+from move import move_type, neighborhood_type
+from auxiliary_functions import compile_instance
+from instance import Instance
+from identity_memo import IdentityMemo
+
+_samplers: IdentityMemo = IdentityMemo() # instance -> FeasibleMoveSampler, consecutive calls only pay for the deps that changed
+MAX_TRIES_DEFAULT: int = 100 # draws per random_move before giving up (segment moves and swaps without a fitting pair)
+
+''' Fenwick tree '''
+
+# Counts over positions 0..n-1: add and prefix sums in O(log n), k-th set position in O(log n)
+class FenwickTree:
+    def __init__(self, counts:list[int]) -> None:
+        self.size:int = len(counts)
+        self.tree:list[int] = [0] + counts # 1-based
+        for i in range(1, self.size + 1): # O(n) build
+            parent:int = i + (i & -i)
+            if parent <= self.size:
+                self.tree[parent] += self.tree[i]
+        self.top_bit:int = 1 << self.size.bit_length() if self.size else 0
+
+    def add(self, position:int, delta:int) -> None:
+        i:int = position + 1
+        while i <= self.size:
+            self.tree[i] += delta
+            i += i & -i
+
+    # Sum of positions [0, end)
+    def prefix(self, end:int) -> int:
+        total:int = 0
+        while end > 0:
+            total += self.tree[end]
+            end -= end & -end
+        return total
+
+    # Smallest position whose prefix(position + 1) > k
+    def find_kth(self, k:int) -> int:
+        position:int = 0
+        step:int = self.top_bit
+        while step:
+            next_position:int = position + step
+            if next_position <= self.size and self.tree[next_position] <= k:
+                position = next_position
+                k -= self.tree[next_position]
+            step >>= 1
+        return position
+
+''' Feasible move sampler '''
+
+# Draws random moves that keep the solution inside the capacity, instead of drawing any move and discarding it afterwards
+# Unselected deps are counted in a Fenwick tree by size rank, so "an unselected dep with size <= free" is a prefix draw
+# flip_bit: uniform over the feasible flips (removals + fitting additions)
+# swap_bits: selected dep drawn uniformly, then an unselected dep with size <= free + size of the selected one
+# segment moves: drawn as random_move does and kept only if the size change over the changed deps fits
+class FeasibleMoveSampler:
+    def __init__(self, instance:Instance, sol:list[bool] | None = None) -> None:
+        self.instance:Instance = instance
+        self.num_deps:int = instance.num_deps
+        self.dep_sizes:tuple[int, ...] = instance.dep_sizes
+        self.order:list[int] = sorted(range(self.num_deps), key=lambda dep: self.dep_sizes[dep]) # size rank -> dep
+        self.rank:list[int] = [0]*self.num_deps # dep -> size rank
+        for rank, dep in enumerate(self.order):
+            self.rank[dep] = rank
+        self.sorted_sizes:list[int] = [self.dep_sizes[dep] for dep in self.order]
+        self.reset(sol if sol is not None else [False]*self.num_deps)
+
+    # Loads a new solution - O(n)
+    def reset(self, sol:list[bool]) -> None:
+        self.sol:list[bool] = list(sol)
+        self.free:int = self.instance.capacity - sum(self.dep_sizes[dep] for dep in range(self.num_deps) if self.sol[dep])
+        self.unselected:FenwickTree = FenwickTree([0 if self.sol[dep] else 1 for dep in self.order])
+        self.selected:list[int] = [dep for dep in range(self.num_deps) if self.sol[dep]] # for O(1) uniform draws
+        self.selected_position:dict[int, int] = {dep: i for i, dep in enumerate(self.selected)}
+
+    # Brings the sampler to sol, flipping only the deps that differ
+    def sync(self, sol:list[bool]) -> None:
+        if self.sol == sol:
+            return
+        if len(sol) != self.num_deps:
+            self.reset(sol)
+            return
+        for dep in [dep for dep in range(self.num_deps) if self.sol[dep] != sol[dep]]:
+            self.flip(dep)
+
+    def flip(self, dep:int) -> None:
+        if self.sol[dep]:
+            self.sol[dep] = False
+            self.free += self.dep_sizes[dep]
+            self.unselected.add(self.rank[dep], 1)
+            position:int = self.selected_position.pop(dep)
+            last:int = self.selected.pop()
+            if last != dep:
+                self.selected[position] = last
+                self.selected_position[last] = position
+        else:
+            self.sol[dep] = True
+            self.free -= self.dep_sizes[dep]
+            self.unselected.add(self.rank[dep], -1)
+            self.selected_position[dep] = len(self.selected)
+            self.selected.append(dep)
+
+    # Number of unselected deps with size <= max_size
+    def count_fitting(self, max_size:int) -> int:
+        return self.unselected.prefix(bisect_right(self.sorted_sizes, max_size))
+
+    # Random unselected dep with size <= max_size, -1 if there is none
+    def random_fitting(self, max_size:int) -> int:
+        count:int = self.count_fitting(max_size)
+        if count == 0:
+            return -1
+        return self.order[self.unselected.find_kth(random.randrange(count))]
+
+    # Same interface as move.random_move, but the move is applied on a copy and always fits (or is an error)
+    def random_move(self, neighborhood_names:list[str] = [], max_tries:int = MAX_TRIES_DEFAULT) -> move_type:
+        neighbor:neighborhood_type = self.random_neighbor(neighborhood_names, max_tries)
+        if neighbor[0] == "error":
+            return (self.sol[:], "error", -1)
+        return move.move_by_name(self.sol[:], neighbor)
+
+    # The move random_move would apply, not applied: no copy of the solution (move.changed_by gives its flips)
+    def random_neighbor(self, neighborhood_names:list[str] = [], max_tries:int = MAX_TRIES_DEFAULT) -> neighborhood_type:
+        error_output: neighborhood_type = ("error", -1)
+        move_names:list[str] = [name for name in neighborhood_names if name in move.moves_dict] if neighborhood_names else list(move.moves_dict.keys())
+        if not move_names or self.num_deps < 2:
+            return error_output
+        for _ in range(max_tries):
+            neighbor:neighborhood_type = self._draw(random.choice(move_names))
+            if neighbor[0] != "error":
+                return neighbor
+        return error_output
+
+    def _draw(self, move_name:str) -> neighborhood_type:
+        error_output: neighborhood_type = ("error", -1)
+        if self.free < 0: # infeasible current solution, no shortcut -> check the move itself
+            return self._draw_checked(move_name)
+        match move_name:
+            case "flip_bit":
+                num_fitting:int = self.count_fitting(self.free)
+                r:int = random.randrange(len(self.selected) + num_fitting) if len(self.selected) + num_fitting else -1
+                if r < 0:
+                    return error_output
+                if r < len(self.selected): # removal always fits
+                    return ("flip_bit", self.selected[r])
+                return ("flip_bit", self.order[self.unselected.find_kth(r - len(self.selected))])
+            case "swap_bits":
+                if not self.selected:
+                    return error_output
+                removed:int = random.choice(self.selected)
+                added:int = self.random_fitting(self.free + self.dep_sizes[removed])
+                if added < 0:
+                    return error_output
+                return ("swap_bits", removed, added)
+            case _:
+                return self._draw_checked(move_name)
+
+    # Draws like move.random_move and keeps the move only if its size change fits - O(changed deps), no full scan
+    def _draw_checked(self, move_name:str) -> neighborhood_type:
+        neighbor:neighborhood_type = move.random_neighbor(self.num_deps, [move_name])
+        if neighbor[0] == "error":
+            return neighbor
+        size_delta:int = sum(-self.dep_sizes[dep] if self.sol[dep] else self.dep_sizes[dep] for dep in move.changed_by(self.sol, neighbor))
+        if size_delta > self.free:
+            return ("error", -1)
+        return neighbor
+
+''' Functions '''
+
+# Sampler of the instance already synced to sol, kept between calls
+def get_feasible_sampler(sol:list[bool], pack_benefits:list[int], dep_sizes:list[int], pack_dep:list[tuple[int, int]], capacity:int) -> FeasibleMoveSampler:
+    instance:Instance = compile_instance(pack_benefits, dep_sizes, pack_dep, capacity)
+    sampler:FeasibleMoveSampler | None = _samplers.get(instance)
+    if sampler is not None:
+        sampler.sync(sol)
+        return sampler
+    sampler = FeasibleMoveSampler(instance, sol)
+    _samplers.put(instance, sampler)
+    return sampler
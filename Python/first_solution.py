@@ -18,7 +18,7 @@ def create_first_solution(method_name:str, pack_benefits:list[int], dep_sizes:li
 
 
 # Randomic first solution: always returns a valid solution (doesn't exceed capacity)
-def create_randomic_solution(pack_benefits:list[int], dep_sizes:list[int], pack_dep:list[tuple[int, int]], capacity:int, args) -> list[bool]:
+def create_randomic_solution(pack_benefits:list[int], dep_sizes:list[int], pack_dep:list[tuple[int, int]], capacity:int, args = None) -> list[bool]: # args unused, keeps the signature of the other first solutions
     free_space: int = capacity
     selec_dep: list[bool] = [False]*len(dep_sizes)
     deps: list[tuple[int, int]] = list(enumerate(dep_sizes)) # (dep_id, dep_size)
@@ -34,12 +34,8 @@ def create_ratio_greedy_solution(pack_benefits:list[int], dep_sizes:list[int], p
     free_space: int = capacity
     selec_dep: list[bool] = [False]*len(dep_sizes)
 
-    deps: list[tuple[int, float, int]] = [] # (dep_id, total_dep_benefit, size)
-    dep_dict: dict[int, set[int]] = aux.get_dep_dict(pack_dep) # dep_id -> set of packages that depend on it
-
-    for dep_id in range(len(dep_sizes)):
-        total_dep_benefit: int = sum(pack_benefits[pack] for pack in dep_dict.get(dep_id, []))
-        deps.append((dep_id, total_dep_benefit, dep_sizes[dep_id]))
+    instance: aux.Instance = aux.compile_instance(pack_benefits, dep_sizes, pack_dep, capacity)
+    deps: list[tuple[int, float, int]] = [(dep_id, instance.dep_total_benefit[dep_id], dep_sizes[dep_id]) for dep_id in range(len(dep_sizes))] # (dep_id, total_dep_benefit, size)
     deps.sort(key=lambda x: x[1]/x[2], reverse=biggest_first) # sort by benefit/size ratio
     
     for dep in deps:
@@ -69,10 +65,10 @@ def create_pack_benefit_greedy_solution(pack_benefits:list[int], dep_sizes:list[
 
     packs: list[tuple[int, int]] = list(enumerate(pack_benefits)) # (pack_id, pack_benefit)
     packs.sort(key=lambda x: x[1], reverse=biggest_first) # sort by benefit
-    pack_dict: dict[int, set[int]] = aux.get_pack_dict(pack_dep) # pack_id -> set of dependencies it needs
+    pack_deps: tuple[tuple[int, ...], ...] = aux.compile_instance(pack_benefits, dep_sizes, pack_dep, capacity).pack_deps # pack_id -> dependencies it needs
 
     for pack in packs:
-        needed_deps = pack_dict.get(pack[0], set())
+        needed_deps = pack_deps[pack[0]]
         total_size_needed = sum(dep_sizes[dep] for dep in needed_deps if not selec_dep[dep])
         if free_space - total_size_needed >= 0:
             free_space -= total_size_needed
@@ -90,17 +86,13 @@ def create_economic_pack_benefit_greedy_solution(pack_benefits:list[int], dep_si
 
     packs: list[tuple[int, int]] = list(enumerate(pack_benefits)) # (pack_id, pack_benefit)
     packs.sort(key=lambda x: x[1], reverse=biggest_first) # sort by benefit
-    pack_dict: dict[int, set[int]] = aux.get_pack_dict(pack_dep) # pack_id -> set of dependencies it needs
+    pack_deps: tuple[tuple[int, ...], ...] = aux.compile_instance(pack_benefits, dep_sizes, pack_dep, capacity).pack_deps # pack_id -> dependencies it needs
     pack_index:int = 0
     tries_since_last_add:int = 0
     num_packs:int = len(packs)
 
     while free_space > 0 and tries_since_last_add < num_packs: # stop if we have tried to add all packs without success
-        needed_deps = pack_dict.get(packs[pack_index][0], set()) # set() is the default value to be returned if pack[0] not in pack_dict
-        copy = needed_deps.copy()
-        for dep in copy:
-            if selec_dep[dep]:
-                needed_deps.remove(dep)
+        needed_deps = [dep for dep in pack_deps[packs[pack_index][0]] if not selec_dep[dep]] # only the ones not selected yet
         total_size_needed = sum(dep_sizes[dep] for dep in needed_deps if not selec_dep[dep])
         if free_space - total_size_needed >= 0:
             free_space -= total_size_needed
@@ -117,8 +109,8 @@ def create_num_pack_greedy_solution(pack_benefits:list[int], dep_sizes:list[int]
     free_space: int = capacity
     selec_dep: list[bool] = [False]*len(dep_sizes)
 
-    deps_dict: dict[int, set[int]] = aux.get_dep_dict(pack_dep) # dep_id -> set of packages that depend on it
-    deps: list[tuple[int, int]] = [(dep, len(deps_dict[dep])) for dep in deps_dict] # (dep_id, num_packs)
+    dep_degree: tuple[int, ...] = aux.compile_instance(pack_benefits, dep_sizes, pack_dep, capacity).dep_degree # dep_id -> number of packages that depend on it
+    deps: list[tuple[int, int]] = [(dep, dep_degree[dep]) for dep in dict.fromkeys(dep for _, dep in pack_dep)] # (dep_id, num_packs), in order of first appearance
 
     deps.sort(key=lambda x: x[1], reverse=biggest_first) # sort by num_packs
 
@@ -133,12 +125,8 @@ def create_randomized_ratio_greedy_solution(pack_benefits:list[int], dep_sizes:l
     free_space: int = capacity
     selec_dep: list[bool] = [False]*len(dep_sizes)
 
-    deps: list[tuple[int, float, int]] = [] # (dep_id, total_dep_benefit, size)
-    dep_dict: dict[int, set[int]] = aux.get_dep_dict(pack_dep) # dep_id -> set of packages that depend on it
-    
-    for dep_id in range(len(dep_sizes)):
-        total_dep_benefit: int = sum(pack_benefits[pack] for pack in dep_dict.get(dep_id, []))
-        deps.append((dep_id, total_dep_benefit, dep_sizes[dep_id]))
+    instance: aux.Instance = aux.compile_instance(pack_benefits, dep_sizes, pack_dep, capacity)
+    deps: list[tuple[int, float, int]] = [(dep_id, instance.dep_total_benefit[dep_id], dep_sizes[dep_id]) for dep_id in range(len(dep_sizes))] # (dep_id, total_dep_benefit, size)
     deps.sort(key=lambda x: x[1]/x[2], reverse=biggest_first) # sort by benefit/size ratio
 
     # Introduce randomness by selecting from the top cutoff*100% of the sorted list
@@ -178,13 +166,13 @@ def create_randomized_pack_benefit_greedy_solution(pack_benefits:list[int], dep_
 
     packs: list[tuple[int, int]] = list(enumerate(pack_benefits)) # (pack_id, pack_benefit)
     packs.sort(key=lambda x: x[1], reverse=biggest_first) # sort by benefit
-    pack_dict: dict[int, set[int]] = aux.get_pack_dict(pack_dep) # pack_id -> set of dependencies it needs
+    pack_deps: tuple[tuple[int, ...], ...] = aux.compile_instance(pack_benefits, dep_sizes, pack_dep, capacity).pack_deps # pack_id -> dependencies it needs
 
     # Introduce randomness by selecting from the top cutoff*100% of the sorted list
     cutoff = int(cutoff*len(packs))
     while packs:
         pack = random.choice(packs[:cutoff])
-        needed_deps = pack_dict.get(pack[0], set())
+        needed_deps = pack_deps[pack[0]]
         total_size_needed = sum(dep_sizes[dep] for dep in needed_deps if not selec_dep[dep])
         if free_space - total_size_needed >= 0:
             free_space -= total_size_needed
@@ -199,8 +187,8 @@ def create_randomized_num_pack_greedy_solution(pack_benefits:list[int], dep_size
     free_space: int = capacity
     selec_dep: list[bool] = [False]*len(dep_sizes)
 
-    deps_dict: dict[int, set[int]] = aux.get_dep_dict(pack_dep) # dep_id -> set of packages that depend on it
-    deps: list[tuple[int, int]] = [(dep, len(deps_dict[dep])) for dep in deps_dict] # (dep_id, num_packs)
+    dep_degree: tuple[int, ...] = aux.compile_instance(pack_benefits, dep_sizes, pack_dep, capacity).dep_degree # dep_id -> number of packages that depend on it
+    deps: list[tuple[int, int]] = [(dep, dep_degree[dep]) for dep in dict.fromkeys(dep for _, dep in pack_dep)] # (dep_id, num_packs), in order of first appearance
 
     deps.sort(key=lambda x: x[1], reverse=biggest_first) # sort by num_packs
 
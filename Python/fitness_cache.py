@@ -0,0 +1,49 @@
+# Python 3.13.4
+
+from collections import OrderedDict
+from instance import Instance
+from identity_memo import IdentityMemo
+
+_fitness_caches: IdentityMemo = IdentityMemo() # instance -> FitnessCache
+FITNESS_CACHE_SIZE_DEFAULT: int = 1 << 16 # solutions remembered per instance, 0 disables the cache
+
+''' Fitness cache '''
+# Benefit of the solutions already evaluated, keyed by the solution's 64-bit zobrist hash (zobrist.py)
+# Bounded: once max_size solutions are stored, the least recently used one is dropped for each new one
+# A converged GA population or an ILS that keeps falling in the same local optima hits it instead of evaluating again
+
+class FitnessCache:
+    def __init__(self, max_size:int = FITNESS_CACHE_SIZE_DEFAULT) -> None:
+        self.max_size:int = max_size
+        self.entries:OrderedDict[int, int] = OrderedDict() # key -> benefit, least recently used first
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    # Benefit stored for key (now the most recently used) or None
+    def get(self, key:int) -> int | None:
+        benefit:int | None = self.entries.get(key)
+        if benefit is not None:
+            self.entries.move_to_end(key)
+        return benefit
+
+    def put(self, key:int, benefit:int) -> None:
+        if self.max_size <= 0:
+            return
+        self.entries[key] = benefit
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False) # least recently used
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+''' Functions '''
+
+# Cache of the instance, created the first time it's asked for
+def get_fitness_cache(instance:Instance) -> FitnessCache:
+    return _fitness_caches.get_or_create(instance, FitnessCache)
+
+# Empties every cache (a new run must not hit the solutions of the previous one)
+def clear_fitness_caches() -> None:
+    _fitness_caches.clear()
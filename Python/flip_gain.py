@@ -0,0 +1,228 @@
+# Python 3.13.4
+
+import heapq
+from auxiliary_functions import compile_instance, add_evaluation_count
+from incremental_evaluation import IncrementalEvaluator
+from instance import Instance
+from identity_memo import IdentityMemo
+
+_trackers: IdentityMemo = IdentityMemo() # instance -> FlipGainTracker, so consecutive steps of a search reuse the gains
+RESET_FRACTION_DEFAULT: float = 0.125 # more changed deps than this fraction -> rebuild instead of flipping one by one
+
+''' Indexed max-heap '''
+
+# Binary max-heap over the items 0..n-1 with a position index, so the key of any item changes in O(log n)
+class IndexedMaxHeap:
+    def __init__(self, keys:list[int]) -> None:
+        self.keys:list[int] = keys[:]                 # keys[item]
+        self.heap:list[int] = list(range(len(keys)))  # heap[node] = item
+        self.position:list[int] = list(range(len(keys))) # position[item] = node
+        for node in range(len(keys)//2 - 1, -1, -1):
+            self._sift_down(node)
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    # Item with the largest key
+    def top(self) -> int:
+        return self.heap[0]
+
+    def update(self, item:int, key:int) -> None:
+        old_key:int = self.keys[item]
+        self.keys[item] = key
+        if key > old_key:
+            self._sift_up(self.position[item])
+        elif key < old_key:
+            self._sift_down(self.position[item])
+
+    def _swap(self, node1:int, node2:int) -> None:
+        heap:list[int] = self.heap
+        heap[node1], heap[node2] = heap[node2], heap[node1]
+        self.position[heap[node1]] = node1
+        self.position[heap[node2]] = node2
+
+    def _sift_up(self, node:int) -> None:
+        keys:list[int] = self.keys
+        heap:list[int] = self.heap
+        while node > 0:
+            parent:int = (node - 1) // 2
+            if keys[heap[parent]] >= keys[heap[node]]: break
+            self._swap(parent, node)
+            node = parent
+
+    def _sift_down(self, node:int) -> None:
+        keys:list[int] = self.keys
+        heap:list[int] = self.heap
+        size:int = len(heap)
+        while True:
+            largest:int = node
+            for child in (2*node + 1, 2*node + 2):
+                if child < size and keys[heap[child]] > keys[heap[largest]]:
+                    largest = child
+            if largest == node: break
+            self._swap(node, largest)
+            node = largest
+
+''' Flip gain tracker '''
+
+# Keeps gain[dep] = benefit change of flipping dep for the current solution, inside an IndexedMaxHeap
+# Flipping dep only changes the gains of deps that share a pack with it, and those are updated by the difference
+# Heap keys are gain * num_deps + (num_deps - 1 - dep): ties go to the lowest dep, the same one a scan in index order keeps
+# Optionally also near[dep] (unselected deps, 0 for the others) = benefit of the packs that miss dep and one more dep,
+# kept on the same walk over the flipped dep's packs (tabu_search breaks ties between equal gains with it)
+class FlipGainTracker:
+    # keep_heap=False only keeps the gains (for searches that order the deps their own way), best_flip needs the heap
+    def __init__(self, instance:Instance, sol:list[bool] | None = None, keep_heap:bool = True, keep_near:bool = False) -> None:
+        self.instance:Instance = instance
+        self.keep_heap:bool = keep_heap
+        self.keep_near:bool = keep_near
+        self.num_deps:int = instance.num_deps
+        self.evaluator:IncrementalEvaluator = IncrementalEvaluator.from_instance(instance, sol)
+        self.gains:list[int] = []
+        self.near:list[int] = []
+        self.heap:IndexedMaxHeap = IndexedMaxHeap([])
+        self.last_changed:set[int] = set() # deps whose gain (or near) the last flip updated
+        self.reset(self.evaluator.sol)
+
+    # Loads a new solution and recomputes every gain - O(|pack_dep|)
+    def reset(self, sol:list[bool]) -> None:
+        self.evaluator.reset(sol)
+        self.gains = [self._get_gain(dep) for dep in range(self.num_deps)]
+        add_evaluation_count(self.num_deps)
+        if self.keep_near:
+            self.near = [self._get_near(dep) for dep in range(self.num_deps)]
+        if self.keep_heap:
+            self.heap = IndexedMaxHeap([self._get_key(dep) for dep in range(self.num_deps)])
+
+    # Brings the tracker to sol, flipping only the deps that differ when there are few of them
+    def sync(self, sol:list[bool], reset_fraction:float = RESET_FRACTION_DEFAULT) -> None:
+        current:list[bool] = self.evaluator.sol
+        if current == sol:
+            return
+        if len(sol) != self.num_deps:
+            self.reset(sol)
+            return
+        changed:list[int] = [dep for dep in range(self.num_deps) if current[dep] != sol[dep]]
+        if len(changed) > reset_fraction * self.num_deps:
+            self.reset(sol)
+            return
+        for dep in changed:
+            self.flip(dep)
+
+    # Flips dep and updates the gains it affects, returns the benefit change
+    # A pack only adds to the gains of its deps while it misses 0 or 1 of them, so only packs whose count moves
+    # between 0, 1 and 2 touch other gains - most packs of a dense instance stay far from that and cost nothing
+    # near moves with the packs whose count moves between 1, 2 and 3, and only for their unselected deps
+    def flip(self, dep:int) -> int:
+        delta:int = self.evaluator.flip(dep)
+        self.evaluator.commit()
+        sol:list[bool] = self.evaluator.sol
+        missing:list[int] = self.evaluator.missing
+        gains:list[int] = self.gains
+        near:list[int] = self.near
+        keep_near:bool = self.keep_near
+        pack_benefits:tuple[int, ...] = self.instance.pack_benefits
+        pack_deps:tuple[tuple[int, ...], ...] = self.instance.pack_deps
+        step:int = 1 if sol[dep] else -1 # missing count before the flip = after + step
+        reach:int = 3 if keep_near else 2 # packs missing at least this many deps before and after the flip change nothing
+        complete:int = 0 if sol[dep] else 1 # dep's own gain counts its packs with this many missing deps (_get_gain)
+        dep_gain:int = 0
+        dep_near:int = 0
+
+        changed:set[int] = {dep}
+        for pack in self.instance.dep_packs[dep]:
+            new_missing:int = missing[pack]
+            old_missing:int = new_missing + step
+            if new_missing >= reach and old_missing >= reach:
+                continue
+            benefit:int = pack_benefits[pack]
+            if new_missing == complete:
+                dep_gain += benefit
+            if new_missing == 2:
+                dep_near += benefit
+            deps:tuple[int, ...] = pack_deps[pack]
+            if new_missing + old_missing == 1: # completed or broken: the other deps are all selected, removing one breaks it
+                change:int = benefit if new_missing else -benefit
+                for other in deps: # dep's own gain is recomputed below
+                    gains[other] += change
+                changed.update(deps)
+            elif new_missing + old_missing == 3: # the unselected deps: adding the last missing one completes it
+                change = benefit if new_missing == 1 else -benefit
+                for other in deps:
+                    if not sol[other]:
+                        gains[other] += change
+                        if keep_near:
+                            near[other] -= change
+                        changed.add(other)
+            else: # between 2 and 3 missing (keep_near): only near of the unselected deps changes
+                change = benefit if new_missing == 2 else -benefit
+                for other in deps:
+                    if not sol[other]:
+                        near[other] += change
+                        changed.add(other)
+        gains[dep] = -dep_gain if sol[dep] else dep_gain
+        if keep_near:
+            near[dep] = 0 if sol[dep] else dep_near
+
+        if self.keep_heap:
+            for other in changed:
+                self.heap.update(other, self._get_key(other))
+        self.last_changed = changed
+        add_evaluation_count(len(changed))
+        return delta
+
+    # Best improving flip that fits in the capacity -> (dep, gain), or (-1, 0) if there is none
+    # Only additions can improve, so the search walks the heap best-first and stops at the first fitting dep
+    def best_flip(self) -> tuple[int, int]:
+        if self.num_deps == 0:
+            return (-1, 0)
+        gains:list[int] = self.gains
+        sol:list[bool] = self.evaluator.sol
+        dep_sizes:tuple[int, ...] = self.instance.dep_sizes
+        remaining:int = self.evaluator.get_remaining_capacity()
+        keys:list[int] = self.heap.keys
+        heap:list[int] = self.heap.heap
+        size:int = len(heap)
+
+        frontier:list[tuple[int, int]] = [(-keys[heap[0]], 0)] # (-key, heap node), only infeasible nodes get expanded
+        while frontier:
+            node:int = heapq.heappop(frontier)[1]
+            dep:int = heap[node]
+            if gains[dep] <= 0:
+                break # every node left has a key as small or smaller
+            if not sol[dep] and dep_sizes[dep] <= remaining:
+                return (dep, gains[dep])
+            for child in (2*node + 1, 2*node + 2):
+                if child < size:
+                    heapq.heappush(frontier, (-keys[heap[child]], child))
+        return (-1, 0)
+
+    def _get_gain(self, dep:int) -> int:
+        missing:list[int] = self.evaluator.missing
+        pack_benefits:tuple[int, ...] = self.instance.pack_benefits
+        if self.evaluator.sol[dep]:
+            return -sum(pack_benefits[pack] for pack in self.instance.dep_packs[dep] if missing[pack] == 0)
+        return sum(pack_benefits[pack] for pack in self.instance.dep_packs[dep] if missing[pack] == 1)
+
+    def _get_near(self, dep:int) -> int:
+        if self.evaluator.sol[dep]:
+            return 0
+        missing:list[int] = self.evaluator.missing
+        pack_benefits:tuple[int, ...] = self.instance.pack_benefits
+        return sum(pack_benefits[pack] for pack in self.instance.dep_packs[dep] if missing[pack] == 2)
+
+    def _get_key(self, dep:int) -> int:
+        return self.gains[dep] * self.num_deps + (self.num_deps - 1 - dep)
+
+''' Functions '''
+
+# Tracker of the instance already synced to sol, kept between calls so a descent only pays for the deps each step changes
+def get_flip_gain_tracker(sol:list[bool], pack_benefits:list[int], dep_sizes:list[int], pack_dep:list[tuple[int, int]], capacity:int) -> FlipGainTracker:
+    instance:Instance = compile_instance(pack_benefits, dep_sizes, pack_dep, capacity)
+    tracker:FlipGainTracker | None = _trackers.get(instance)
+    if tracker is not None:
+        tracker.sync(sol)
+        return tracker
+    tracker = FlipGainTracker(instance, sol)
+    _trackers.put(instance, tracker)
+    return tracker
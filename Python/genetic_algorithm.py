@@ -1,11 +1,23 @@
 # Python 3.13.4
 
 import random
-import time
-from typing import Callable
+from typing import Callable, Iterator
 from move import move_type, get_valid_random_move
-from auxiliary_functions import evaluate_packs, get_remaining_capacity, get_pack_dict#, ga_debug_report, ga_debug_close
+from auxiliary_functions import evaluate_packs, get_remaining_capacity, get_pack_instance, compile_instance, lookup_fitness, store_fitness, add_evaluation_count#, ga_debug_report, ga_debug_close
 from first_solution import create_randomic_solution
+from feasible_sampler import FeasibleMoveSampler, get_feasible_sampler
+from budget import Budget, get_budget
+from instance import Instance
+from zobrist import get_zobrist_keys, zobrist_hash, flip_hash, crossover_hashes
+from incremental_evaluation import IncrementalEvaluator
+from repair import repair
+
+try:
+    import batch_evaluation # needs numpy
+    import batch_breeding
+except ImportError: # numpy not installed -> evaluate and breed one individual at a time
+    batch_evaluation = None
+    batch_breeding = None
 
 GENERATIONS_DEFAULT: int = 20
 GENES_PER_GENERATION_DEFAULT:int = 200
@@ -17,90 +29,34 @@ LINEAR_RANK_SELECTION_PRESSURE:float = 1.5
 TOURNAMENT_SIZE_DEFAULT:int = 10
 TIME_LIMIT_DEFAULT:float = 90.0
 CROSSOVER_MIN_GAP: int = 5
+REPAIR_OFFSPRINGS_DEFAULT: bool = True # offsprings over the capacity are repaired (repair.py) instead of discarded
+CROSSOVER_TYPES: tuple[str, ...] = ("k_point", "uniform") # uniform: every gene from either parent with probability 1/2 (crossover_points unused)
+CROSSOVER_TYPE_DEFAULT: str = "k_point"
 
 #
-def genetic_algorithm (sol:list[bool], pack_benefits: list[int], dep_sizes:list[int], pack_dep:list[tuple[int, int]], capacity:int, neighborhood_names:list[str] = [], generations:int=GENERATIONS_DEFAULT, genes_per_generation:int = GENES_PER_GENERATION_DEFAULT, parents_per_generation:int = PARENTS_DEFAULT, parent_selection_id:int = 2, parents_survive:bool = True, elite_number:int = ELITISM_DEFAULT, two_offsprings:bool = True, crossover_points:list[int] = [], mutation:float = MUTATION_DEFAULT, mutations_per_gene:int = MUTATIONS_PER_GENE_DEFAULT, time_limit:float = TIME_LIMIT_DEFAULT, verbose:bool = False) -> tuple:
-    start_time: float = time.time()
+def genetic_algorithm (sol:list[bool], pack_benefits: list[int], dep_sizes:list[int], pack_dep:list[tuple[int, int]], capacity:int, neighborhood_names:list[str] = [], generations:int=GENERATIONS_DEFAULT, genes_per_generation:int = GENES_PER_GENERATION_DEFAULT, parents_per_generation:int = PARENTS_DEFAULT, parent_selection_id:int = 2, parents_survive:bool = True, elite_number:int = ELITISM_DEFAULT, two_offsprings:bool = True, crossover_points:list[int] = [], mutation:float = MUTATION_DEFAULT, mutations_per_gene:int = MUTATIONS_PER_GENE_DEFAULT, time_limit:float = TIME_LIMIT_DEFAULT, verbose:bool = False, budget:Budget | None = None, repair_offsprings:bool = REPAIR_OFFSPRINGS_DEFAULT, crossover_type:str = CROSSOVER_TYPE_DEFAULT) -> tuple:
+    budget = get_budget(budget, time_limit) # a budget passed down replaces time_limit
 
     if len(sol) == 0: sol = create_randomic_solution(pack_benefits, dep_sizes, pack_dep, capacity) # no solution was submited
-    population: list[list[bool]] = generate_first_generation(sol[:], neighborhood_names, genes_per_generation)
-    population_fitness:list[int] = evaluate_population(population, pack_benefits, pack_dep)
+    population_hashes: list[int] = []
+    population: list[list[bool]] = generate_first_generation(sol[:], neighborhood_names, genes_per_generation, population_hashes)
+    population_fitness:list[int] = evaluate_population(population, pack_benefits, pack_dep, population_hashes)
+    if population_fitness: budget.report(max(population_fitness))
     # state used by ga_debug_report to persist CSV writer/file across calls
     debug_state: dict | None = None
 
     for gen in range(generations):
-        if time.time() - start_time >= time_limit: print("Expired time - starting generation"); break
+        if budget.expired(): print("Expired time - starting generation"); break
         print(f"Running generation {gen}")
 
         # Delegate verbose debug printing and CSV logging to auxiliary function
         # Log diagnostics to a single CSV file but avoid printing samples to stdout
         #debug_state = ga_debug_report(gen, population, population_fitness, pack_benefits, pack_dep, dep_sizes, capacity, verbose=verbose, debug_state=debug_state, print_to_stdout=False)
 
-        # Compute elite and selected parents up front
-        elite:list[list[bool]] = elitism(population, population_fitness, elite_number)
-        elite_set = set(map(tuple, elite))
-        selected_parents = select_parents(population, population_fitness, parents_per_generation, list(parents_selection_dict.keys())[parent_selection_id])
-
-        # Keep surviving parents if requested; avoid duplicating elites (fast membership)
-        survivors: list[list[bool]] = [p[:] for p in selected_parents if tuple(p) not in elite_set] if parents_survive else []
-
-        # Build a set of existing individuals (elites + survivors) so we can reject duplicates O(1)
-        existing_keys:set[tuple] = set(map(tuple, elite)) | set(map(tuple, survivors))
-
-        # Determine how many offsprings we still need to fill the generation
-        needed_offsprings = genes_per_generation - (len(survivors) + len(elite))
-        if needed_offsprings < 0:
-            needed_offsprings = 0
-
-        # Breed offspring while ensuring uniqueness by checking existing_keys (no nested loops)
-        offsprings: list[list[bool]] = []
-        attempts = 0
-        max_attempts = max(1000, needed_offsprings * 10 + 100)
-        while len(offsprings) < needed_offsprings and attempts < max_attempts:
-            if time.time() - start_time >= time_limit: print("Expired time - breeding"); break
-            attempts += 1
-
-            parent1:list[bool] = random.choice(selected_parents)
-            parent2:list[bool] = random.choice(selected_parents)
-            if parent1 == parent2: continue # avoid crossover with itself
-
-            new_offsprings = [kid for kid in crossover(parent1, parent2, crossover_points, two_offsprings) if get_remaining_capacity(dep_sizes, kid, capacity) >= 0]
-            if len(new_offsprings) == 0: continue # crossover failed
-
-            for kid in new_offsprings:
-                if time.time() - start_time >= time_limit: print("Expired time - breeding"); break
-                k = tuple(kid)
-                if k in existing_keys:
-                    continue
-                offsprings.append(kid)
-                existing_keys.add(k)
-                if len(offsprings) >= needed_offsprings:
-                    break
-
-        # If for some reason we couldn't generate enough unique offsprings, we will fill the rest
-        # with generated valid random moves (keeping uniqueness) as a minimal, deterministic fallback.
-        fill_attempts = 0
-        while len(offsprings) < needed_offsprings and fill_attempts < 1000:
-            if time.time() - start_time >= time_limit: print("Expired time - breeding"); break
-            fill_attempts += 1
-            new_move = get_valid_random_move(sol[:], neighborhood_names)
-            if new_move[1] == "error":
-                continue
-            kid = new_move[0][:]
-            k = tuple(kid)
-            if get_remaining_capacity(dep_sizes, kid, capacity) < 0:
-                continue
-            if k in existing_keys:
-                continue
-            offsprings.append(kid)
-            existing_keys.add(k)
-
-        # Build new population and mutate
-        new_population: list[list[bool]] = survivors + offsprings + elite
-        random.shuffle(new_population)
-        new_population = mutate_population(new_population, mutation, mutations_per_gene)
-        population = new_population
-        population_fitness = evaluate_population(population, pack_benefits, pack_dep)
+        population, population_fitness, population_hashes = next_generation(population, population_fitness, sol, pack_benefits, dep_sizes, pack_dep, capacity, neighborhood_names,
+                                                                            genes_per_generation, parents_per_generation, parent_selection_id, parents_survive, elite_number,
+                                                                            two_offsprings, crossover_points, mutation, mutations_per_gene, budget, population_hashes, repair_offsprings, crossover_type)
+        if population_fitness: budget.report(max(population_fitness)) # stagnation counts generations without a new best
 
     # return best individual found (consistent return shape even on failure)
     parent_selection_name = list(parents_selection_dict.keys())[parent_selection_id]
@@ -119,12 +75,141 @@ def genetic_algorithm (sol:list[bool], pack_benefits: list[int], dep_sizes:list[
             parents_per_generation, parents_survive, parent_selection_name, two_offsprings, crossover_points,
             mutation, mutations_per_gene, time_limit)
 
+# One generation: elite, selected parents (and survivors), unique offsprings that fit, mutation -> (population, fitness, hashes)
+# sol seeds the fallback sampler when crossover can't produce enough unique offsprings
+# Individuals are told apart by their zobrist hash (zobrist.py), carried from one generation to the next in population_hashes
+# (computed here if None): survivors and elites keep theirs, offsprings get theirs from the parents' in O(crossover segments)
+# and mutation updates them per flipped bit, so no n-element tuple is built or hashed per individual
+def next_generation(population:list[list[bool]], population_fitness:list[int], sol:list[bool], pack_benefits:list[int], dep_sizes:list[int], pack_dep:list[tuple[int, int]], capacity:int, neighborhood_names:list[str] = [], genes_per_generation:int = GENES_PER_GENERATION_DEFAULT, parents_per_generation:int = PARENTS_DEFAULT, parent_selection_id:int = 2, parents_survive:bool = True, elite_number:int = ELITISM_DEFAULT, two_offsprings:bool = True, crossover_points:list[int] = [], mutation:float = MUTATION_DEFAULT, mutations_per_gene:int = MUTATIONS_PER_GENE_DEFAULT, budget:Budget | None = None, population_hashes:list[int] | None = None, repair_offsprings:bool = REPAIR_OFFSPRINGS_DEFAULT, crossover_type:str = CROSSOVER_TYPE_DEFAULT) -> tuple[list[list[bool]], list[int], list[int]]:
+    if crossover_type not in CROSSOVER_TYPES: raise ValueError(f"Unknown crossover type: {crossover_type}")
+    uniform:bool = crossover_type == "uniform"
+    budget = get_budget(budget, float("inf")) # no budget -> the generation always completes
+    if population_hashes is None: population_hashes = [zobrist_hash(individual) for individual in population]
+    # offsprings over the capacity are repaired (if repair_offsprings) -> (offspring, hash), None -> dropped
+    def fix(kid:list[bool], kid_hash:int) -> tuple[list[bool], int] | None:
+        return repair_offspring(kid, kid_hash, pack_benefits, dep_sizes, pack_dep, capacity) if repair_offsprings else None
+    # selection hands out the population's own lists, so each parent's hash is found by identity
+    position:dict[int, int] = {id(individual): i for i, individual in enumerate(population)}
+    def get_hash(individual:list[bool]) -> int:
+        i:int | None = position.get(id(individual))
+        return population_hashes[i] if i is not None else zobrist_hash(individual)
+
+    # Compute elite and selected parents up front
+    elite:list[list[bool]] = elitism(population, population_fitness, elite_number)
+    elite_hashes:list[int] = [population_hashes[i] for i in get_elite_indices(population_fitness, elite_number)]
+    elite_set:set[int] = set(elite_hashes)
+    selected_parents = select_parents(population, population_fitness, parents_per_generation, list(parents_selection_dict.keys())[parent_selection_id])
+    parent_hashes:list[int] = [get_hash(parent) for parent in selected_parents]
+
+    # Keep surviving parents if requested; avoid duplicating elites (fast membership)
+    survivors: list[list[bool]] = []
+    survivor_hashes: list[int] = []
+    if parents_survive:
+        for parent, parent_hash in zip(selected_parents, parent_hashes):
+            if parent_hash not in elite_set:
+                survivors.append(parent[:])
+                survivor_hashes.append(parent_hash)
+
+    # Build a set of existing individuals (elites + survivors) so we can reject duplicates O(1)
+    existing_keys:set[int] = elite_set | set(survivor_hashes)
+
+    # Determine how many offsprings we still need to fill the generation
+    needed_offsprings = genes_per_generation - (len(survivors) + len(elite))
+    if needed_offsprings < 0:
+        needed_offsprings = 0
+
+    # Breed offspring while ensuring uniqueness by checking existing_keys (no nested loops)
+    # With numpy every round of pairs is bred, checked and hashed as one matrix (batch_breeding.py)
+    offsprings: list[list[bool]] = []
+    offspring_hashes: list[int] = []
+    attempts = 0
+    max_attempts = max(1000, needed_offsprings * 10 + 100)
+    batch_points = get_batch_crossover_points(len(selected_parents[0]), crossover_points) if batch_breeding is not None and selected_parents else None
+    if batch_points is not None:
+        repair_instance:Instance | None = compile_instance(pack_benefits, dep_sizes, pack_dep, capacity) if repair_offsprings else None
+        offsprings, offspring_hashes = batch_breeding.breed_offsprings(selected_parents, parent_hashes, needed_offsprings, *batch_points, two_offsprings, dep_sizes, capacity, existing_keys, max_attempts, budget, repair_instance, uniform)
+        attempts = max_attempts # every pair was already tried
+    while len(offsprings) < needed_offsprings and attempts < max_attempts:
+        if budget.expired(): print("Expired time - breeding"); break
+        attempts += 1
+
+        index1:int = random.randrange(len(selected_parents))
+        index2:int = random.randrange(len(selected_parents))
+        if parent_hashes[index1] == parent_hashes[index2]: continue # avoid crossover with itself
+
+        parent1:list[bool] = selected_parents[index1]
+        parent2:list[bool] = selected_parents[index2]
+        if len(parent1) != len(parent2): continue # crossover failed
+        kids:list[list[bool]]
+        kid_hashes:list[int]
+        if uniform:
+            kids, kid_hashes = uniform_crossover(parent1, parent_hashes[index1], parent2, parent_hashes[index2], two_offsprings)
+        else:
+            points:list[int] = get_crossover_points(len(parent1), crossover_points)
+            if not points: continue # crossover failed
+            kids = crossover_at(parent1, parent2, points, two_offsprings)
+            kid_hashes = list(crossover_hashes(parent1, parent_hashes[index1], parent2, parent_hashes[index2], points))
+        fitting:list[tuple[list[bool], int] | None] = [(kid, kid_hash) if get_remaining_capacity(dep_sizes, kid, capacity) >= 0 else fix(kid, kid_hash) for kid, kid_hash in zip(kids, kid_hashes)]
+        new_offsprings:list[tuple[list[bool], int]] = [offspring for offspring in fitting if offspring is not None]
+        if len(new_offsprings) == 0: continue # crossover failed
+
+        for kid, k in new_offsprings:
+            if budget.expired(): print("Expired time - breeding"); break
+            if k in existing_keys:
+                continue
+            offsprings.append(kid)
+            offspring_hashes.append(k)
+            existing_keys.add(k)
+            if len(offsprings) >= needed_offsprings:
+                break
+
+    # If for some reason we couldn't generate enough unique offsprings, we will fill the rest
+    # with generated valid random moves (keeping uniqueness) as a minimal, deterministic fallback.
+    # The sampler only proposes moves that fit the capacity, so no full capacity scan per kid
+    fill_attempts = 0
+    sampler: FeasibleMoveSampler | None = None
+    while len(offsprings) < needed_offsprings and fill_attempts < 1000:
+        if budget.expired(): print("Expired time - breeding"); break
+        fill_attempts += 1
+        if sampler is None: sampler = get_feasible_sampler(sol, pack_benefits, dep_sizes, pack_dep, capacity)
+        new_move = sampler.random_move(neighborhood_names)
+        if new_move[1] == "error":
+            continue
+        kid = new_move[0][:]
+        k = zobrist_hash(kid)
+        if k in existing_keys:
+            continue
+        offsprings.append(kid)
+        offspring_hashes.append(k)
+        existing_keys.add(k)
+
+    # Build new population and mutate (hashes shuffled along with their individuals)
+    new_population: list[list[bool]] = survivors + offsprings + elite
+    new_hashes: list[int] = survivor_hashes + offspring_hashes + elite_hashes
+    order: list[int] = list(range(len(new_population)))
+    random.shuffle(order)
+    new_population = [new_population[i] for i in order]
+    new_hashes = [new_hashes[i] for i in order]
+    unmutated_hashes: list[int] = new_hashes[:]
+    new_population = mutate_population(new_population, mutation, mutations_per_gene, new_hashes)
+    if repair_offsprings: # mutation can overfill too
+        for i in range(len(new_population)):
+            if new_hashes[i] != unmutated_hashes[i] and get_remaining_capacity(dep_sizes, new_population[i], capacity) < 0:
+                new_population[i], new_hashes[i] = repair_offspring(new_population[i], new_hashes[i], pack_benefits, dep_sizes, pack_dep, capacity)
+    return new_population, evaluate_population(new_population, pack_benefits, pack_dep, new_hashes), new_hashes
+
+# Offspring over the capacity made feasible by repair.repair (drop the worst deps, refill completing ones) -> (offspring, hash)
+def repair_offspring(kid:list[bool], kid_hash:int, pack_benefits:list[int], dep_sizes:list[int], pack_dep:list[tuple[int, int]], capacity:int) -> tuple[list[bool], int]:
+    evaluator:IncrementalEvaluator = IncrementalEvaluator(pack_benefits, dep_sizes, pack_dep, capacity, kid)
+    return evaluator.sol, flip_hash(kid_hash, repair(evaluator))
+
 # Returns a list of valid solutions
-def generate_first_generation(sol:list[bool] = [], neighborhood_names:list[str] = [], genes_per_generation:int = GENES_PER_GENERATION_DEFAULT) -> list[list[bool]]:
+# hashes (if given) gets the zobrist hash of each individual appended
+def generate_first_generation(sol:list[bool] = [], neighborhood_names:list[str] = [], genes_per_generation:int = GENES_PER_GENERATION_DEFAULT, hashes:list[int] | None = None) -> list[list[bool]]:
     population: list[list[bool]] = []
     num_genes:int = 0
     expected_len: int | None = len(sol) if sol else None
-    existing_keys:set[tuple] = set()
+    existing_keys:set[int] = set()
     attempts = 0
     max_attempts = genes_per_generation * 50 + 100
     while num_genes < genes_per_generation and attempts < max_attempts:
@@ -139,17 +224,32 @@ def generate_first_generation(sol:list[bool] = [], neighborhood_names:list[str]
         if len(new_move[0]) != expected_len:
             # skip inconsistent individuals
             continue
-        k = tuple(new_move[0])
+        k = zobrist_hash(new_move[0])
         if k in existing_keys:
             continue
         population.append(new_move[0][:])
         existing_keys.add(k)
+        if hashes is not None: hashes.append(k)
         num_genes += 1
 
     return population
 
 # Sorted list of population's evaluations
-def evaluate_population(population:list[list[bool]], pack_benefits:list[int], pack_dep:list[tuple[int, int]]) -> list[int]:
+# With numpy the whole population is evaluated in a few matrix operations (batch_evaluation.py)
+# Survivors, elites and repeated offspring come from the fitness cache, only the rest go to the batch
+# hashes: zobrist hashes of the individuals when the caller already has them
+def evaluate_population(population:list[list[bool]], pack_benefits:list[int], pack_dep:list[tuple[int, int]], hashes:list[int] | None = None) -> list[int]:
+    if batch_evaluation is not None and population:
+        instance:Instance = get_pack_instance(pack_benefits, pack_dep, len(population[0]))
+        keys:list[int] = hashes if hashes is not None else [zobrist_hash(individual) for individual in population]
+        cached:list[int | None] = [lookup_fitness(instance, key) for key in keys]
+        missing:list[int] = [i for i, benefit in enumerate(cached) if benefit is None]
+        add_evaluation_count(len(keys) - len(missing)) # cache hits are evaluations too, the batch counts the rest
+        batch:list[int] = batch_evaluation.evaluate_population([population[i] for i in missing], pack_benefits, pack_dep) if missing else []
+        for i, benefit in zip(missing, batch):
+            store_fitness(instance, keys[i], benefit)
+        computed:Iterator[int] = iter(batch) # in the order of missing
+        return [benefit if benefit is not None else next(computed) for benefit in cached]
     genes_per_population:int = len(population)
     # evaluate each individual and return a list of evaluations
     evaluations: list[int] = []
@@ -157,7 +257,7 @@ def evaluate_population(population:list[list[bool]], pack_benefits:list[int], pa
         evaluations.append(evaluate_packs(pack_benefits, pack_dep, population[i][:]))
     return evaluations
 
-#
+# The selected parents are population's own lists, not copies (copy before changing them)
 def select_parents(population:list[list[bool]], population_fitness:list, num_parents:int, selection_method:str, linear_rank:bool = False, selection_pressure:float = LINEAR_RANK_SELECTION_PRESSURE, linear_rank2:bool = False, tournament_size:int = TOURNAMENT_SIZE_DEFAULT) -> list[list[bool]]:
     if linear_rank:
         population_fitness = linear_rank_selection(population, population_fitness, selection_pressure, linear_rank2)
@@ -184,7 +284,7 @@ def roulette_wheel_selection(population:list[list[bool]], population_fitness:lis
     total_fitness:float = sum(population_fitness)
     if total_fitness == 0:
         # fallback: choose uniformly at random with replacement
-        return [random.choice(population)[:] for _ in range(number_parents)]
+        return [random.choice(population) for _ in range(number_parents)]
 
     selected:list[list[bool]] = []
     rand:list[float] = [random.uniform(0, total_fitness) for _ in range(number_parents)]
@@ -193,7 +293,7 @@ def roulette_wheel_selection(population:list[list[bool]], population_fitness:lis
         cumulative_sum += population_fitness[i]
         for j in range(number_parents):
             if cumulative_sum >= rand[j]:
-                selected.append(population[i][:])
+                selected.append(population[i])
                 break
     
     return selected
@@ -207,7 +307,7 @@ def stochastic_universal_sampling(population:list[list[bool]], population_fitnes
     total_fitness:int = sum(population_fitness)
     if total_fitness == 0:
         # fallback: choose uniformly at random with replacement
-        return [random.choice(population)[:] for _ in range(number_parents)]
+        return [random.choice(population) for _ in range(number_parents)]
     
     # Use float step and uniform start like standard SUS
     point_distance:float = total_fitness/number_parents
@@ -221,7 +321,7 @@ def stochastic_universal_sampling(population:list[list[bool]], population_fitnes
         while fitness_sum < point:
             i += 1
             fitness_sum += population_fitness[i]
-        selected.append(population[i][:])
+        selected.append(population[i])
     return selected
 
 # Returns 1 list[float] of probabilities of each individual being selected -> be used on other selection functions
@@ -252,13 +352,12 @@ def linear_rank_selection(population:list[list[bool]], population_fitness:list[i
 # To be used as a part of the new generation
 def elitism(population:list[list[bool]], population_fitness:list[int], number_to_keep:int) -> list[list[bool]]:
     # Keep the top 'number_to_keep' individuals (highest fitness)
-    paired = sorted(zip(population_fitness, population), key=lambda x: x[0], reverse=True)
-    genes_per_population:int = len(paired)
-    if genes_per_population == 0 or number_to_keep <= 0: return []
-    if number_to_keep > genes_per_population: number_to_keep = genes_per_population
+    return [population[i][:] for i in get_elite_indices(population_fitness[:len(population)], number_to_keep)]
 
-    kept = [p for _, p in paired[:number_to_keep]]
-    return [k[:] for k in kept]
+# Indices of the individuals elitism keeps, same order (stable: equal fitness keeps the population order)
+def get_elite_indices(population_fitness:list[int], number_to_keep:int) -> list[int]:
+    if number_to_keep <= 0: return []
+    return sorted(range(len(population_fitness)), key=lambda i: population_fitness[i], reverse=True)[:number_to_keep]
 
 # Returns 1 list[bool] of the best found
 # Doesn't sort the fitness list
@@ -275,13 +374,20 @@ def tournament_selection(population:list[list[bool]], population_fitness:list[in
     for i in selected_indices[1:]:
         if population_fitness[i] > population_fitness[best_index]:
             best_index = i
-    return population[best_index][:]
+    return population[best_index]
 
 # Crosses and switches reference parent at every break point
 # No break points -> random break point
 def crossover(parent1:list[bool], parent2:list[bool], break_points:list[int], two_offsprings:bool) -> list[list[bool]]:
     len_sol:int = len(parent1)
     if len_sol != len(parent2) or len_sol < 2: return []
+    points:list[int] = get_crossover_points(len_sol, break_points)
+    if not points: return []
+    return crossover_at(parent1, parent2, points, two_offsprings)
+
+# Valid, sorted break points ending with len_sol ([] if there's none) - a random one if break_points is empty
+def get_crossover_points(len_sol:int, break_points:list[int]) -> list[int]:
+    if len_sol < 2: return []
     # avoid mutating caller list
     points = sorted(set(break_points)) if break_points else []
     # if no explicit break points provided, choose one respecting a min gap from ends
@@ -303,7 +409,19 @@ def crossover(parent1:list[bool], parent2:list[bool], break_points:list[int], tw
     # ensure the final point covers to the end (use len_sol as exclusive end)
     if len_sol not in points:
         points.append(len_sol)
-
+    return points
+
+# get_crossover_points for a batch of pairs -> (points, low, high): the same points for every pair,
+# or [] when each pair draws its one point in [low, high]; None if there's no valid point
+def get_batch_crossover_points(len_sol:int, break_points:list[int]) -> tuple[list[int], int, int] | None:
+    if not break_points and len_sol > 2 * CROSSOVER_MIN_GAP:
+        return [], CROSSOVER_MIN_GAP, len_sol - CROSSOVER_MIN_GAP
+    points:list[int] = get_crossover_points(len_sol, break_points or [len_sol // 2]) # a random point too close to the edges ends up in the middle
+    return (points, 0, 0) if points else None
+
+# Offsprings of crossing the parents at points (from get_crossover_points)
+def crossover_at(parent1:list[bool], parent2:list[bool], points:list[int], two_offsprings:bool) -> list[list[bool]]:
+    len_sol:int = len(parent1)
     offsprings:list[list[bool]] = []
     offspring1 = [False]*len_sol
     offspring2 = [False]*len_sol
@@ -325,9 +443,28 @@ def crossover(parent1:list[bool], parent2:list[bool], break_points:list[int], tw
     if two_offsprings: offsprings.append(offspring2)
     return offsprings
 
+# Offsprings taking each gene from either parent with probability 1/2 -> (offsprings, their zobrist hashes)
+# Offspring 1 takes parent2's gene where the draw says so, offspring 2 parent1's; only genes the parents disagree on are drawn
+def uniform_crossover(parent1:list[bool], hash1:int, parent2:list[bool], hash2:int, two_offsprings:bool) -> tuple[list[list[bool]], list[int]]:
+    keys:list[int] = get_zobrist_keys(len(parent1))
+    offspring1:list[bool] = parent1[:]
+    offspring2:list[bool] = parent2[:]
+    for dep, (gene1, gene2) in enumerate(zip(parent1, parent2)):
+        if gene1 != gene2 and random.random() < 0.5:
+            offspring1[dep] = gene2
+            offspring2[dep] = gene1
+            hash1 ^= keys[dep]
+            hash2 ^= keys[dep]
+    if two_offsprings:
+        return [offspring1, offspring2], [hash1, hash2]
+    return [offspring1], [hash1]
+
 # Chooses randomly mutation*len(population) elements and changes mutation_per_gene points in each chosen element
 # Mutations can be undone if the same bit of the same element is changed an even number of times
-def mutate_population(population:list[list[bool]], mutation:float, mutation_per_gene:int) -> list[list[bool]]:
+# A chosen element is copied before its first flip: selection hands out the population's own lists, so an element
+# may be shared with the previous generation (next_generation only passes fresh lists, the copy keeps it that way)
+# hashes (zobrist hashes of the population, if given) are updated with every flipped bit
+def mutate_population(population:list[list[bool]], mutation:float, mutation_per_gene:int, hashes:list[int] | None = None) -> list[list[bool]]:
     genes_per_population:int = len(population)
     if genes_per_population == 0: return population
     # handle variable-length individuals safely: select indices per-individual
@@ -336,15 +473,18 @@ def mutate_population(population:list[list[bool]], mutation:float, mutation_per_
     if num_to_mutate <= 0: return population
 
     mutated_indices:list[int] = random.sample(range(0, genes_per_population), num_to_mutate)
+    keys:list[int] = get_zobrist_keys(max(map(len, population)))
     for i in mutated_indices:
         gene_size = len(population[i])
         if gene_size == 0:
             continue
+        population[i] = population[i][:]
         for _ in range(mutation_per_gene):
             idx = random.randint(0, gene_size - 1)
             # guard against any accidental index errors
             if 0 <= idx < len(population[i]):
                 population[i][idx] = not population[i][idx]
+                if hashes is not None: hashes[i] ^= keys[idx]
     return population
 
 ''' Dictionaries '''
@@ -0,0 +1,65 @@
+# Python 3.13.4
+
+from typing import Any, Callable, Hashable
+
+MEMO_SIZE_DEFAULT:int = 16 # owners remembered per memo
+
+''' Identity memo '''
+# State derived from an object and kept between calls (compiled instances, batch arrays, samplers, trackers, fitness
+# caches, worker pools...), keyed by the identity of that object, id(owner), plus optional extra key parts
+# An entry keeps a reference to its owner, so the id can't be reused by another object while the entry exists; a lookup
+# also checks `is`, so a stale entry is never returned
+# Bounded: past max_size entries the oldest one is dropped, on_evict gets the dropped value (e.g. to stop processes)
+
+class IdentityMemo:
+    def __init__(self, max_size:int = MEMO_SIZE_DEFAULT, on_evict:Callable[[Any], None] | None = None) -> None:
+        self.max_size:int = max_size
+        self.on_evict:Callable[[Any], None] | None = on_evict
+        self.entries:dict[tuple[Hashable, ...], tuple[Any, Any]] = {} # (id(owner), *extra) -> (owner, value), oldest first
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    # Value stored for owner (and extra), None if there is none
+    def get(self, owner:Any, *extra:Hashable) -> Any | None:
+        entry:tuple[Any, Any] | None = self.entries.get((id(owner), *extra))
+        if entry is not None and entry[0] is owner:
+            return entry[1]
+        return None
+
+    # Stores value for owner (and extra) as the newest entry, dropping the oldest ones past max_size
+    def put(self, owner:Any, value:Any, *extra:Hashable) -> None:
+        key:tuple[Hashable, ...] = (id(owner), *extra)
+        replaced:tuple[Any, Any] | None = self.entries.pop(key, None)
+        if replaced is not None and replaced[1] is not value:
+            self._evict(replaced[1])
+        while self.entries and len(self.entries) >= self.max_size:
+            self._evict(self.entries.pop(next(iter(self.entries)))[1]) # oldest entry
+        self.entries[key] = (owner, value)
+
+    # Stored value, or factory() stored the first time
+    def get_or_create(self, owner:Any, factory:Callable[[], Any], *extra:Hashable) -> Any:
+        value:Any | None = self.get(owner, *extra)
+        if value is None:
+            value = factory()
+            self.put(owner, value, *extra)
+        return value
+
+    # Removes the entry of owner (and extra) without calling on_evict -> its value or None
+    def pop(self, owner:Any, *extra:Hashable) -> Any | None:
+        value:Any | None = self.get(owner, *extra)
+        if value is not None:
+            del self.entries[(id(owner), *extra)]
+        return value
+
+    def values(self) -> list[Any]:
+        return [value for _, value in self.entries.values()]
+
+    # Drops every entry (on_evict is called for each)
+    def clear(self) -> None:
+        while self.entries:
+            self._evict(self.entries.pop(next(iter(self.entries)))[1])
+
+    def _evict(self, value:Any) -> None:
+        if self.on_evict is not None:
+            self.on_evict(value)
@@ -0,0 +1,138 @@
+# Python 3.13.4
+
+from auxiliary_functions import compile_instance, add_evaluation_count
+from instance import Instance
+
+''' Incremental evaluator '''
+
+# Keeps, for every pack, how many of its dependencies are still missing from the solution
+# Flipping dep only touches the packs that depend on it -> O(deg(dep)) instead of O(instance) per neighbor
+# Packs without any dependency are ignored, same as evaluate_packs
+class IncrementalEvaluator:
+    def __init__(self, pack_benefits:list[int], dep_sizes:list[int], pack_dep:list[tuple[int, int]], capacity:int, sol:list[bool] | None = None) -> None:
+        self._load(compile_instance(pack_benefits, dep_sizes, pack_dep, capacity), sol)
+
+    # Same as the constructor, for callers that already hold the compiled Instance
+    @classmethod
+    def from_instance(cls, instance:Instance, sol:list[bool] | None = None) -> "IncrementalEvaluator":
+        evaluator:IncrementalEvaluator = cls.__new__(cls)
+        evaluator._load(instance, sol)
+        return evaluator
+
+    # Same, for callers that already counted the missing dependencies of every pack (batch_breeding, one matrix product
+    # for many solutions): skips the O(|pack_dep|) pass of reset, only O(packs + deps) is left
+    @classmethod
+    def from_counts(cls, instance:Instance, sol:list[bool], missing:list[int]) -> "IncrementalEvaluator":
+        evaluator:IncrementalEvaluator = cls.__new__(cls)
+        evaluator._load(instance, [])
+        evaluator.sol = list(sol)
+        evaluator.missing = list(missing)
+        evaluator.used_capacity = sum(size for size, selected in zip(evaluator.dep_sizes, evaluator.sol) if selected)
+        evaluator.benefit = sum(evaluator.pack_benefits[pack] for pack, num_deps in enumerate(evaluator.pack_num_deps) if num_deps > 0 and evaluator.missing[pack] == 0)
+        return evaluator
+
+    def _load(self, instance:Instance, sol:list[bool] | None) -> None:
+        self.instance:Instance = instance
+        self.pack_benefits:tuple[int, ...] = instance.pack_benefits
+        self.dep_sizes:tuple[int, ...] = instance.dep_sizes
+        self.capacity:int = instance.capacity
+        self.dep_packs:tuple[tuple[int, ...], ...] = instance.dep_packs
+        self.pack_num_deps:list[int] = [len(deps) for deps in instance.pack_deps]
+
+        self.sol:list[bool] = []
+        self.missing:list[int] = [] # missing[pack] = dependencies of pack not selected in sol
+        self.benefit:int = 0
+        self.used_capacity:int = 0
+        self._undo_stack:list[int] = [] # flipped deps, most recent last
+
+        self.reset(sol if sol is not None else [False]*instance.num_deps)
+
+    # Loads a new solution and rebuilds the counters from scratch - O(|pack_dep|)
+    def reset(self, sol:list[bool]) -> None:
+        self.sol = list(sol)
+        self.missing = self.pack_num_deps[:]
+        self.used_capacity = 0
+        self._undo_stack.clear()
+
+        for dep, selected in enumerate(self.sol):
+            if selected:
+                self.used_capacity += self.dep_sizes[dep]
+                for pack in self.dep_packs[dep]:
+                    self.missing[pack] -= 1
+
+        self.benefit = sum(self.pack_benefits[pack] for pack, num_deps in enumerate(self.pack_num_deps) if num_deps > 0 and self.missing[pack] == 0)
+
+    # Same value evaluate_packs would give for the current solution
+    def get_benefit(self) -> int:
+        return self.benefit
+
+    def get_remaining_capacity(self) -> int:
+        return self.capacity - self.used_capacity
+
+    # Benefit change of flipping dep, without changing the state
+    def delta_if_flip(self, dep:int) -> int:
+        add_evaluation_count()
+        missing:list[int] = self.missing
+        if self.sol[dep]: # removing dep breaks every currently satisfied pack that needs it
+            return -sum(self.pack_benefits[pack] for pack in self.dep_packs[dep] if missing[pack] == 0)
+        # adding dep completes every pack where it was the only missing dependency
+        return sum(self.pack_benefits[pack] for pack in self.dep_packs[dep] if missing[pack] == 1)
+
+    # Capacity change of flipping dep
+    def size_delta_if_flip(self, dep:int) -> int:
+        return -self.dep_sizes[dep] if self.sol[dep] else self.dep_sizes[dep]
+
+    # True if flipping all deps keeps the solution inside the capacity
+    def fits_if_flip(self, deps:list[int]) -> bool:
+        return self.used_capacity + sum(self.size_delta_if_flip(dep) for dep in deps) <= self.capacity
+
+    # Benefit change of flipping several deps at once (handles deps sharing packs)
+    def delta_if_flips(self, deps:list[int]) -> int:
+        if len(deps) == 1:
+            return self.delta_if_flip(deps[0])
+        add_evaluation_count()
+        start_benefit:int = self.benefit
+        for dep in deps:
+            self.flip(dep)
+        delta:int = self.benefit - start_benefit
+        for _ in deps:
+            self.undo()
+        return delta
+
+    # Flips dep and returns the benefit change, the flip can be undone with undo()
+    def flip(self, dep:int) -> int:
+        self._undo_stack.append(dep)
+        return self._flip(dep)
+
+    # Reverts the most recent flip not yet undone, returns the dep or -1 if there's nothing to undo
+    def undo(self) -> int:
+        if not self._undo_stack:
+            return -1
+        dep:int = self._undo_stack.pop()
+        self._flip(dep)
+        return dep
+
+    # Forgets the undo history, current state becomes the new base
+    def commit(self) -> None:
+        self._undo_stack.clear()
+
+    def _flip(self, dep:int) -> int:
+        missing:list[int] = self.missing
+        pack_benefits:tuple[int, ...] = self.pack_benefits
+        delta:int = 0
+        if self.sol[dep]:
+            self.sol[dep] = False
+            self.used_capacity -= self.dep_sizes[dep]
+            for pack in self.dep_packs[dep]:
+                if missing[pack] == 0:
+                    delta -= pack_benefits[pack]
+                missing[pack] += 1
+        else:
+            self.sol[dep] = True
+            self.used_capacity += self.dep_sizes[dep]
+            for pack in self.dep_packs[dep]:
+                missing[pack] -= 1
+                if missing[pack] == 0:
+                    delta += pack_benefits[pack]
+        self.benefit += delta
+        return delta
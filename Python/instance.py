@@ -0,0 +1,101 @@
+# Python 3.13.4
+
+from dataclasses import dataclass
+
+''' Compiled instance '''
+
+# Immutable, pre-indexed version of (pack_benefits, dep_sizes, pack_dep, capacity)
+# Built once per instance and shared by every algorithm instead of rebuilding get_pack_dict/get_dep_dict on every call
+# CSR layout: the deps of pack p are pack_dep_indices[pack_dep_offsets[p]:pack_dep_offsets[p+1]] (dep -> packs likewise)
+# pack_deps/dep_packs are the same rows already sliced, which is what the pure Python loops iterate over
+@dataclass(frozen=True, slots=True)
+class Instance:
+    pack_benefits: tuple[int, ...]
+    dep_sizes: tuple[int, ...]
+    pack_dep: tuple[tuple[int, int], ...]
+    capacity: int
+    pack_dep_offsets: tuple[int, ...]       # length num_packs + 1
+    pack_dep_indices: tuple[int, ...]       # dep ids, sorted inside each pack, no duplicates
+    dep_pack_offsets: tuple[int, ...]       # length num_deps + 1
+    dep_pack_indices: tuple[int, ...]       # pack ids, sorted inside each dep, no duplicates
+    dep_total_benefit: tuple[int, ...]      # sum of the benefits of the packs that depend on dep
+    dep_degree: tuple[int, ...]             # number of packs that depend on dep
+    pack_deps: tuple[tuple[int, ...], ...]  # pack_id -> deps it needs
+    dep_packs: tuple[tuple[int, ...], ...]  # dep_id -> packs that need it
+
+    @property
+    def num_packs(self) -> int:
+        return len(self.pack_benefits)
+
+    @property
+    def num_deps(self) -> int:
+        return len(self.dep_sizes)
+
+    # Same shape load_instance always returned, to call functions with the old signatures
+    def as_tuple(self) -> tuple[tuple[int, ...], tuple[int, ...], tuple[tuple[int, int], ...], int]:
+        return self.pack_benefits, self.dep_sizes, self.pack_dep, self.capacity
+
+    # Total benefit of the packs whose dependencies are all selected (packs without dependencies don't count)
+    def evaluate(self, select_dep:list[bool]) -> int:
+        select_dep = self._pad(select_dep)
+        total_benefits:int = 0
+        pack_benefits:tuple[int, ...] = self.pack_benefits
+        for pack, deps in enumerate(self.pack_deps):
+            if deps and all(select_dep[dep] for dep in deps):
+                total_benefits += pack_benefits[pack]
+        return total_benefits
+
+    # Which packs are satisfied by the selected dependencies
+    def satisfied_packs(self, select_dep:list[bool]) -> list[bool]:
+        select_dep = self._pad(select_dep)
+        return [all(select_dep[dep] for dep in deps) for deps in self.pack_deps]
+
+    def used_capacity(self, select_dep:list[bool]) -> int:
+        dep_sizes:tuple[int, ...] = self.dep_sizes
+        return sum(dep_sizes[dep] for dep, selected in enumerate(select_dep) if selected)
+
+    # Deps past the end of a short solution count as not selected (as the old set-based evaluate_packs did)
+    def _pad(self, select_dep:list[bool]) -> list[bool]:
+        if len(select_dep) >= self.num_deps:
+            return select_dep
+        return list(select_dep) + [False]*(self.num_deps - len(select_dep))
+
+''' Functions '''
+
+# Builds the Instance - O(|pack_dep| log |pack_dep|), done once per instance
+# dep_sizes may be None when only the pack side is needed (sizes become 0)
+def build_instance(pack_benefits:list[int], dep_sizes:list[int] | None, pack_dep:list[tuple[int, int]], capacity:int) -> Instance:
+    num_packs:int = len(pack_benefits)
+    num_deps:int = max([len(dep_sizes) if dep_sizes is not None else 0] + [dep + 1 for _, dep in pack_dep])
+    sizes:tuple[int, ...] = tuple(dep_sizes) + (0,) * (num_deps - len(dep_sizes)) if dep_sizes is not None else (0,) * num_deps
+
+    pack_rows:list[set[int]] = [set() for _ in range(num_packs)]
+    dep_rows:list[set[int]] = [set() for _ in range(num_deps)]
+    for (pack, dep) in pack_dep:
+        pack_rows[pack].add(dep)
+        dep_rows[dep].add(pack)
+
+    pack_deps:tuple[tuple[int, ...], ...] = tuple(tuple(sorted(row)) for row in pack_rows)
+    dep_packs:tuple[tuple[int, ...], ...] = tuple(tuple(sorted(row)) for row in dep_rows)
+
+    return Instance(
+        pack_benefits = tuple(pack_benefits),
+        dep_sizes = sizes,
+        pack_dep = tuple((pack, dep) for (pack, dep) in pack_dep),
+        capacity = capacity,
+        pack_dep_offsets = _get_offsets(pack_deps),
+        pack_dep_indices = tuple(dep for row in pack_deps for dep in row),
+        dep_pack_offsets = _get_offsets(dep_packs),
+        dep_pack_indices = tuple(pack for row in dep_packs for pack in row),
+        dep_total_benefit = tuple(sum(pack_benefits[pack] for pack in row) for row in dep_packs),
+        dep_degree = tuple(len(row) for row in dep_packs),
+        pack_deps = pack_deps,
+        dep_packs = dep_packs
+    )
+
+# Row start positions of a CSR array, plus the final end position
+def _get_offsets(rows:tuple[tuple[int, ...], ...]) -> tuple[int, ...]:
+    offsets:list[int] = [0]
+    for row in rows:
+        offsets.append(offsets[-1] + len(row))
+    return tuple(offsets)
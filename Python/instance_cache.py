@@ -0,0 +1,120 @@
+# Python 3.13.4
+
+import hashlib
+import mmap
+import os
+import struct
+from array import array
+from pathlib import Path
+from typing import Literal, Sequence
+
+CACHE_DIR_NAME: str = ".instance_cache" # created next to the instance files
+MAGIC: bytes = b"SUKPBIN1"
+HEADER: struct.Struct = struct.Struct("<8s4q") # magic, num_pack, num_dep, num_pack_dep, capacity
+ITEM_TYPE: Literal["q"] = "q" # int64, native byte order (the cache is local to the machine that wrote it)
+
+''' Binary instance cache '''
+# Parsing an instance .txt with map(int, ...) happens again on every load (every experiment, every file, every pool worker)
+# The first load writes a binary sidecar: a header plus pack_benefits, dep_sizes and the flat (pack, dep) pairs as int64
+# Sidecars are named <stem>.<content hash>.bin, so an edited .txt never reads a stale sidecar
+# Later loads memory-map the sidecar (read only): processes loading the same instance share the same cached pages, but
+# what load_instance returns is still a per-process copy (to_lists) - the saving is the parse, not the memory
+# A sidecar that can't be read (corrupt or truncated, e.g. a crash on a filesystem without atomic replace) is written again
+
+# Arrays of one sidecar, views straight into the mapped file (no copy until to_lists)
+# Raises ValueError if the buffer isn't a complete sidecar
+# from_buffer reads the same layout from any bytes-like buffer (parallel_neighborhood keeps it in shared memory)
+class MappedInstance:
+    def __init__(self, sidecar:Path) -> None:
+        with open(sidecar, "rb") as f:
+            self._map:mmap.mmap | memoryview = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._read(memoryview(self._map), str(sidecar))
+
+    @classmethod
+    def from_buffer(cls, buffer:memoryview, name:str = "buffer") -> "MappedInstance":
+        mapped:MappedInstance = cls.__new__(cls)
+        mapped._map = buffer
+        mapped._read(buffer, name)
+        return mapped
+
+    def _read(self, buffer:memoryview, name:str) -> None:
+        if len(buffer) < HEADER.size or (len(buffer) - HEADER.size) % array(ITEM_TYPE).itemsize:
+            raise ValueError(f"Truncated instance sidecar: {name}")
+        magic, self.num_packs, self.num_deps, self.num_pack_dep, self.capacity = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not an instance sidecar: {name}")
+        values:memoryview = buffer[HEADER.size:].cast(ITEM_TYPE)
+        if len(values) != self.num_packs + self.num_deps + 2*self.num_pack_dep:
+            raise ValueError(f"Truncated instance sidecar: {name}")
+        self.pack_benefits:memoryview = values[:self.num_packs]
+        self.dep_sizes:memoryview = values[self.num_packs:self.num_packs + self.num_deps]
+        self.pack_dep_flat:memoryview = values[self.num_packs + self.num_deps:] # p0, d0, p1, d1, ...
+
+    # Same lists load_instance returns: copies every array into Python ints (the Instance tuples are built from them anyway)
+    def to_lists(self) -> tuple[list[int], list[int], list[tuple[int, int]], int]:
+        return self.pack_benefits.tolist(), self.dep_sizes.tolist(), list(zip(self.pack_dep_flat[0::2].tolist(), self.pack_dep_flat[1::2].tolist())), self.capacity
+
+''' Functions '''
+
+# Instance lists of filename, from its sidecar (written first if missing or stale)
+# Falls back to parsing the .txt when the sidecar can't be written (read-only input directory) or read back
+def read_instance(filename:str) -> tuple[list[int], list[int], list[tuple[int, int]], int]:
+    try:
+        return map_instance(filename).to_lists()
+    except (OSError, ValueError):
+        return parse_instance(filename)
+
+# MappedInstance of filename, converting it first if needed
+# A sidecar that doesn't read back (corrupt or truncated) is deleted and converted again from the .txt
+def map_instance(filename:str) -> MappedInstance:
+    sidecar:Path = convert_instance(filename)
+    try:
+        return MappedInstance(sidecar)
+    except ValueError:
+        sidecar.unlink(missing_ok=True)
+        return MappedInstance(convert_instance(filename))
+
+# Writes the sidecar of filename if it doesn't exist yet, returns its path
+def convert_instance(filename:str) -> Path:
+    source:Path = Path(filename)
+    data:bytes = source.read_bytes()
+    sidecar:Path = get_sidecar_path(source, hashlib.blake2b(data, digest_size=16).hexdigest())
+    if sidecar.exists():
+        return sidecar
+    pack_benefits, dep_sizes, pack_dep, capacity = _parse_lines(data.decode().splitlines())
+    sidecar.parent.mkdir(parents=True, exist_ok=True)
+    for old in sidecar.parent.glob(f"{source.stem}.*.bin"): # sidecars of older versions of the file
+        if len(old.name) == len(sidecar.name):
+            old.unlink(missing_ok=True)
+    temporary:Path = sidecar.with_name(f"{sidecar.name}.{os.getpid()}.tmp")
+    with open(temporary, "wb") as f:
+        f.write(encode_instance(pack_benefits, dep_sizes, pack_dep, capacity))
+    os.replace(temporary, sidecar) # atomic: a concurrent reader sees no sidecar or a complete one
+    return sidecar
+
+# Sidecar bytes of an instance: header + pack_benefits, dep_sizes and the flat (pack, dep) pairs as int64
+def encode_instance(pack_benefits:Sequence[int], dep_sizes:Sequence[int], pack_dep:Sequence[tuple[int, int]], capacity:int) -> bytes:
+    values:array = array(ITEM_TYPE, pack_benefits)
+    values.extend(dep_sizes)
+    values.extend(value for pair in pack_dep for value in pair)
+    return HEADER.pack(MAGIC, len(pack_benefits), len(dep_sizes), len(pack_dep), capacity) + values.tobytes()
+
+# Converts every file (before starting a process pool, so workers only map)
+def convert_instances(filenames:list[str]) -> list[Path]:
+    return [convert_instance(filename) for filename in filenames]
+
+def get_sidecar_path(source:Path, content_hash:str) -> Path:
+    return source.parent / CACHE_DIR_NAME / f"{source.stem}.{content_hash}.bin"
+
+# Text parser (the original load_instance)
+def parse_instance(filename:str) -> tuple[list[int], list[int], list[tuple[int, int]], int]:
+    with open(filename, 'r') as file:
+        return _parse_lines(file)
+
+def _parse_lines(lines) -> tuple[list[int], list[int], list[tuple[int, int]], int]:
+    lines = iter(lines)
+    num_pack, num_dep, num_pack_dep, capacity = map(int, next(lines).split())
+    pack_benefits: list[int] = list(map(int, next(lines).split()))
+    dep_sizes: list[int] = list(map(int, next(lines).split()))
+    pack_dep: list[tuple[int, int]] = [(p, d) for line in lines if len(line.split()) == 2 for p, d in [map(int, line.split())]]
+    return pack_benefits, dep_sizes, pack_dep, capacity
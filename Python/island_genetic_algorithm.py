@@ -0,0 +1,189 @@
+# Python 3.13.4
+
+import multiprocessing
+import os
+import random
+import time
+from multiprocessing.connection import Connection
+from typing import Any
+
+import genetic_algorithm as ga
+from auxiliary_functions import get_evaluation_count, get_fitness_cache_hits, get_remaining_capacity, list_bool_to_int, int_to_list_bool
+from budget import Budget
+from first_solution import create_randomic_solution
+from zobrist import zobrist_hash
+
+ISLANDS_DEFAULT:int | None = None # None -> os.cpu_count()
+MIGRATION_INTERVAL_DEFAULT:int = 5 # generations between two migrations
+MIGRANTS_DEFAULT:int = 2 # best individuals sent to each neighbour
+TOPOLOGY_DEFAULT:str = "ring"
+GENERATIONS_DEFAULT:int = 1000 # islands normally stop on time_limit
+TIME_LIMIT_DEFAULT:float = ga.TIME_LIMIT_DEFAULT
+RESULT_GRACE_TIME:float = 10.0 # seconds past the time limit to wait for the islands' results
+
+# Island i runs ISLAND_CONFIGS_DEFAULT[i % len] (genetic_algorithm keyword arguments), so neighbours search differently
+ISLAND_CONFIGS_DEFAULT:list[dict[str, Any]] = [
+    {"parent_selection_id": 2, "two_offsprings": True, "mutation": ga.MUTATION_DEFAULT},         # tournament
+    {"parent_selection_id": 1, "two_offsprings": True, "mutation": ga.MUTATION_DEFAULT},         # stochastic universal sampling
+    {"parent_selection_id": 0, "two_offsprings": False, "mutation": 0.05},                       # roulette, more mutation
+    {"parent_selection_id": 2, "two_offsprings": False, "mutation": 0.1, "mutations_per_gene": 5} # tournament, strong mutation
+]
+
+''' Island model '''
+# K populations evolve in K processes, each with its own selection / crossover / mutation settings
+# Every migration_interval generations an island sends copies of its best individuals to its neighbours and replaces
+# its worst individuals with whatever arrived (non-blocking: a slow neighbour never stalls the others)
+# Migrants travel as ints (aux.list_bool_to_int) through one-way pipes, one pipe per edge of the topology
+# All islands stop at the same deadline, time_limit after the call started, same as genetic_algorithm
+
+# Best individual over all islands -> (solution, benefit, per-island statistics)
+def island_genetic_algorithm(sol:list[bool], pack_benefits:list[int], dep_sizes:list[int], pack_dep:list[tuple[int, int]], capacity:int, islands:int | None = ISLANDS_DEFAULT, island_configs:list[dict[str, Any]] = ISLAND_CONFIGS_DEFAULT, topology:str = TOPOLOGY_DEFAULT, migration_interval:int = MIGRATION_INTERVAL_DEFAULT, migrants:int = MIGRANTS_DEFAULT, generations:int = GENERATIONS_DEFAULT, time_limit:float = TIME_LIMIT_DEFAULT, seed:int | None = None) -> tuple[list[bool], int, list[dict[str, Any]]]:
+    deadline:float = time.time() + time_limit
+    islands = islands or os.cpu_count() or 1
+    if seed is None: seed = random.randrange(2**32)
+    if len(sol) == 0: sol = create_randomic_solution(pack_benefits, dep_sizes, pack_dep, capacity)
+
+    inbound:list[list[Connection]] = [[] for _ in range(islands)]
+    outbound:list[list[Connection]] = [[] for _ in range(islands)]
+    for island in range(islands):
+        for neighbour in get_neighbours(island, islands, topology):
+            receiver, sender = multiprocessing.Pipe(duplex=False)
+            inbound[neighbour].append(receiver)
+            outbound[island].append(sender)
+
+    processes:list[multiprocessing.Process] = []
+    results:list[Connection] = []
+    for island in range(islands):
+        receiver, sender = multiprocessing.Pipe(duplex=False)
+        config:dict[str, Any] = island_configs[island % len(island_configs)]
+        process = multiprocessing.Process(target=_run_island, args=(
+            island, config, sol, pack_benefits, dep_sizes, pack_dep, capacity, generations, migration_interval, migrants,
+            deadline, seed + island, inbound[island], outbound[island], sender))
+        process.start()
+        sender.close() # the child holds its own copy
+        processes.append(process)
+        results.append(receiver)
+
+    best_sol:list[bool] = sol[:]
+    best_benefit:int = -1
+    island_stats:list[dict[str, Any]] = []
+    for island, receiver in enumerate(results):
+        if not receiver.poll(max(0.0, deadline - time.time()) + RESULT_GRACE_TIME):
+            island_stats.append({"island": island, "error": "no result"})
+            continue
+        island_best, island_benefit, stats = receiver.recv()
+        island_stats.append(stats)
+        if island_benefit > best_benefit:
+            best_sol = int_to_list_bool(island_best, len(sol))
+            best_benefit = island_benefit
+    for process in processes:
+        process.join(RESULT_GRACE_TIME)
+        if process.is_alive(): process.terminate()
+    for connection in results + [c for cs in inbound + outbound for c in cs]:
+        connection.close()
+    return best_sol, max(best_benefit, 0), island_stats
+
+# Islands that island sends its migrants to
+def get_neighbours(island:int, islands:int, topology:str) -> list[int]:
+    match topology:
+        case "ring": # island -> island + 1
+            return [(island + 1) % islands] if islands > 1 else []
+        case "full": # island -> every other island
+            return [other for other in range(islands) if other != island]
+        case _:
+            raise ValueError(f"Unknown topology: {topology}. Available: {topologies_list}")
+
+''' Island process '''
+
+# One island: genetic_algorithm's generations with migrations in between, sends (best as int, benefit, stats) to result
+def _run_island(island:int, config:dict[str, Any], sol:list[bool], pack_benefits:list[int], dep_sizes:list[int], pack_dep:list[tuple[int, int]], capacity:int, generations:int, migration_interval:int, migrants:int, deadline:float, seed:int, inbound:list[Connection], outbound:list[Connection], result:Connection) -> None:
+    random.seed(seed)
+    start_time:float = time.time()
+    start_evaluations:int = get_evaluation_count()
+    start_hits:int = get_fitness_cache_hits()
+    budget:Budget = Budget(deadline - start_time)
+    genes_per_generation:int = config.get("genes_per_generation", ga.GENES_PER_GENERATION_DEFAULT)
+    hashes:list[int] = []
+    population:list[list[bool]] = ga.generate_first_generation(sol[:], config.get("neighborhood_names", []), genes_per_generation, hashes)
+    fitness:list[int] = ga.evaluate_population(population, pack_benefits, pack_dep, hashes)
+    best:tuple[int, list[bool]] = _get_best(population, fitness, dep_sizes, capacity, (-1, sol[:]))
+    sent:int = 0
+    received:int = 0
+    generation:int = 0
+
+    while generation < generations and not budget.expired():
+        population, fitness, hashes = ga.next_generation(population, fitness, sol, pack_benefits, dep_sizes, pack_dep, capacity, budget=budget, population_hashes=hashes, **config)
+        generation += 1
+        best = _get_best(population, fitness, dep_sizes, capacity, best)
+        if generation % migration_interval == 0:
+            sent += _send_migrants(population, fitness, migrants, outbound)
+            received += _receive_migrants(population, fitness, hashes, inbound, len(sol), pack_benefits, pack_dep)
+            best = _get_best(population, fitness, dep_sizes, capacity, best)
+
+    result.send((list_bool_to_int(best[1]), best[0], {
+        "island": island,
+        "config": config,
+        "seed": seed,
+        "generations": generation,
+        "best_benefit": best[0],
+        "final_best": max(fitness, default=0),
+        "final_mean": sum(fitness) / len(fitness) if fitness else 0.0,
+        "migrants_sent": sent,
+        "migrants_received": received,
+        "evaluations": get_evaluation_count() - start_evaluations,
+        "cache_hits": get_fitness_cache_hits() - start_hits,
+        "time": time.time() - start_time}))
+    result.close()
+
+# Best (benefit, individual) that fits the capacity, between the population and best
+def _get_best(population:list[list[bool]], fitness:list[int], dep_sizes:list[int], capacity:int, best:tuple[int, list[bool]]) -> tuple[int, list[bool]]:
+    for index in sorted(range(len(fitness)), key=lambda i: fitness[i], reverse=True):
+        if fitness[index] <= best[0]:
+            break
+        if get_remaining_capacity(dep_sizes, population[index], capacity) >= 0: # mutation can overfill
+            return (fitness[index], population[index][:])
+    return best
+
+# Sends the migrants best individuals to every neighbour -> individuals sent
+def _send_migrants(population:list[list[bool]], fitness:list[int], migrants:int, outbound:list[Connection]) -> int:
+    chosen:list[int] = [list_bool_to_int(individual) for individual in ga.elitism(population, fitness, migrants)]
+    sent:int = 0
+    for connection in outbound:
+        try:
+            connection.send(chosen)
+            sent += len(chosen)
+        except (BrokenPipeError, OSError): # neighbour already finished
+            pass
+    return sent
+
+# Replaces the worst individuals (and their hashes) with every migrant that arrived (and isn't there yet) -> individuals received
+def _receive_migrants(population:list[list[bool]], fitness:list[int], hashes:list[int], inbound:list[Connection], num_deps:int, pack_benefits:list[int], pack_dep:list[tuple[int, int]]) -> int:
+    arrived:list[list[bool]] = []
+    for connection in inbound:
+        try:
+            while connection.poll():
+                arrived.extend(int_to_list_bool(migrant, num_deps) for migrant in connection.recv())
+        except (EOFError, OSError): # neighbour already finished
+            pass
+    existing:set[int] = set(hashes)
+    fresh:list[list[bool]] = []
+    fresh_hashes:list[int] = []
+    for migrant in arrived:
+        migrant_hash:int = zobrist_hash(migrant)
+        if migrant_hash not in existing:
+            existing.add(migrant_hash) # the same migrant can come from two neighbours
+            fresh.append(migrant)
+            fresh_hashes.append(migrant_hash)
+    if not fresh:
+        return 0
+    fresh_fitness:list[int] = ga.evaluate_population(fresh, pack_benefits, pack_dep, fresh_hashes)
+    worst:list[int] = sorted(range(len(fitness)), key=lambda i: fitness[i])[:len(fresh)]
+    for index, migrant, migrant_hash, migrant_fitness in zip(worst, fresh, fresh_hashes, fresh_fitness):
+        population[index] = migrant
+        hashes[index] = migrant_hash
+        fitness[index] = migrant_fitness
+    return min(len(worst), len(fresh))
+
+''' Lists '''
+
+topologies_list:list[str] = ["ring", "full"]
@@ -1,23 +1,26 @@
 # Python 3.13.4
 
 import random
-import time
 
 import move
 import local_search as ls
 from refinement_heuristic import heuristic_type
 from local_search import local_search_dict, local_search_type
-from auxiliary_functions import evaluate_packs
+from auxiliary_functions import evaluate_packs, get_remaining_capacity
+from budget import Budget, get_budget
+from repair import repair_solution
 
 TIME_LIMIT_DEFAULT:float = 30.0
 ILS_MAX_TRIES_DEFAULT:int = 1000
 LS_MAX_TRIES_DEFAULT:int = 1000
+REPAIR_PERTURBATION_DEFAULT:bool = True # a perturbation over the capacity is repaired (repair.py) before the local search
 
 
 # perturbation_moves is a list of moves to be used as perturbation, may be different from neighborhood moves
 # if perturbation_moves == [] it uses a random move as perturbation (may disturb the solution too much)
-def iterated_local_search(sol:list[bool], pack_benefits:list[int], dep_sizes:list[int], pack_dep:list[tuple[int, int]], capacity:int, perturbation_moves:list[str] = [], local_search_methods: list[local_search_type] = [], refinement_heuristics:list[heuristic_type] = [], neighborhood_names:list[str] = [], time_limit: float = TIME_LIMIT_DEFAULT, ils_max_tries: int = ILS_MAX_TRIES_DEFAULT, ls_max_tries:int = LS_MAX_TRIES_DEFAULT) -> move.move_type:
-    start_time:float = time.time()
+# random moves can overfill the knapsack: repair_perturbation makes the perturbed solution fit again before the local search
+def iterated_local_search(sol:list[bool], pack_benefits:list[int], dep_sizes:list[int], pack_dep:list[tuple[int, int]], capacity:int, perturbation_moves:list[str] = [], local_search_methods: list[local_search_type] = [], refinement_heuristics:list[heuristic_type] = [], neighborhood_names:list[str] = [], time_limit: float = TIME_LIMIT_DEFAULT, ils_max_tries: int = ILS_MAX_TRIES_DEFAULT, ls_max_tries:int = LS_MAX_TRIES_DEFAULT, budget: Budget | None = None, repair_perturbation:bool = REPAIR_PERTURBATION_DEFAULT) -> move.move_type:
+    budget = get_budget(budget, time_limit) # shared with every local search and heuristic below
     best_try:int = 0
     tries:int = 0
     level:int = 0
@@ -27,14 +30,18 @@ def iterated_local_search(sol:list[bool], pack_benefits:list[int], dep_sizes:lis
     
     current_sol:move.move_type = (sol[:], "error", -1)
     chosen_ls:int = random.randint(0, max(0, len(local_search_methods)-1))
-    current_sol = local_search_methods[chosen_ls](list(sol[:]), pack_benefits, dep_sizes, pack_dep, capacity, refinement_heuristics, neighborhood_names, time_limit - (time.time() - start_time), ls_max_tries)
+    current_sol = local_search_methods[chosen_ls](list(sol[:]), pack_benefits, dep_sizes, pack_dep, capacity, refinement_heuristics, neighborhood_names, budget.remaining_time(), ls_max_tries, budget)
     current_benefit:int = evaluate_packs(pack_benefits, pack_dep, current_sol[0])
+    budget.report(current_benefit)
 
-    while time_limit > time.time() - start_time  and tries-best_try < ils_max_tries:
+    while not budget.expired() and tries-best_try < ils_max_tries:
         tries += 1
-        perturbed_sol:move.move_type = perturbation(list(current_sol[0]), perturbation_moves, level) # disturbs an already local optimum
-        new_sol = random.choice(local_search_methods)(list(perturbed_sol[0]), pack_benefits, dep_sizes, pack_dep, capacity, refinement_heuristics, neighborhood_names, time_limit - (time.time() - start_time), ls_max_tries)
+        perturbed_sol:move.move_type = perturbation(current_sol[0], perturbation_moves, level) # disturbs an already local optimum
+        if repair_perturbation and get_remaining_capacity(dep_sizes, perturbed_sol[0], capacity) < 0:
+            perturbed_sol = (repair_solution(perturbed_sol[0], pack_benefits, dep_sizes, pack_dep, capacity), perturbed_sol[1], perturbed_sol[2])
+        new_sol = random.choice(local_search_methods)(perturbed_sol[0], pack_benefits, dep_sizes, pack_dep, capacity, refinement_heuristics, neighborhood_names, budget.remaining_time(), ls_max_tries, budget)
         new_benefit:int = evaluate_packs(pack_benefits, pack_dep, new_sol[0])
+        budget.report(new_benefit) # stagnation counts local searches without a new best
         if new_benefit > current_benefit:
             current_sol = new_sol
             current_benefit = new_benefit
@@ -44,11 +51,14 @@ def iterated_local_search(sol:list[bool], pack_benefits:list[int], dep_sizes:lis
     
     return current_sol
 
-#
+# level + 1 random moves applied in place on one copy of sol -> (perturbed copy, last move name and parameters)
 def perturbation(sol:list[bool], moves:list[str], level:int = 0) -> move.move_type:
-    new_sol:move.move_type = (sol[:], "error", -1)
+    perturbed:list[bool] = sol[:]
+    last_move:move.neighborhood_type = ("error", -1)
     num_perturb:int = level + 1
     for cont in range(num_perturb):
-        new_sol = move.random_move(list(new_sol[0]), moves)  # extract solution list from tuple
-    return new_sol
+        last_move = move.random_neighbor(len(sol), moves)
+        if last_move[0] != "error":
+            move.apply(perturbed, last_move)
+    return (perturbed, *last_move)
 
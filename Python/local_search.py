@@ -1,10 +1,10 @@
 # Python 3.13.4
 
 import random
-import time
 from typing import Callable, Union
 from refinement_heuristic import heuristic_type, heuristics_dict
 from move import move_type
+from budget import Budget, get_budget
 
 TIME_LIMIT_DEFAULT:float = 30.0
 
@@ -12,10 +12,11 @@ TIME_LIMIT_DEFAULT:float = 30.0
 
 # To be used when referencing functions from this file
 local_search_type = Union[
-    Callable[[list[bool], list[int], list[int], list[tuple[int, int]], int, list[heuristic_type], list[str], float, int], move_type]
+    Callable[[list[bool], list[int], list[int], list[tuple[int, int]], int, list[heuristic_type], list[str], float, int, Budget | None], move_type]
 ]
 
 ''' Functions '''
+# The heuristics only read the solution they get (an improvement comes back as a new list), so current_move[0] is passed without a copy
 
 # Differences between my Hill Climbing and my VND:
 #       Hill Climbing takes refinement_heuristics list as a circular list and return when a solution fails to get better through all submited heuristics
@@ -23,16 +24,16 @@ local_search_type = Union[
 
 # Searches for a local optimum by iteratively applying a submited list of refinement heuristic
 # Keeps searching as long there's time. If heuristics list ends, it just starts over, still searching for a better
-def hill_climbing(sol: list[bool], pack_benefits:list[int], dep_sizes:list[int], pack_dep:list[tuple[int, int]], capacity:int, refinement_heuristics: list[heuristic_type] = [], neighborhood_names:list[str] = [], time_limit: float = TIME_LIMIT_DEFAULT, max_tries: int = 1000) -> move_type:
+def hill_climbing(sol: list[bool], pack_benefits:list[int], dep_sizes:list[int], pack_dep:list[tuple[int, int]], capacity:int, refinement_heuristics: list[heuristic_type] = [], neighborhood_names:list[str] = [], time_limit: float = TIME_LIMIT_DEFAULT, max_tries: int = 1000, budget: Budget | None = None) -> move_type:
     current_move: move_type = (sol[:], "error", -1) # starts as error_output but may or may not change into something valuable
     failed_heuristics_for_current_move:int = 0 # increases if with a sol the function goes through one heuristic and there's no improvement
-    start_time: float = time.time()
+    budget = get_budget(budget, time_limit) # shared with the heuristics, a budget passed down replaces time_limit
 
-    while time.time() - start_time < time_limit:
+    while not budget.expired():
         for heuristic in refinement_heuristics: # if refinement_heuristics == []: return current_move (aka, error_output)
-            if time.time()-start_time >= time_limit: # end of time
+            if budget.expired(): # end of time
                 return current_move # return better solution found until now
-            new_move:move_type = heuristic(current_move[0][:], pack_benefits, dep_sizes, pack_dep, capacity, neighborhood_names, time_limit - (time.time() - start_time), max_tries)
+            new_move:move_type = heuristic(current_move[0], pack_benefits, dep_sizes, pack_dep, capacity, neighborhood_names, budget.remaining_time(), max_tries, budget)
             if new_move[1] != "error": # new_move provides a better solution
                 current_move = new_move
                 failed_heuristics_for_current_move = 0
@@ -48,16 +49,16 @@ def hill_climbing(sol: list[bool], pack_benefits:list[int], dep_sizes:list[int],
 
 # While there's time and tries, chooses at reandom the heuristic used
 # When the same solution is submited to all heuristics and can't get better -> returns
-def random_descent_method(sol: list[bool], pack_benefits:list[int], dep_sizes:list[int], pack_dep:list[tuple[int, int]], capacity:int, refinement_heuristics: list[heuristic_type] = [], neighborhood_names:list[str] = [], time_limit: float = TIME_LIMIT_DEFAULT, max_tries: int = 1000) -> move_type:
+def random_descent_method(sol: list[bool], pack_benefits:list[int], dep_sizes:list[int], pack_dep:list[tuple[int, int]], capacity:int, refinement_heuristics: list[heuristic_type] = [], neighborhood_names:list[str] = [], time_limit: float = TIME_LIMIT_DEFAULT, max_tries: int = 1000, budget: Budget | None = None) -> move_type:
     current_move: move_type = (sol[:], "error", -1) # starts as error_output but may or may not change into something valuable
     failed_heuristics_current_move:set[heuristic_type] = set()
     submited_heuristics: set[heuristic_type] = set(refinement_heuristics)
     count:int = 0
-    start_time: float = time.time()
+    budget = get_budget(budget, time_limit)
 
-    while count < max_tries and time.time() - start_time < time_limit:
+    while count < max_tries and not budget.expired():
         new_heuristic:heuristic_type = random.choice(refinement_heuristics)
-        new_move:move_type = new_heuristic(current_move[0][:], pack_benefits, dep_sizes, pack_dep, capacity, neighborhood_names, time_limit - (time.time() - start_time), max_tries)
+        new_move:move_type = new_heuristic(current_move[0], pack_benefits, dep_sizes, pack_dep, capacity, neighborhood_names, budget.remaining_time(), max_tries, budget)
         if new_move[1] != "error": # new_move provides a better solution
             current_move = new_move
             failed_heuristics_current_move.clear() # not yet failed heuristics for current solution
@@ -71,14 +72,14 @@ def random_descent_method(sol: list[bool], pack_benefits:list[int], dep_sizes:li
 
 # Searchs for a better solution through all refinement heuristics and resets to the first heuristics if a better solution is found
 # Repeately restarting search each time a better solution is found -> as if hill_climbing as recursive
-def variable_neighborhood_descent(sol: list[bool], pack_benefits:list[int], dep_sizes:list[int], pack_dep:list[tuple[int, int]], capacity:int, refinement_heuristics: list[heuristic_type] = [], neighborhood_names:list[str] = [], time_limit: float = TIME_LIMIT_DEFAULT, max_tries: int = 1000) -> move_type:
+def variable_neighborhood_descent(sol: list[bool], pack_benefits:list[int], dep_sizes:list[int], pack_dep:list[tuple[int, int]], capacity:int, refinement_heuristics: list[heuristic_type] = [], neighborhood_names:list[str] = [], time_limit: float = TIME_LIMIT_DEFAULT, max_tries: int = 1000, budget: Budget | None = None) -> move_type:
     current_move: move_type = (sol[:], "error", -1) # starts as error_output but may or may not change into something valuable
     current_heuristic:int = 0
     len_heuristics_list:int = len(refinement_heuristics)
-    start_time: float = time.time()
+    budget = get_budget(budget, time_limit)
 
-    while current_heuristic < len_heuristics_list and time.time() - start_time < time_limit:
-        new_move:move_type = refinement_heuristics[current_heuristic](current_move[0][:], pack_benefits, dep_sizes, pack_dep, capacity, neighborhood_names, time_limit - (time.time() - start_time), max_tries)
+    while current_heuristic < len_heuristics_list and not budget.expired():
+        new_move:move_type = refinement_heuristics[current_heuristic](current_move[0], pack_benefits, dep_sizes, pack_dep, capacity, neighborhood_names, budget.remaining_time(), max_tries, budget)
         if new_move[1] != "error": # new_move provides a better solution
             current_move = new_move
             current_heuristic = 0 # new better move -> restart the search though heuristics
@@ -88,7 +89,7 @@ def variable_neighborhood_descent(sol: list[bool], pack_benefits:list[int], dep_
     return current_move
 
 # A slightly different version of VND so that it shuffles refinement_heuristics list before exploring or during reset
-def randomized_variable_neighborhood_descent(sol: list[bool], pack_benefits:list[int], dep_sizes:list[int], pack_dep:list[tuple[int, int]], capacity:int, refinement_heuristics: list[heuristic_type] = [], neighborhood_names:list[str] = [], time_limit: float = TIME_LIMIT_DEFAULT, max_tries: int = 1000) -> move_type:
+def randomized_variable_neighborhood_descent(sol: list[bool], pack_benefits:list[int], dep_sizes:list[int], pack_dep:list[tuple[int, int]], capacity:int, refinement_heuristics: list[heuristic_type] = [], neighborhood_names:list[str] = [], time_limit: float = TIME_LIMIT_DEFAULT, max_tries: int = 1000, budget: Budget | None = None) -> move_type:
     current_move: move_type = (sol[:], "error", -1) # starts as error_output but may or may not change into something valuable
     current_heuristic:int = 0
     len_heuristics_list:int = len(refinement_heuristics)
@@ -97,15 +98,15 @@ def randomized_variable_neighborhood_descent(sol: list[bool], pack_benefits:list
     outter_shuffle:bool = False
     inner_shuffle:bool = True
     
-    start_time: float = time.time()
+    budget = get_budget(budget, time_limit)
 
     if outter_shuffle:
         random.shuffle(refinement_heuristics)
 
-    while current_heuristic < len_heuristics_list and time.time() - start_time < time_limit:
+    while current_heuristic < len_heuristics_list and not budget.expired():
         if inner_shuffle and current_heuristic == 0: # only shuffle if we're restarting the try outs, so we don't lose track of what we are doing
             random.shuffle(refinement_heuristics)
-        new_move:move_type = refinement_heuristics[current_heuristic](current_move[0][:], pack_benefits, dep_sizes, pack_dep, capacity, neighborhood_names, time_limit - (time.time() - start_time), max_tries)
+        new_move:move_type = refinement_heuristics[current_heuristic](current_move[0], pack_benefits, dep_sizes, pack_dep, capacity, neighborhood_names, budget.remaining_time(), max_tries, budget)
         if new_move[1] != "error": # new_move provides a better solution
             current_move = new_move
             current_heuristic = 0 # new better move -> restart the search though heuristics
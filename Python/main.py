@@ -84,6 +84,8 @@ def main() -> None:
     #run_experiment.run_local_search_experiment(file_names, [7, 8, 9], 3)
     #run_experiment.run_simulated_annealing_experiment(file_names, [7, 8, 9], outer_time_limit, inner_time_limit, 3)
     #run_experiment.run_iterated_local_search(file_names, [9], outer_time_limit, inner_time_limit, 3)
+    #run_experiment.run_tabu_search_experiment(file_names, [7, 8, 9], outer_time_limit, inner_time_limit, 3)
+    #run_experiment.run_batch_simulated_annealing_experiment(file_names, [7, 8, 9], outer_time_limit, inner_time_limit, 30)
     
     #analyze_results.analyze_constructive()
     #analyze_results.analyze_local_search()
@@ -29,6 +29,13 @@ neighborhood_type = Union[
 # Is this actually a variable ???
 neighborhood_generator_type = Generator[neighborhood_type, None, None]
 
+# Same as move_type for the bitmask representation, the solution is an int (see Bitmask moves)
+mask_move_type = Union[
+    Tuple[int, Literal["flip_bit", "error"], int],
+    Tuple[int, Literal["swap_bits", "reverse_segment"], int, int],
+    Tuple[int, Literal["shift_segment", "move_segment"], int, int, int]
+]
+
 ''' Functions '''
 
 # Flip a bit at a specific index: sol[index] = not sol[index]
@@ -87,7 +94,14 @@ def move_by_name(sol:list[bool], move:neighborhood_type) -> move_type:
 
 # Randomly choose and apply one of the move functions with random parameters
 def random_move(sol: list[bool], neighborhood_names:list[str] = []) -> move_type:
-    error_output: move_type = (sol, "error", -1)
+    neighbor:neighborhood_type = random_neighbor(len(sol), neighborhood_names)
+    if neighbor[0] == "error":
+        return (sol, "error", -1)
+    return move_by_name(sol, neighbor)
+
+# The move random_move would apply to a solution of len_sol bits (same random draws), without applying it
+def random_neighbor(len_sol:int, neighborhood_names:list[str] = []) -> neighborhood_type:
+    error_output: neighborhood_type = ("error", -1)
 
     if neighborhood_names: # if some neighborhood was submited to random_move
         move_names = [name for name in neighborhood_names if name in moves_dict]
@@ -99,40 +113,90 @@ def random_move(sol: list[bool], neighborhood_names:list[str] = []) -> move_type
     
     match random.choice(move_names):
         case "flip_bit":
-            index = random.randint(0, len(sol) - 1)
-            return flip_bit(sol, index)
+            index = random.randint(0, len_sol - 1)
+            return ("flip_bit", index)
         
         case "swap_bits":
-            index1, index2 = random.sample(range(len(sol)), 2)
-            return swap_bits(sol, index1, index2)
+            index1, index2 = random.sample(range(len_sol), 2)
+            return ("swap_bits", index1, index2)
         
         case "reverse_segment":
-            start = random.randint(0, len(sol) - 2)
-            end = random.randint(start + 1, len(sol) - 1)
-            return reverse_segment(sol, start, end)
+            start = random.randint(0, len_sol - 2)
+            end = random.randint(start + 1, len_sol - 1)
+            return ("reverse_segment", start, end)
         
         case "shift_segment":
-            start = random.randint(0, len(sol) - 2)
-            end = random.randint(start + 1, len(sol) - 1)
+            start = random.randint(0, len_sol - 2)
+            end = random.randint(start + 1, len_sol - 1)
             positions = random.randint(1, end - start + 1)
-            return shift_segment(sol, start, end, positions)
+            return ("shift_segment", start, end, positions)
         
         case "move_segment":
-            start = random.randint(0, len(sol) - 2)
-            end = random.randint(start + 1, len(sol) - 1)
-            new_position = random.randint(0, len(sol) - (end - start + 1))
-            return move_segment(sol, start, end, new_position)
+            start = random.randint(0, len_sol - 2)
+            end = random.randint(start + 1, len_sol - 1)
+            new_position = random.randint(0, len_sol - (end - start + 1))
+            return ("move_segment", start, end, new_position)
         case _:
             return error_output
 
-#
+# The solution is only copied once a valid move was drawn
 def get_valid_random_move(sol:list[bool], neighborhood_names:list[str] = [], max_tries:int = 100) -> move_type:
     for _ in range(max_tries):
-        new_move:move_type = random_move(sol[:], neighborhood_names)
-        if new_move[1] != "error":
-            return new_move
+        neighbor:neighborhood_type = random_neighbor(len(sol), neighborhood_names)
+        if neighbor[0] != "error":
+            return move_by_name(sol[:], neighbor)
     return (sol, "error", -1)
 
+''' In-place moves '''
+# A list[bool] solution changes exactly at the positions a move flips, so applying a move is flipping changed_by(sol, move):
+# no copy of the solution
+# changed_by reads the region the move touches (O(1) for flip_bit/swap_bits, O(segment) for segment moves), so a
+# neighbor is scored (IncrementalEvaluator.delta_if_flips) before, or without, ever being built
+# Callers copy the solution only when a move is accepted as the new incumbent
+
+# Indices whose value move_by_name(sol[:], move) would change - sol is not touched
+def changed_by(sol:list[bool], move:neighborhood_type) -> list[int]:
+    changed_function:Callable[[list[bool], int, int, int], list[int]] | None = changed_by_dict.get(move[0])
+    if changed_function is None:
+        return []
+    return changed_function(sol, *move[1:])
+
+# One function per move, all with the (sol, arg1, arg2, arg3) signature - the arguments a move doesn't have are ignored,
+# so packed_neighborhood can call them from a table by opcode
+def changed_by_flip_bit(sol:list[bool], index:int, arg2:int = 0, arg3:int = 0) -> list[int]:
+    return [index]
+
+def changed_by_swap_bits(sol:list[bool], index1:int, index2:int, arg3:int = 0) -> list[int]:
+    return [index1, index2] if sol[index1] != sol[index2] else []
+
+def changed_by_reverse_segment(sol:list[bool], start:int, end:int, arg3:int = 0) -> list[int]:
+    return _changed_region(sol, start, sol[start:end+1][::-1])
+
+def changed_by_shift_segment(sol:list[bool], start:int, end:int, positions:int) -> list[int]:
+    segment:list[bool] = sol[start:end+1]
+    if not segment: return []
+    positions = positions % len(segment)
+    return _changed_region(sol, start, segment[positions:] + segment[:positions])
+
+def changed_by_move_segment(sol:list[bool], start:int, end:int, new_position:int) -> list[int]:
+    segment:list[bool] = sol[start:end+1]
+    new_position = min(new_position, len(sol) - len(segment)) # insert past the end appends, as move_segment does
+    if new_position <= start: # [new_position, end] becomes segment + sol[new_position:start]
+        return _changed_region(sol, new_position, segment + sol[new_position:start])
+    # [start, new_position + width - 1] becomes sol[end+1:new_position+width] + segment
+    return _changed_region(sol, start, sol[end+1:new_position+len(segment)] + segment)
+
+# Indices of region (the new values from index first on) that differ from sol
+def _changed_region(sol:list[bool], first:int, region:list[bool]) -> list[int]:
+    return [first + offset for offset, value in enumerate(region) if value != sol[first + offset]]
+
+# Applies move to sol in place -> changed indices
+def apply(sol:list[bool], move:neighborhood_type) -> list[int]:
+    changed:list[int] = changed_by(sol, move)
+    for index in changed:
+        sol[index] = not sol[index]
+    return changed
+
 ''' Generators '''
 # Generate all possible moves by type
 
@@ -208,6 +272,80 @@ def generate_move(sol:list[bool], move_name: str) -> neighborhood_generator_type
             return empty_generator
 
 
+''' Bitmask moves '''
+# Same moves on the int of aux.list_bool_to_int: index i is bit (num_bits - 1 - i), so segments are contiguous bit ranges
+# Every move is a few int operations and returns a new int, no copy of the solution is needed
+# The generators only use len(sol), so generate_move(range(num_bits), name) also enumerates these moves
+
+# Bit of index in a solution of num_bits bits
+def index_bit(num_bits:int, index:int) -> int:
+    return 1 << (num_bits - 1 - index)
+
+# Rotates indexes first..last to the left by positions: region = region[positions:] + region[:positions]
+def _rotate_region(sol:int, num_bits:int, first:int, last:int, positions:int) -> int:
+    width:int = last - first + 1
+    positions %= width
+    if positions == 0: return sol
+    low:int = num_bits - 1 - last # lowest bit of the region
+    region_mask:int = (1 << width) - 1
+    region:int = (sol >> low) & region_mask
+    region = ((region << positions) | (region >> (width - positions))) & region_mask
+    return (sol & ~(region_mask << low)) | (region << low)
+
+# flip_bit on a bitmask: one xor
+def flip_bit_mask(sol:int, num_bits:int, index:int) -> mask_move_type:
+    return (sol ^ index_bit(num_bits, index), "flip_bit", index)
+
+# swap_bits on a bitmask: flips both bits only if they differ
+def swap_bits_mask(sol:int, num_bits:int, index1:int, index2:int) -> mask_move_type:
+    bits:int = index_bit(num_bits, index1) | index_bit(num_bits, index2)
+    if sol & bits != 0 and sol & bits != bits:
+        sol ^= bits
+    return (sol, "swap_bits", index1, index2)
+
+# reverse_segment on a bitmask
+def reverse_segment_mask(sol:int, num_bits:int, start:int, end:int) -> mask_move_type:
+    width:int = end - start + 1
+    low:int = num_bits - 1 - end
+    region_mask:int = (1 << width) - 1
+    region:int = int(format((sol >> low) & region_mask, f"0{width}b")[::-1], 2)
+    return ((sol & ~(region_mask << low)) | (region << low), "reverse_segment", start, end)
+
+# shift_segment on a bitmask: rotation of the segment
+def shift_segment_mask(sol:int, num_bits:int, start:int, end:int, positions:int) -> mask_move_type:
+    positions = positions % (end - start + 1) # in case positions > len(segment)
+    return (_rotate_region(sol, num_bits, start, end, positions), "shift_segment", start, end, positions)
+
+# move_segment on a bitmask: rotation of the region between the segment and its new position
+def move_segment_mask(sol:int, num_bits:int, start:int, end:int, new_position:int) -> mask_move_type:
+    width:int = end - start + 1
+    if new_position <= start: # region [new_position, end] becomes segment + sol[new_position:start]
+        new_sol:int = _rotate_region(sol, num_bits, new_position, end, start - new_position)
+    else: # region [start, new_position + width - 1] becomes sol[end+1:new_position+width] + segment
+        new_sol = _rotate_region(sol, num_bits, start, new_position + width - 1, width)
+    return (new_sol, "move_segment", start, end, new_position)
+
+# move_by_name on a bitmask
+def move_by_name_mask(sol:int, num_bits:int, move:neighborhood_type) -> mask_move_type:
+    error_output: mask_move_type = (sol, "error", -1)
+    match move:
+        case "flip_bit", arg1:
+            return flip_bit_mask(sol, num_bits, arg1)
+        case ("swap_bits" | "reverse_segment") as name, arg1, arg2:
+            return mask_moves_dict[name](sol, num_bits, arg1, arg2)
+        case ("shift_segment" | "move_segment") as name, arg1, arg2, arg3:
+            return mask_moves_dict[name](sol, num_bits, arg1, arg2, arg3)
+        case _:
+            return error_output
+
+# random_move on a bitmask: same choices and random draws as random_move
+def random_move_mask(sol:int, num_bits:int, neighborhood_names:list[str] = []) -> mask_move_type:
+    neighbor:neighborhood_type = random_neighbor(num_bits, neighborhood_names)
+    if neighbor[0] == "error":
+        return (sol, "error", -1)
+    return move_by_name_mask(sol, num_bits, neighbor)
+
+
 ''' Dictionaries for functions and generators '''
 
 #
@@ -219,6 +357,15 @@ moves_dict: dict[str, move_function_type] = {
     "move_segment": move_segment
 }
 
+#
+changed_by_dict:dict[str, Callable[[list[bool], int, int, int], list[int]]] = {
+    "flip_bit": changed_by_flip_bit,
+    "swap_bits": changed_by_swap_bits,
+    "reverse_segment": changed_by_reverse_segment,
+    "shift_segment": changed_by_shift_segment,
+    "move_segment": changed_by_move_segment
+}
+
 # 
 generators_dict:dict[str, Callable[[list[bool]], neighborhood_generator_type]] = {
     "flip_bit": generate_flip_bit,
@@ -228,3 +375,12 @@ generators_dict:dict[str, Callable[[list[bool]], neighborhood_generator_type]] =
     "move_segment": generate_move_segment
 }
 
+
+# 
+mask_moves_dict:dict[str, Callable[..., mask_move_type]] = {
+    "flip_bit": flip_bit_mask,
+    "swap_bits": swap_bits_mask,
+    "reverse_segment": reverse_segment_mask,
+    "shift_segment": shift_segment_mask,
+    "move_segment": move_segment_mask
+}
@@ -0,0 +1,118 @@
+# Python 3.13.4
+
+import random
+from array import array
+from typing import Callable, Generator, Iterable
+
+import move
+from move import neighborhood_type
+from incremental_evaluation import IncrementalEvaluator
+
+CHUNK_SIZE_DEFAULT:int = 1024 # moves per PackedMoves chunk when a neighborhood is built lazily
+
+''' Packed neighborhoods '''
+# A set of moves as four parallel int arrays (opcode, arg1, arg2, arg3) instead of one ("name", args...) tuple per move
+# The opcode indexes tables of callables (changed_table, score_table) instead of a match on the move name, and the
+# arguments a move doesn't have are 0, so every move is scored with the same call
+# A PackedMoves can be sliced into index ranges (parallel scans) and sampled at random; get gives back the tuple form
+
+FLIP_BIT, SWAP_BITS, REVERSE_SEGMENT, SHIFT_SEGMENT, MOVE_SEGMENT = range(5)
+opcode_names:list[str] = ["flip_bit", "swap_bits", "reverse_segment", "shift_segment", "move_segment"] # opcode -> move name
+opcodes_dict:dict[str, int] = {name: opcode for opcode, name in enumerate(opcode_names)}
+opcode_arity:list[int] = [1, 2, 2, 3, 3] # arguments of each move in its tuple form
+
+class PackedMoves:
+    def __init__(self) -> None:
+        self.opcodes:array = array("b")
+        self.args1:array = array("q")
+        self.args2:array = array("q")
+        self.args3:array = array("q")
+
+    def __len__(self) -> int:
+        return len(self.opcodes)
+
+    def append(self, opcode:int, arg1:int, arg2:int = 0, arg3:int = 0) -> None:
+        self.opcodes.append(opcode)
+        self.args1.append(arg1)
+        self.args2.append(arg2)
+        self.args3.append(arg3)
+
+    def extend(self, other:"PackedMoves") -> None:
+        self.opcodes.extend(other.opcodes)
+        self.args1.extend(other.args1)
+        self.args2.extend(other.args2)
+        self.args3.extend(other.args3)
+
+    # Move of index in the tuple form of move.py
+    def get(self, index:int) -> neighborhood_type:
+        opcode:int = self.opcodes[index]
+        return (opcode_names[opcode], self.args1[index], self.args2[index], self.args3[index])[:opcode_arity[opcode] + 1]
+
+    # Random index, -1 if there is no move
+    def sample(self) -> int:
+        return random.randrange(len(self)) if len(self) else -1
+
+    # Moves [start, stop) as a new PackedMoves
+    def slice(self, start:int, stop:int) -> "PackedMoves":
+        part:PackedMoves = PackedMoves()
+        part.opcodes = self.opcodes[start:stop]
+        part.args1 = self.args1[start:stop]
+        part.args2 = self.args2[start:stop]
+        part.args3 = self.args3[start:stop]
+        return part
+
+    # Consecutive slices of up to chunk_size moves
+    def chunks(self, chunk_size:int = CHUNK_SIZE_DEFAULT) -> Generator["PackedMoves", None, None]:
+        for start in range(0, len(self), chunk_size):
+            yield self.slice(start, start + chunk_size)
+
+    @classmethod
+    def from_moves(cls, moves:Iterable[neighborhood_type]) -> "PackedMoves":
+        packed:PackedMoves = cls()
+        for neighbor in moves:
+            packed.append(opcodes_dict[neighbor[0]], *neighbor[1:])
+        return packed
+
+''' Dispatch tables '''
+# changed_table[opcode](sol, arg1, arg2, arg3) -> indices the move flips (move.changed_by_dict, by opcode)
+# score_table[opcode](evaluator, arg1, arg2, arg3) -> benefit change of the move on the evaluator's solution, None if it doesn't fit
+# flip_bit is scored directly on the evaluator, the other moves through their changed indices
+
+changed_table:list[Callable[[list[bool], int, int, int], list[int]]] = [move.changed_by_dict[name] for name in opcode_names]
+
+def _score_flip_bit(evaluator:IncrementalEvaluator, index:int, arg2:int, arg3:int) -> int | None:
+    if evaluator.size_delta_if_flip(index) > evaluator.get_remaining_capacity():
+        return None
+    return evaluator.delta_if_flip(index)
+
+# Scorer of a move from the function giving its changed indices
+def _changed_scorer(changed_function:Callable[[list[bool], int, int, int], list[int]]) -> Callable[[IncrementalEvaluator, int, int, int], int | None]:
+    def score(evaluator:IncrementalEvaluator, arg1:int, arg2:int, arg3:int) -> int | None:
+        changed:list[int] = changed_function(evaluator.sol, arg1, arg2, arg3)
+        if not evaluator.fits_if_flip(changed):
+            return None
+        return evaluator.delta_if_flips(changed)
+    return score
+
+score_table:list[Callable[[IncrementalEvaluator, int, int, int], int | None]] = [_score_flip_bit] + [_changed_scorer(changed_function) for changed_function in changed_table[1:]]
+
+''' Functions '''
+
+# First move of moves that fits and improves the evaluator's solution -> (index, delta), (-1, 0) if there is none
+def first_improvement(moves:PackedMoves, evaluator:IncrementalEvaluator) -> tuple[int, int]:
+    table = score_table
+    for index, (opcode, arg1, arg2, arg3) in enumerate(zip(moves.opcodes, moves.args1, moves.args2, moves.args3)):
+        delta:int | None = table[opcode](evaluator, arg1, arg2, arg3)
+        if delta is not None and delta > 0:
+            return index, delta
+    return -1, 0
+
+# Fitting move of moves with the largest delta above min_delta (first one on ties) -> (index, delta), (-1, min_delta) if there is none
+def best_improvement(moves:PackedMoves, evaluator:IncrementalEvaluator, min_delta:int = 0) -> tuple[int, int]:
+    table = score_table
+    best_index:int = -1
+    for index, (opcode, arg1, arg2, arg3) in enumerate(zip(moves.opcodes, moves.args1, moves.args2, moves.args3)):
+        delta:int | None = table[opcode](evaluator, arg1, arg2, arg3)
+        if delta is not None and delta > min_delta:
+            best_index, min_delta = index, delta
+    return best_index, min_delta
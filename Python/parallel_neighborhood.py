@@ -0,0 +1,169 @@
+# Python 3.13.4
+
+import atexit
+import multiprocessing
+import os
+from collections import deque
+from itertools import chain
+from multiprocessing.pool import AsyncResult, Pool
+from typing import Any, Iterable
+
+from auxiliary_functions import compile_instance, add_evaluation_count, get_evaluation_count
+from budget import Budget
+from incremental_evaluation import IncrementalEvaluator
+from instance import Instance
+from instance_cache import MappedInstance, encode_instance
+from identity_memo import IdentityMemo
+from move import neighborhood_type
+from packed_neighborhood import PackedMoves, best_improvement
+
+WORKERS_DEFAULT:int | None = None # None -> os.cpu_count()
+TASKS_PER_WORKER_DEFAULT:int = 4 # chunks sent ahead per worker while the neighborhood is still being built
+MIN_PARALLEL_MOVES_DEFAULT:int = 5000 # smaller neighborhoods are scanned in the calling process (cheaper than the round trip)
+SYNC_RESET_FRACTION:float = 0.1 # a worker reloads its evaluator when more deps than this fraction changed since its last task
+STOP_CHECK_MOVES:int = 256 # moves a worker scans between two looks at the stop flag
+STOP_POLL_SECONDS:float = 0.01 # while waiting for a task the caller checks the budget this often
+
+POOLS_SIZE:int = 1 # pools kept alive (their worker processes), the most recent ones
+
+_pools:IdentityMemo = IdentityMemo(POOLS_SIZE, on_evict=lambda pool: pool.close()) # (instance, workers) -> NeighborhoodPool
+
+''' Neighborhood pool '''
+# Best-improvement scan of a neighborhood, given as PackedMoves chunks, on a persistent pool of worker processes
+# The instance (instance_cache sidecar layout) and the current solution (one byte per dep) live in shared memory
+# (multiprocessing.RawArray) handed to every worker when the pool starts: a worker compiles the instance once and keeps
+# an IncrementalEvaluator, which each task brings to the shared solution by flipping the deps that changed
+# A scan writes the solution and sends each chunk to the pool as soon as it's built (pack_distinct_moves is a generator),
+# at most TASKS_PER_WORKER_DEFAULT per worker ahead of the results; each task returns its chunk's best move above
+# min_delta (packed_neighborhood.best_improvement) and results are read in chunk order, so the caller keeps the largest
+# delta, first one on ties - the move the serial scan would pick
+# Once the budget expires no chunk is sent and a shared stop flag makes the running tasks return what they have; every
+# task is still waited for, so none is left running and all the workers' evaluations are added to the caller's counter
+
+class NeighborhoodPool:
+    def __init__(self, instance:Instance, workers:int | None = WORKERS_DEFAULT) -> None:
+        self.instance:Instance = instance
+        self.workers:int = workers or os.cpu_count() or 1
+        encoded:bytes = encode_instance(*instance.as_tuple())
+        self.shared_instance = multiprocessing.RawArray("B", len(encoded))
+        memoryview(self.shared_instance).cast("B")[:] = encoded
+        self.shared_sol = multiprocessing.RawArray("B", max(1, instance.num_deps))
+        self.stop = multiprocessing.RawValue("b", 0)
+        self.pool:Pool = multiprocessing.Pool(self.workers, initializer=_init_worker, initargs=(self.shared_instance, self.shared_sol, self.stop))
+
+    # Best fitting move of the chunks above min_delta on sol -> (move, delta), (None, min_delta) if there is none
+    # Once budget expires: best of the moves scanned until then
+    def best_move(self, sol:list[bool], chunks:Iterable[PackedMoves], min_delta:int = 0, budget:Budget | None = None) -> tuple[neighborhood_type | None, int]:
+        memoryview(self.shared_sol).cast("B")[:len(sol)] = bytes(map(bool, sol))
+        self.stop.value = 0
+        pending:deque[AsyncResult] = deque()
+        best:tuple[neighborhood_type | None, int] = (None, min_delta)
+        for chunk in chunks:
+            if self._expired(budget):
+                break
+            pending.append(self.pool.apply_async(_scan_chunk, ((chunk, min_delta),)))
+            while len(pending) >= self.workers * TASKS_PER_WORKER_DEFAULT:
+                best = self._collect(pending.popleft(), best, budget)
+        while pending: # the rest of the tasks, stopped early if the budget expires meanwhile
+            best = self._collect(pending.popleft(), best, budget)
+        return best
+
+    # Result of one task merged into best (tasks are collected in chunk order, so ties keep the earlier move)
+    # The budget is checked while waiting, so the stop flag goes up as soon as it expires
+    def _collect(self, result:AsyncResult, best:tuple[neighborhood_type | None, int], budget:Budget | None = None) -> tuple[neighborhood_type | None, int]:
+        while not result.ready():
+            result.wait(STOP_POLL_SECONDS)
+            self._expired(budget)
+        found, delta, evaluations = result.get()
+        add_evaluation_count(evaluations)
+        return (found, delta) if found is not None and delta > best[1] else best
+
+    # budget.expired(), raising the workers' stop flag when it is
+    def _expired(self, budget:Budget | None) -> bool:
+        if budget is not None and budget.expired():
+            self.stop.value = 1
+            return True
+        return False
+
+    def close(self) -> None:
+        self.pool.terminate()
+        self.pool.join()
+
+''' Worker process '''
+
+_worker_evaluator:IncrementalEvaluator | None = None
+_worker_sol:memoryview | None = None
+_worker_stop:Any = None
+
+def _init_worker(shared_instance:Any, shared_sol:Any, stop:Any) -> None:
+    global _worker_evaluator, _worker_sol, _worker_stop
+    mapped:MappedInstance = MappedInstance.from_buffer(memoryview(shared_instance).cast("B"), "shared instance")
+    _worker_evaluator = IncrementalEvaluator.from_instance(compile_instance(*mapped.to_lists()))
+    _worker_sol = memoryview(shared_sol).cast("B")
+    _worker_stop = stop
+
+# (move, delta, evaluations) of the best move of one chunk on the shared solution, move None if none beats min_delta
+# The chunk is scanned STOP_CHECK_MOVES at a time, stopping when the caller raises the stop flag
+def _scan_chunk(task:tuple[PackedMoves, int]) -> tuple[neighborhood_type | None, int, int]:
+    moves, min_delta = task
+    assert _worker_evaluator is not None and _worker_sol is not None, "_scan_chunk runs on a pool started with _init_worker"
+    evaluator:IncrementalEvaluator = _worker_evaluator
+    sol:list[bool] = [bool(value) for value in _worker_sol[:evaluator.instance.num_deps]]
+    changed:list[int] = [dep for dep, (old, new) in enumerate(zip(evaluator.sol, sol)) if old != new]
+    if len(changed) > SYNC_RESET_FRACTION * len(sol):
+        evaluator.reset(sol)
+    else:
+        for dep in changed:
+            evaluator.flip(dep)
+        evaluator.commit()
+    evaluations:int = get_evaluation_count()
+    found:neighborhood_type | None = None
+    for start in range(0, len(moves), STOP_CHECK_MOVES):
+        if _worker_stop.value:
+            break
+        part:PackedMoves = moves.slice(start, start + STOP_CHECK_MOVES)
+        index, min_delta = best_improvement(part, evaluator, min_delta)
+        if index >= 0:
+            found = part.get(index)
+    return found, min_delta, get_evaluation_count() - evaluations
+
+''' Functions '''
+
+# Pool of the instance with the given number of workers, kept between calls (a pool of another instance or size is closed)
+def get_neighborhood_pool(instance:Instance, workers:int | None = WORKERS_DEFAULT) -> NeighborhoodPool:
+    workers = workers or os.cpu_count() or 1
+    return _pools.get_or_create(instance, lambda: NeighborhoodPool(instance, workers), workers)
+
+# Best fitting move of the chunks above min_delta -> (move, delta), (None, min_delta) if there is none
+# On the pool when workers > 1 and the neighborhood has at least min_parallel_moves moves: chunks are only built ahead
+# up to that count, then sent to the pool as they come; otherwise they're scanned here, like absolute_best_step does
+def parallel_best_move(sol:list[bool], chunks:Iterable[PackedMoves], evaluator:IncrementalEvaluator, min_delta:int = 0, workers:int | None = WORKERS_DEFAULT, budget:Budget | None = None, min_parallel_moves:int = MIN_PARALLEL_MOVES_DEFAULT) -> tuple[neighborhood_type | None, int]:
+    chunks = iter(chunks)
+    if (workers or os.cpu_count() or 1) <= 1 or multiprocessing.current_process().daemon: # pool workers can't start processes
+        return _serial_best_move(chunks, evaluator, min_delta, budget)
+    buffered:list[PackedMoves] = []
+    count:int = 0
+    for chunk in chunks:
+        buffered.append(chunk)
+        count += len(chunk)
+        if count >= min_parallel_moves:
+            break
+    if count < min_parallel_moves: # every chunk is already built
+        return _serial_best_move(buffered, evaluator, min_delta, budget)
+    return get_neighborhood_pool(evaluator.instance, workers).best_move(sol, chain(buffered, chunks), min_delta, budget)
+
+def _serial_best_move(chunks:Iterable[PackedMoves], evaluator:IncrementalEvaluator, min_delta:int, budget:Budget | None) -> tuple[neighborhood_type | None, int]:
+    found:neighborhood_type | None = None
+    for chunk in chunks:
+        if budget is not None and budget.expired():
+            break
+        index, min_delta = best_improvement(chunk, evaluator, min_delta)
+        if index >= 0:
+            found = chunk.get(index)
+    return found, min_delta
+
+# Stops every cached pool's workers (also run at exit)
+def close_neighborhood_pools() -> None:
+    _pools.clear()
+
+atexit.register(close_neighborhood_pools)
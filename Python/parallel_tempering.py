@@ -0,0 +1,230 @@
+# Python 3.13.4
+
+import multiprocessing
+import os
+import random
+import time
+from math import exp, log
+from multiprocessing.connection import Connection
+from typing import Any
+
+from move import neighborhood_type, changed_by
+from auxiliary_functions import get_evaluation_count, list_bool_to_int, int_to_list_bool
+from feasible_sampler import FeasibleMoveSampler, get_feasible_sampler
+from incremental_evaluation import IncrementalEvaluator
+from first_solution import create_randomic_solution
+from budget import Budget
+
+REPLICAS_DEFAULT:int | None = None # None -> os.cpu_count()
+EXCHANGE_INTERVAL_DEFAULT:int = 100 # moves each replica makes between two exchange rounds
+TIME_LIMIT_DEFAULT:float = 90.0
+SAMPLE_MOVES_DEFAULT:int = 200 # random moves sampled to place the default ladder
+HOT_ACCEPTANCE_DEFAULT:float = 0.8 # chance the hottest replica accepts an average worsening move
+COLD_ACCEPTANCE_DEFAULT:float = 0.01 # same, coldest replica
+TARGET_SWAP_ACCEPTANCE_DEFAULT:float = 0.25 # swap acceptance auto_tune aims for between adjacent temperatures
+TUNE_FRACTION_DEFAULT:float = 0.25 # part of the time limit the ladder is tuned in, then it stays fixed
+TUNE_ROUNDS_DEFAULT:int = 10 # exchange rounds between two tuning steps
+TUNE_STEP_DEFAULT:float = 1.0 # how strongly a tuning step reacts to the distance to the target
+RESULT_GRACE_TIME:float = 10.0 # seconds past the time limit to wait for the replicas
+
+''' Parallel tempering '''
+# Replica exchange: R simulated annealing chains, each in its own process at one fixed temperature of a ladder
+# (temperatures[0] the coldest), instead of one chain cooling from a temperature that must be searched for first
+# Every exchange_interval moves the replicas send their current state to this process, which tries to swap the states of
+# adjacent temperatures (even pairs on even rounds, odd pairs on odd rounds) with the Metropolis criterion for maximization:
+#   accept with min(1, exp((benefit[i+1] - benefit[i]) * (1/T[i] - 1/T[i+1])))
+# so a better state found by a hot replica always goes down to the colder one, and a worse one sometimes goes up
+# Swap attempts / accepts are counted per pair of adjacent temperatures; with auto_tune the log-gaps of the ladder are
+# widened where swaps are accepted more often than the target and narrowed where less, during the first part of the run
+# States travel as ints (aux.list_bool_to_int) through pipes, the best solution of every replica is collected at the end
+
+# Best solution over all replicas -> (solution, benefit, statistics)
+def parallel_tempering(sol:list[bool], pack_benefits:list[int], dep_sizes:list[int], pack_dep:list[tuple[int, int]], capacity:int, neighborhood_names:list[str] = [], replicas:int | None = REPLICAS_DEFAULT, temperatures:list[float] | None = None, exchange_interval:int = EXCHANGE_INTERVAL_DEFAULT, auto_tune:bool = True, target_acceptance:float = TARGET_SWAP_ACCEPTANCE_DEFAULT, time_limit:float = TIME_LIMIT_DEFAULT, seed:int | None = None) -> tuple[list[bool], int, dict[str, Any]]:
+    deadline:float = time.time() + time_limit
+    tune_until:float = time.time() + time_limit * TUNE_FRACTION_DEFAULT if auto_tune else 0.0
+    if seed is None: seed = random.randrange(2**32)
+    if len(sol) == 0: sol = create_randomic_solution(pack_benefits, dep_sizes, pack_dep, capacity)
+    if temperatures is None:
+        temperatures = estimate_temperature_ladder(sol, pack_benefits, dep_sizes, pack_dep, capacity, replicas or os.cpu_count() or 1, neighborhood_names)
+    temperatures = sorted(temperatures)
+    replicas = len(temperatures)
+
+    processes:list[multiprocessing.Process] = []
+    connections:list[Connection] = []
+    for replica in range(replicas):
+        connection, child_connection = multiprocessing.Pipe()
+        process = multiprocessing.Process(target=_run_replica, args=(
+            replica, temperatures[replica], sol, pack_benefits, dep_sizes, pack_dep, capacity, neighborhood_names,
+            exchange_interval, deadline, seed + replica, child_connection))
+        process.start()
+        child_connection.close() # the child holds its own copy
+        processes.append(process)
+        connections.append(connection)
+
+    attempts:list[int] = [0]*(replicas - 1) # swap attempts / accepts between temperatures i and i+1, whole run
+    accepts:list[int] = [0]*(replicas - 1)
+    window_attempts:list[int] = [0]*(replicas - 1) # same, since the last tuning step
+    window_accepts:list[int] = [0]*(replicas - 1)
+    rounds:int = 0
+    running:bool = True
+    while running:
+        states:list[tuple[int, int, bool]] | None = _receive_states(connections, deadline)
+        if states is None: break # a replica died or stopped answering
+        running = not any(finished for _, _, finished in states) and time.time() < deadline
+        new_states:list[int | None] = [None]*replicas
+        for i in range(rounds % 2, replicas - 1, 2):
+            attempts[i] += 1
+            window_attempts[i] += 1
+            if accept_swap(states[i][1], states[i + 1][1], temperatures[i], temperatures[i + 1]):
+                accepts[i] += 1
+                window_accepts[i] += 1
+                new_states[i], new_states[i + 1] = states[i + 1][0], states[i][0]
+        rounds += 1
+        if running and time.time() < tune_until and rounds % TUNE_ROUNDS_DEFAULT == 0:
+            temperatures = tune_ladder(temperatures, window_attempts, window_accepts, target_acceptance)
+            window_attempts = [0]*(replicas - 1)
+            window_accepts = [0]*(replicas - 1)
+        for connection, new_state, temperature in zip(connections, new_states, temperatures):
+            connection.send((new_state, temperature, not running))
+
+    best_sol:list[bool] = sol[:]
+    best_benefit:int = -1
+    replica_stats:list[dict[str, Any]] = []
+    for replica, connection in enumerate(connections):
+        if not connection.poll(max(0.0, deadline - time.time()) + RESULT_GRACE_TIME):
+            replica_stats.append({"replica": replica, "error": "no result"})
+            continue
+        replica_best, replica_benefit, stats = connection.recv()
+        replica_stats.append(stats)
+        if replica_benefit > best_benefit:
+            best_sol = int_to_list_bool(replica_best, len(sol))
+            best_benefit = replica_benefit
+    for process in processes:
+        process.join(RESULT_GRACE_TIME)
+        if process.is_alive(): process.terminate()
+    for connection in connections:
+        connection.close()
+    return best_sol, max(best_benefit, 0), {
+        "temperatures": temperatures,
+        "rounds": rounds,
+        "swap_attempts": attempts,
+        "swap_accepts": accepts,
+        "swap_acceptance": [accepted / tried if tried else 0.0 for accepted, tried in zip(accepts, attempts)],
+        "replicas": replica_stats}
+
+# Metropolis criterion of a swap between a colder (cold_temperature) and a hotter replica, for maximization
+def accept_swap(cold_benefit:int, hot_benefit:int, cold_temperature:float, hot_temperature:float) -> bool:
+    exponent:float = (hot_benefit - cold_benefit) * (1/cold_temperature - 1/hot_temperature)
+    return exponent >= 0 or random.random() < exp(exponent)
+
+# Geometric ladder of replicas temperatures between cold and hot (cold first)
+def get_temperature_ladder(cold:float, hot:float, replicas:int) -> list[float]:
+    if replicas == 1:
+        return [cold]
+    return [cold * (hot / cold) ** (i / (replicas - 1)) for i in range(replicas)]
+
+# Default ladder: the hottest replica accepts an average worsening move with HOT_ACCEPTANCE_DEFAULT, the coldest with
+# COLD_ACCEPTANCE_DEFAULT - the average comes from a random walk of sample_moves feasible moves from sol, not from a search
+# (a walk rather than the moves of sol alone: around an empty or very poor sol almost every move improves)
+def estimate_temperature_ladder(sol:list[bool], pack_benefits:list[int], dep_sizes:list[int], pack_dep:list[tuple[int, int]], capacity:int, replicas:int, neighborhood_names:list[str] = [], sample_moves:int = SAMPLE_MOVES_DEFAULT) -> list[float]:
+    evaluator:IncrementalEvaluator = IncrementalEvaluator(pack_benefits, dep_sizes, pack_dep, capacity, sol)
+    current_sol:list[bool] = evaluator.sol # moved in place, copied only for a new best
+    sampler:FeasibleMoveSampler = get_feasible_sampler(current_sol, pack_benefits, dep_sizes, pack_dep, capacity)
+    losses:list[int] = []
+    for _ in range(sample_moves):
+        neighbor:neighborhood_type = sampler.random_neighbor(neighborhood_names)
+        if neighbor[0] == "error": continue
+        changed:list[int] = changed_by(current_sol, neighbor)
+        delta:int = evaluator.delta_if_flips(changed)
+        if delta < 0: losses.append(-delta)
+        for dep in changed: evaluator.flip(dep); sampler.flip(dep)
+        evaluator.commit()
+    average_loss:float = sum(losses) / len(losses) if losses else 1.0
+    return get_temperature_ladder(average_loss / log(1 / COLD_ACCEPTANCE_DEFAULT), average_loss / log(1 / HOT_ACCEPTANCE_DEFAULT), replicas)
+
+# One tuning step: each log-gap ln(T[i+1]/T[i]) is scaled by exp(step * (acceptance - target)), then all of them by the
+# same factor so the coldest and hottest temperatures stay: the interior moves towards equal acceptance between neighbours
+# (scaling only would let the hot end run away, two hot replicas both walking at random swap almost always)
+# Pairs without attempts in the window keep their relative gap
+def tune_ladder(temperatures:list[float], attempts:list[int], accepts:list[int], target:float = TARGET_SWAP_ACCEPTANCE_DEFAULT, step:float = TUNE_STEP_DEFAULT) -> list[float]:
+    if len(temperatures) < 3:
+        return temperatures[:] # no interior temperature to move
+    gaps:list[float] = [log(temperatures[i + 1] / temperatures[i]) for i in range(len(temperatures) - 1)]
+    span:float = sum(gaps)
+    gaps = [gap * exp(step * (accepts[i] / attempts[i] - target)) if attempts[i] > 0 else gap for i, gap in enumerate(gaps)]
+    scale:float = span / sum(gaps)
+    tuned:list[float] = [temperatures[0]]
+    for gap in gaps[:-1]:
+        tuned.append(tuned[-1] * exp(gap * scale))
+    tuned.append(temperatures[-1])
+    return tuned
+
+''' Replica process '''
+
+# (state as int, benefit, finished) of every replica, in temperature order, or None if one doesn't answer in time
+def _receive_states(connections:list[Connection], deadline:float) -> list[tuple[int, int, bool]] | None:
+    states:list[tuple[int, int, bool]] = []
+    for connection in connections:
+        try:
+            if not connection.poll(max(0.0, deadline - time.time()) + RESULT_GRACE_TIME):
+                return None
+            states.append(connection.recv())
+        except (EOFError, OSError):
+            return None
+    return states
+
+# One replica: Metropolis moves at its temperature, exchange_interval at a time, then sends (state, benefit, finished) and
+# continues from the state it gets back (None -> its own), with the temperature it gets back, until told to stop
+# Sends (best as int, benefit, stats) at the end
+def _run_replica(replica:int, temperature:float, sol:list[bool], pack_benefits:list[int], dep_sizes:list[int], pack_dep:list[tuple[int, int]], capacity:int, neighborhood_names:list[str], exchange_interval:int, deadline:float, seed:int, connection:Connection) -> None:
+    random.seed(seed)
+    start_time:float = time.time()
+    start_evaluations:int = get_evaluation_count()
+    budget:Budget = Budget(deadline - start_time)
+    evaluator:IncrementalEvaluator = IncrementalEvaluator(pack_benefits, dep_sizes, pack_dep, capacity, sol)
+    current_sol:list[bool] = evaluator.sol # moved in place, copied only for a new best
+    sampler:FeasibleMoveSampler = get_feasible_sampler(current_sol, pack_benefits, dep_sizes, pack_dep, capacity)
+    best:tuple[int, list[bool]] = (evaluator.get_benefit(), current_sol[:])
+    moves:int = 0
+    accepted:int = 0
+    swapped_in:int = 0
+    stop:bool = False
+
+    while not stop:
+        for _ in range(exchange_interval):
+            if budget.expired(): break
+            moves += 1
+            neighbor:neighborhood_type = sampler.random_neighbor(neighborhood_names) # always fits the capacity
+            if neighbor[0] == "error": continue # couldn't find a new solution
+            changed:list[int] = changed_by(current_sol, neighbor)
+            delta:int = evaluator.delta_if_flips(changed)
+            if delta >= 0 or random.random() < exp(delta / temperature):
+                for dep in changed: evaluator.flip(dep); sampler.flip(dep)
+                evaluator.commit()
+                accepted += 1
+                if evaluator.get_benefit() > best[0]:
+                    best = (evaluator.get_benefit(), current_sol[:])
+        try:
+            connection.send((list_bool_to_int(current_sol), evaluator.get_benefit(), budget.expired()))
+            new_state, temperature, stop = connection.recv()
+        except (EOFError, OSError): # the coordinator is gone
+            return
+        if new_state is not None:
+            evaluator.reset(int_to_list_bool(new_state, len(sol)))
+            current_sol = evaluator.sol
+            sampler.reset(current_sol)
+            swapped_in += 1
+
+    connection.send((list_bool_to_int(best[1]), best[0], {
+        "replica": replica,
+        "seed": seed,
+        "final_temperature": temperature,
+        "moves": moves,
+        "accepted_moves": accepted,
+        "acceptance": accepted / moves if moves else 0.0,
+        "states_swapped_in": swapped_in,
+        "best_benefit": best[0],
+        "final_benefit": evaluator.get_benefit(),
+        "evaluations": get_evaluation_count() - start_evaluations,
+        "time": time.time() - start_time}))
+    connection.close()
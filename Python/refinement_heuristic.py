@@ -1,11 +1,18 @@
 # Python 3.13.4
 
-import time
 import move
-from auxiliary_functions import evaluate_packs, get_remaining_capacity
+from incremental_evaluation import IncrementalEvaluator
+from flip_gain import get_flip_gain_tracker
+from feasible_sampler import FeasibleMoveSampler, get_feasible_sampler
+from swap_neighborhood import find_best_swap, find_first_swap
+from distinct_neighborhood import pack_distinct_moves
+from packed_neighborhood import first_improvement, best_improvement
+from parallel_neighborhood import parallel_best_move
+from budget import Budget, get_budget
 from typing import Union, Callable
 
 TIME_LIMIT_DEFAULT:float = 30.0
+WORKERS_DEFAULT:int | None = 1 # absolute_best_step: 1 -> scans in this process, None -> os.cpu_count() workers (parallel_neighborhood)
 
 # Improvement functions are integrated with find functions 
 
@@ -13,7 +20,7 @@ TIME_LIMIT_DEFAULT:float = 30.0
 
 # To be used when referencing functions from this file
 heuristic_type = Union[
-    Callable[[list[bool], list[int], list[int], list[tuple[int, int]], int, list[str], float, int], move.move_type], # random, first and best
+    Callable[[list[bool], list[int], list[int], list[tuple[int, int]], int, list[str], float, int, Budget | None], move.move_type], # random, first and best
 ]
 
 ''' Functions '''
@@ -27,80 +34,101 @@ heuristic_type = Union[
 
 
 # Returns a randomic better solution with the move name and parameters that reached new_sol
-def random_best_step(sol: list[bool], pack_benefits:list[int], dep_sizes:list[int], pack_dep:list[tuple[int, int]], capacity:int, neighborhood_names:list[str] = [], time_limit: float = TIME_LIMIT_DEFAULT, max_tries: int = 1000) -> move.move_type:
+def random_best_step(sol: list[bool], pack_benefits:list[int], dep_sizes:list[int], pack_dep:list[tuple[int, int]], capacity:int, neighborhood_names:list[str] = [], time_limit: float = TIME_LIMIT_DEFAULT, max_tries: int = 1000, budget: Budget | None = None) -> move.move_type:
     error_output: move.move_type = (sol, "error", -1)
-    current_move_evaluation: int = evaluate_packs(pack_benefits, pack_dep, sol)
+    evaluator: IncrementalEvaluator = IncrementalEvaluator(pack_benefits, dep_sizes, pack_dep, capacity, sol)
+    sampler: FeasibleMoveSampler = get_feasible_sampler(sol, pack_benefits, dep_sizes, pack_dep, capacity)
+    budget = get_budget(budget, time_limit) # a budget passed down replaces time_limit
     count:int = 0
-    start_time = time.time()
-    while count < max_tries and time.time()-start_time < time_limit:
-        new_move:move.move_type = move.random_move(sol[:], neighborhood_names)
-
-        if get_remaining_capacity(dep_sizes, new_move[0], capacity) < 0:
+    while count < max_tries and not budget.expired():
+        neighbor:move.neighborhood_type = sampler.random_neighbor(neighborhood_names) # always fits the capacity
+        if neighbor[0] == "error":
             count+=1
-            continue # invalid solution, try next
+            continue # no feasible move found, try next
+        changed: list[int] = move.changed_by(sol, neighbor) # scored without building the neighbor
 
-        if evaluate_packs(pack_benefits, pack_dep, new_move[0]) > current_move_evaluation:
-            return new_move
+        if evaluator.delta_if_flips(changed) > 0:
+            return move.move_by_name(sol[:], neighbor)
         else:
             count+=1
     return error_output # Couldn't find a better solution
 
 # Default neighborhood_names is [] -> all moves
-def first_best_step(sol: list[bool], pack_benefits:list[int], dep_sizes:list[int], pack_dep:list[tuple[int, int]], capacity:int, neighborhood_names:list[str] = [], time_limit: float = TIME_LIMIT_DEFAULT, max_tries: int = 1000) -> move.move_type:
+def first_best_step(sol: list[bool], pack_benefits:list[int], dep_sizes:list[int], pack_dep:list[tuple[int, int]], capacity:int, neighborhood_names:list[str] = [], time_limit: float = TIME_LIMIT_DEFAULT, max_tries: int = 1000, budget: Budget | None = None) -> move.move_type:
     error_output: move.move_type = (sol, "error", -1)
-    current_move_evaluation: int = evaluate_packs(pack_benefits, pack_dep, sol)
-    start_time: float = time.time() 
+    evaluator: IncrementalEvaluator = IncrementalEvaluator(pack_benefits, dep_sizes, pack_dep, capacity, sol)
+    seen: set[int] = set() # effects already tried, shared by all neighborhoods
+    budget = get_budget(budget, time_limit)
     for move_name in neighborhood_names: # if neighborhood_names == []: return error_output
-        if time.time()-start_time >= time_limit:
+        if budget.expired():
             return error_output # didn't have enough time to find a better solution
-        move_generator: move.neighborhood_generator_type = move.generate_move(sol, move_name)
-        for move_input_tuple in move_generator:
-            if time.time()-start_time >= time_limit:
+        if move_name == "swap_bits": # only selected/unselected pairs with a candidate addition can improve
+            index1, index2, delta = find_first_swap(evaluator, budget=budget) # same swap as scanning generate_swap_bits
+            if delta > 0:
+                return move.swap_bits(sol[:], index1, index2)
+            continue
+        for chunk in pack_distinct_moves(sol, move_name, seen): # skips no-ops and repeated solutions, packed moves scored by opcode
+            if budget.expired():
                 return error_output # didn't have enough time to find a better solution
-            new_move: move.move_type = move.move_by_name(sol[:], move_input_tuple)
-
-            if get_remaining_capacity(dep_sizes, new_move[0], capacity) < 0:
-                continue # invalid solution, try next
-
-            if new_move[1] != "error": # plegal move
-                if evaluate_packs(pack_benefits, pack_dep, new_move[0]) > current_move_evaluation:
-                    return new_move
+            index, _ = first_improvement(chunk, evaluator) # moves that don't fit are skipped, sol isn't copied
+            if index >= 0:
+                return move.move_by_name(sol[:], chunk.get(index))
 
     return error_output # Couldn't find a better solution
 
 # Returns local optimum found in the available time (may not represent the real local optimum)
-def absolute_best_step(sol: list[bool], pack_benefits:list[int], dep_sizes:list[int], pack_dep:list[tuple[int, int]], capacity:int, neighborhood_names:list[str] = [], time_limit: float = TIME_LIMIT_DEFAULT, max_tries: int = 1000) -> move.move_type:
+# workers != 1: the segment neighborhoods are scanned on a worker pool while they're built (same move as the serial scan)
+def absolute_best_step(sol: list[bool], pack_benefits:list[int], dep_sizes:list[int], pack_dep:list[tuple[int, int]], capacity:int, neighborhood_names:list[str] = [], time_limit: float = TIME_LIMIT_DEFAULT, max_tries: int = 1000, budget: Budget | None = None, workers:int | None = WORKERS_DEFAULT) -> move.move_type:
     error_output: move.move_type = (sol, "error", -1)
-    current_move: move.move_type = error_output
-    current_move_evaluation: int = evaluate_packs(pack_benefits, pack_dep, sol)
-    start_time = time.time()
+    current_move: move.neighborhood_type = ("error", -1) # built into a move_type only when returned
+    evaluator: IncrementalEvaluator | None = None # built by the first neighborhood besides flip_bit
+    current_move_delta: int = 0 # benefit gained by current_move over sol
+    seen: set[int] = set() # effects already tried, shared by all neighborhoods
+    budget = get_budget(budget, time_limit)
     for move_name in neighborhood_names: # if neighborhood_names == []: return error_output
-        if time.time()-start_time >= time_limit:
-            return current_move # return better solution found until now
-        move_generator: move.neighborhood_generator_type = move.generate_move(sol, move_name)
-        for move_input_tuple in move_generator:
-            if time.time()-start_time >= time_limit:
-                return current_move # return better solution find until now
-            new_move: move.move_type = move.move_by_name(sol[:], move_input_tuple)
-
-            if get_remaining_capacity(dep_sizes, new_move[0], capacity) < 0:
-                continue # invalid solution, try next
-
-            if new_move[1] != "error": # plegal move
-                if evaluate_packs(pack_benefits, pack_dep, new_move[0]) > current_move_evaluation:
-                    current_move = new_move
-                    current_move_evaluation = evaluate_packs(pack_benefits, pack_dep, current_move[0])
-
-    if current_move_evaluation > evaluate_packs(pack_benefits, pack_dep, sol):
-        return current_move
+        if budget.expired():
+            break # return better solution found until now
+        if move_name == "flip_bit": # best flip comes from the maintained gains instead of n evaluations
+            best_dep, best_gain = get_flip_gain_tracker(sol, pack_benefits, dep_sizes, pack_dep, capacity).best_flip()
+            if best_gain > current_move_delta:
+                current_move = ("flip_bit", best_dep)
+                current_move_delta = best_gain
+            continue
+        if evaluator is None:
+            evaluator = IncrementalEvaluator(pack_benefits, dep_sizes, pack_dep, capacity, sol)
+        if move_name == "swap_bits": # only selected/unselected pairs with a candidate addition can improve
+            index1, index2, delta = find_best_swap(evaluator, current_move_delta, budget=budget)
+            if delta > current_move_delta:
+                current_move = ("swap_bits", index1, index2)
+                current_move_delta = delta
+            continue
+        if workers != 1:
+            found, current_move_delta = parallel_best_move(sol, pack_distinct_moves(sol, move_name, seen), evaluator, current_move_delta, workers, budget)
+            if found is not None:
+                current_move = found
+            continue
+        for chunk in pack_distinct_moves(sol, move_name, seen): # skips no-ops and repeated solutions, packed moves scored by opcode
+            if budget.expired():
+                break # return better solution find until now
+            index, current_move_delta = best_improvement(chunk, evaluator, current_move_delta) # moves that don't fit are skipped
+            if index >= 0:
+                current_move = chunk.get(index)
+
+    if current_move_delta > 0:
+        return move.move_by_name(sol[:], current_move)
     else:
         return error_output # Couldn't find a better solution
 
+# absolute_best_step on every core, same signature as the other heuristics (for heuristics_dict and the local searches)
+def parallel_absolute_best_step(sol: list[bool], pack_benefits:list[int], dep_sizes:list[int], pack_dep:list[tuple[int, int]], capacity:int, neighborhood_names:list[str] = [], time_limit: float = TIME_LIMIT_DEFAULT, max_tries: int = 1000, budget: Budget | None = None) -> move.move_type:
+    return absolute_best_step(sol, pack_benefits, dep_sizes, pack_dep, capacity, neighborhood_names, time_limit, max_tries, budget, workers=None)
+
 ''' Heuristic dictionary '''
 
 # 
 heuristics_dict:dict[str, heuristic_type] = {
     "random_best_step": random_best_step, 
     "first_best_step": first_best_step, 
-    "absolute_best_step": absolute_best_step
+    "absolute_best_step": absolute_best_step,
+    "parallel_absolute_best_step": parallel_absolute_best_step
 }
@@ -0,0 +1,117 @@
+# Python 3.13.4
+
+import heapq
+from auxiliary_functions import compile_instance, add_evaluation_count
+from incremental_evaluation import IncrementalEvaluator
+from instance import Instance
+
+''' Repair '''
+# Makes a solution that overfills the capacity feasible instead of throwing it away (GA offsprings, ILS perturbations)
+# Drop: removes the selected dep that loses the least benefit per unit of size until the solution fits
+#   loss[dep] = benefit of the complete packs that need dep; a removal breaks packs, so the other deps of those packs lose less
+# Fill: adds back, best benefit per unit of size first, the unselected deps that complete packs and still fit
+#   gain[dep] = benefit of the packs where dep is the only missing dependency; an addition can leave a pack missing one dep only
+# Both sides are lazy heaps: a changed loss/gain pushes a new entry, an entry that no longer matches the value is skipped
+# Everything runs on an IncrementalEvaluator, O(deg) per flip
+
+# Repairs the evaluator's solution in place -> deps flipped, in order (committed, the undo history is cleared)
+# refill=False only drops until the solution fits; loss: loss of every dep if the caller already has it
+def repair(evaluator:IncrementalEvaluator, refill:bool = True, loss:list[int] | None = None) -> list[int]:
+    flipped:list[int] = drop_until_fits(evaluator, loss)
+    if refill:
+        flipped += fill_completing_deps(evaluator)
+    evaluator.commit()
+    add_evaluation_count(len(flipped))
+    return flipped
+
+# Removes the selected deps with the worst loss / size until the solution fits -> removed deps
+def drop_until_fits(evaluator:IncrementalEvaluator, initial_loss:list[int] | None = None) -> list[int]:
+    if evaluator.get_remaining_capacity() >= 0:
+        return []
+    instance:Instance = evaluator.instance
+    sol:list[bool] = evaluator.sol
+    missing:list[int] = evaluator.missing
+    pack_benefits:tuple[int, ...] = instance.pack_benefits
+    pack_deps:tuple[tuple[int, ...], ...] = instance.pack_deps
+    dep_packs:tuple[tuple[int, ...], ...] = instance.dep_packs
+    dep_sizes:tuple[int, ...] = instance.dep_sizes
+
+    loss:dict[int, int] = {}
+    heap:list[tuple[float, int, int]] = [] # (loss / size, loss, dep) - removing a dep without size never helps
+    for dep, selected in enumerate(sol):
+        if selected and dep_sizes[dep] > 0:
+            loss[dep] = initial_loss[dep] if initial_loss is not None else sum(pack_benefits[pack] for pack in dep_packs[dep] if missing[pack] == 0)
+            heap.append((loss[dep] / dep_sizes[dep], loss[dep], dep))
+    heapq.heapify(heap)
+
+    removed:list[int] = []
+    while evaluator.get_remaining_capacity() < 0 and heap:
+        _, dep_loss, dep = heapq.heappop(heap)
+        if not sol[dep] or loss[dep] != dep_loss:
+            continue # stale entry
+        evaluator.flip(dep)
+        removed.append(dep)
+        for pack in dep_packs[dep]:
+            if missing[pack] != 1:
+                continue # wasn't complete before the removal
+            benefit:int = pack_benefits[pack]
+            for other in pack_deps[pack]:
+                if sol[other] and other in loss:
+                    loss[other] -= benefit
+                    heapq.heappush(heap, (loss[other] / dep_sizes[other], loss[other], other))
+    return removed
+
+# Adds the unselected deps that complete packs, best gain / size first, while they fit -> added deps
+def fill_completing_deps(evaluator:IncrementalEvaluator) -> list[int]:
+    instance:Instance = evaluator.instance
+    sol:list[bool] = evaluator.sol
+    missing:list[int] = evaluator.missing
+    pack_benefits:tuple[int, ...] = instance.pack_benefits
+    pack_deps:tuple[tuple[int, ...], ...] = instance.pack_deps
+    dep_packs:tuple[tuple[int, ...], ...] = instance.dep_packs
+    dep_sizes:tuple[int, ...] = instance.dep_sizes
+    free:int = evaluator.get_remaining_capacity()
+
+    gain:dict[int, int] = {}
+    for pack, pack_missing in enumerate(missing):
+        if pack_missing == 1:
+            dep:int = _missing_dep(pack_deps[pack], sol)
+            gain[dep] = gain.get(dep, 0) + pack_benefits[pack]
+    heap:list[tuple[float, int, int]] = [(_fill_key(dep_gain, dep_sizes[dep]), -dep_gain, dep) for dep, dep_gain in gain.items() if dep_sizes[dep] <= free]
+    heapq.heapify(heap)
+
+    added:list[int] = []
+    while heap:
+        _, negative_gain, dep = heapq.heappop(heap)
+        if sol[dep] or gain[dep] != -negative_gain or dep_sizes[dep] > free:
+            continue # stale entry, or too big (free only shrinks)
+        evaluator.flip(dep)
+        added.append(dep)
+        free -= dep_sizes[dep]
+        for pack in dep_packs[dep]:
+            if missing[pack] != 1:
+                continue # completed now, or still missing several deps
+            other:int = _missing_dep(pack_deps[pack], sol)
+            gain[other] = gain.get(other, 0) + pack_benefits[pack]
+            if dep_sizes[other] <= free:
+                heapq.heappush(heap, (_fill_key(gain[other], dep_sizes[other]), -gain[other], other))
+    return added
+
+# Heap key of an addition: largest gain per unit of size first, deps without size before everything
+def _fill_key(gain:int, size:int) -> float:
+    return -gain / size if size > 0 else float("-inf")
+
+# The one unselected dep of a pack that misses exactly one
+def _missing_dep(deps:tuple[int, ...], sol:list[bool]) -> int:
+    for dep in deps:
+        if not sol[dep]:
+            return dep
+    return -1
+
+''' Functions '''
+
+# Old signature version: repaired copy of sol
+def repair_solution(sol:list[bool], pack_benefits:list[int], dep_sizes:list[int], pack_dep:list[tuple[int, int]], capacity:int, refill:bool = True) -> list[bool]:
+    evaluator:IncrementalEvaluator = IncrementalEvaluator.from_instance(compile_instance(pack_benefits, dep_sizes, pack_dep, capacity), sol)
+    repair(evaluator, refill)
+    return evaluator.sol
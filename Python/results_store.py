@@ -0,0 +1,173 @@
+# Python 3.13.4
+
+import csv
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any
+
+DB_FILE_NAME: str = "results.sqlite"
+FLUSH_SIZE_DEFAULT: int = 50 # buffered rows written per transaction
+
+# Open stores by database path, one connection per process
+_stores: dict[Path, "ResultsStore"] = {}
+
+''' Results store '''
+
+# SQLite index of every experiment row, next to the .csv files of the same experiments
+# run_ids and seeds come from counter tables (O(1)) instead of re-reading the whole .csv on every run
+# The first time an experiment is used, its existing .csv is imported once so the counters continue its history
+# Rows are buffered and written in one transaction per flush; export_csv writes them back in the .csv layout
+class ResultsStore:
+    def __init__(self, output_dir:Path, db_file_name:str = DB_FILE_NAME, flush_size:int = FLUSH_SIZE_DEFAULT) -> None:
+        self.output_dir:Path = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.flush_size:int = flush_size
+        self.connection:sqlite3.Connection = sqlite3.connect(self.output_dir / db_file_name)
+        self._buffer:list[tuple[str, int | None, str | None, int | None, str]] = []
+        self._known_experiments:set[str] = set()
+        with self.connection:
+            self.connection.executescript("""
+                CREATE TABLE IF NOT EXISTS results (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    experiment TEXT NOT NULL,
+                    run_number INTEGER,
+                    instance_file TEXT,
+                    seed INTEGER,
+                    row TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS results_experiment_instance_seed ON results (experiment, instance_file, seed);
+                CREATE TABLE IF NOT EXISTS experiments (
+                    experiment TEXT PRIMARY KEY,
+                    next_run_id INTEGER NOT NULL,
+                    fieldnames TEXT
+                );
+                CREATE TABLE IF NOT EXISTS seeds (
+                    experiment TEXT NOT NULL,
+                    instance_file TEXT NOT NULL,
+                    next_seed INTEGER NOT NULL,
+                    PRIMARY KEY (experiment, instance_file)
+                );
+            """)
+
+    # Reserves and returns the next run_id number of experiment
+    def next_run_id(self, experiment:str) -> int:
+        self._prepare(experiment)
+        with self.connection:
+            run_id:int = self.connection.execute("SELECT next_run_id FROM experiments WHERE experiment = ?", (experiment,)).fetchone()[0]
+            self.connection.execute("UPDATE experiments SET next_run_id = ? WHERE experiment = ?", (run_id + 1, experiment))
+        return run_id
+
+    # Reserves and returns the next seed of instance_file in experiment
+    def next_seed(self, experiment:str, instance_file:str) -> int:
+        self._prepare(experiment)
+        with self.connection:
+            found = self.connection.execute("SELECT next_seed FROM seeds WHERE experiment = ? AND instance_file = ?", (experiment, instance_file)).fetchone()
+            seed:int = found[0] if found else 0
+            self.connection.execute("INSERT OR REPLACE INTO seeds (experiment, instance_file, next_seed) VALUES (?, ?, ?)", (experiment, instance_file, seed + 1))
+        return seed
+
+    # Buffers one result row (same dict append_to_csv receives), written on the next flush
+    def add(self, experiment:str, row:dict[str, Any]) -> None:
+        self._prepare(experiment)
+        self._buffer.append((experiment, _get_run_number(row), row.get("instance_file"), _get_seed(row), json.dumps(row, default=str)))
+        if len(self._buffer) >= self.flush_size:
+            self.flush()
+
+    # Writes the buffered rows and moves the counters past them, all in one transaction
+    def flush(self) -> None:
+        if not self._buffer:
+            return
+        with self.connection:
+            self._insert_rows(self._buffer)
+        self._buffer.clear()
+
+    # Every row of experiment (optionally of one instance), in insertion order
+    def get_rows(self, experiment:str, instance_file:str | None = None) -> list[dict[str, Any]]:
+        self.flush()
+        if instance_file is None:
+            cursor = self.connection.execute("SELECT row FROM results WHERE experiment = ? ORDER BY id", (experiment,))
+        else:
+            cursor = self.connection.execute("SELECT row FROM results WHERE experiment = ? AND instance_file = ? ORDER BY id", (experiment, instance_file))
+        return [json.loads(row) for (row,) in cursor]
+
+    # Writes experiment to a .csv with the same columns append_to_csv would have used, returns the file
+    def export_csv(self, experiment:str, csv_file:Path | None = None) -> Path:
+        self._prepare(experiment)
+        rows:list[dict[str, Any]] = self.get_rows(experiment)
+        csv_file = csv_file if csv_file is not None else self.output_dir / f"{experiment}.csv"
+        found = self.connection.execute("SELECT fieldnames FROM experiments WHERE experiment = ?", (experiment,)).fetchone()
+        fieldnames:list[str] = json.loads(found[0]) if found and found[0] else (list(rows[0].keys()) if rows else [])
+        with open(csv_file, "w", newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(rows)
+        return csv_file
+
+    def close(self) -> None:
+        self.flush()
+        self.connection.close()
+        _stores.pop(self.output_dir / DB_FILE_NAME, None)
+
+    # First use of experiment: imports its .csv (if the store doesn't know it yet) so ids and seeds continue from there
+    def _prepare(self, experiment:str) -> None:
+        if experiment in self._known_experiments:
+            return
+        self._known_experiments.add(experiment)
+        if self.connection.execute("SELECT 1 FROM experiments WHERE experiment = ?", (experiment,)).fetchone():
+            return
+        csv_file:Path = self.output_dir / f"{experiment}.csv"
+        rows:list[dict[str, str]] = []
+        fieldnames:list[str] | None = None
+        if csv_file.exists():
+            with open(csv_file, "r", newline='') as f:
+                reader = csv.DictReader(f)
+                rows = list(reader)
+                fieldnames = list(reader.fieldnames) if reader.fieldnames else None
+        with self.connection:
+            self.connection.execute("INSERT INTO experiments (experiment, next_run_id, fieldnames) VALUES (?, 0, ?)",
+                                    (experiment, json.dumps(fieldnames) if fieldnames else None))
+            self._insert_rows([(experiment, _get_run_number(row), row.get("instance_file"), _get_seed(row), json.dumps(row)) for row in rows])
+
+    def _insert_rows(self, rows:list[tuple[str, int | None, str | None, int | None, str]]) -> None:
+        self.connection.executemany("INSERT INTO results (experiment, run_number, instance_file, seed, row) VALUES (?, ?, ?, ?, ?)", rows)
+        next_run_ids:dict[str, int] = {}
+        next_seeds:dict[tuple[str, str], int] = {}
+        first_rows:dict[str, str] = {}
+        for experiment, run_number, instance_file, seed, row in rows:
+            first_rows.setdefault(experiment, row)
+            if run_number is not None:
+                next_run_ids[experiment] = max(next_run_ids.get(experiment, 0), run_number + 1)
+            if seed is not None and instance_file is not None:
+                next_seeds[(experiment, instance_file)] = max(next_seeds.get((experiment, instance_file), 0), seed + 1)
+        self.connection.executemany("UPDATE experiments SET next_run_id = MAX(next_run_id, ?) WHERE experiment = ?",
+                                    [(run_id, experiment) for experiment, run_id in next_run_ids.items()])
+        self.connection.executemany("""INSERT INTO seeds (experiment, instance_file, next_seed) VALUES (?, ?, ?)
+                                       ON CONFLICT (experiment, instance_file) DO UPDATE SET next_seed = MAX(next_seed, excluded.next_seed)""",
+                                    [(experiment, instance_file, seed) for (experiment, instance_file), seed in next_seeds.items()])
+        self.connection.executemany("UPDATE experiments SET fieldnames = ? WHERE experiment = ? AND fieldnames IS NULL",
+                                    [(json.dumps(list(json.loads(row).keys())), experiment) for experiment, row in first_rows.items()])
+
+''' Functions '''
+
+# Store of output_dir, opened only the first time
+def get_results_store(output_dir:Path) -> ResultsStore:
+    db_file:Path = Path(output_dir) / DB_FILE_NAME
+    if db_file not in _stores:
+        _stores[db_file] = ResultsStore(output_dir)
+    return _stores[db_file]
+
+# "simulated_annealing_12" -> 12, None when the row has no numbered run_id
+def _get_run_number(row:dict[str, Any]) -> int | None:
+    try:
+        return int(str(row.get("run_id", "")).split("_")[-1])
+    except ValueError:
+        return None
+
+# run_seed (newer experiments) or seed, same as aux.get_next_seed_per_file_name
+def _get_seed(row:dict[str, Any]) -> int | None:
+    value = row.get("run_seed") if row.get("run_seed") not in (None, "") else row.get("seed")
+    try:
+        return int(value) if value not in (None, "") else None
+    except (ValueError, TypeError):
+        return None
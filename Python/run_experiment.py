@@ -1,12 +1,15 @@
 # Python 3.13.4
 # -*- coding: utf-8 -*-
 
+import os
 import random
 import time
 import csv
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from itertools import product
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 import move
 import first_solution as fs
@@ -16,11 +19,44 @@ import refinement_heuristic as rh
 import simulated_annealing as sa
 import genetic_algorithm as ga
 import iterated_local_search as ils
+import tabu_search as ts
+try:
+    import batch_annealing # needs numpy
+except ImportError: # numpy not installed -> only the serial simulated annealing runner
+    batch_annealing = None
+import results_store
+import instance_cache
 
 # Configuration
 OUTPUT_DIR: Path = Path("output/experiments")
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+SERIAL_ANNEALING_NEIGHBORHOODS:str = ",".join(move.moves_dict) # simulated_annealing draws from every neighborhood
+BATCH_ANNEALING_NEIGHBORHOODS:str = "flip_bit,swap_bits" # the only proposals of batch_annealing.ChainBatch
     
+''' Results '''
+# run_ids and seeds are reserved in the results store (O(1)) instead of re-reading the .csv on every run
+# Only the new rows of a run are appended to the .csv, and they are indexed in the store too
+
+# Reserves the next run_id number of experiment_type
+def get_next_run_id(experiment_type:str) -> int:
+    return results_store.get_results_store(OUTPUT_DIR).next_run_id(experiment_type)
+
+# Reserves the next seed of file_name in experiment_type
+def get_next_seed(experiment_type:str, file_name:str) -> int:
+    return results_store.get_results_store(OUTPUT_DIR).next_seed(experiment_type, file_name)
+
+# Appends new_results to <experiment_type>.csv and to the results store
+def save_results(experiment_type:str, new_results:list[dict[str, Any]]) -> None:
+    if not new_results:
+        return
+    store: results_store.ResultsStore = results_store.get_results_store(OUTPUT_DIR)
+    for row in new_results: # before the .csv append, so a first use imports the .csv without these rows
+        store.add(experiment_type, row)
+    aux.append_to_csv(experiment_type, new_results, OUTPUT_DIR)
+    store.flush()
+
+''' Experiments '''
+
 # Run all constructive method experiments and save to .csv -> First report
 def run_constructive_experiment(files:list[str], files_to_run: list[int]) -> None:
     for file_id in files_to_run:
@@ -30,7 +66,7 @@ def run_constructive_experiment(files:list[str], files_to_run: list[int]) -> Non
         pack_benefits, dep_sizes, pack_dep, capacity = aux.load_instance(files[file_id])
         
         results: list[dict[str, Any]] = []
-        run_id: int = aux.get_next_run_id_number("constructive", OUTPUT_DIR)
+        run_id: int = get_next_run_id("constructive")
         
         # Ignored for now
         deterministic_methods: list[tuple[str, dict[str, bool]]] = [
@@ -51,6 +87,7 @@ def run_constructive_experiment(files:list[str], files_to_run: list[int]) -> Non
                 elapsed: float = time.time() - start_time
                 benefit: int = aux.evaluate_packs(pack_benefits, pack_dep, solution)
                 evals: int = aux.get_evaluation_count()
+                hits: int = aux.get_fitness_cache_hits()
                 capacity_used: int = capacity - aux.get_remaining_capacity(dep_sizes, solution, capacity)
                 
                 
@@ -68,6 +105,7 @@ def run_constructive_experiment(files:list[str], files_to_run: list[int]) -> Non
                     "benefit": benefit,
                     "time": elapsed,
                     "evaluations": evals,
+                    "cache_hits": hits,
                     "capacity_used": capacity_used,
                     "timestamp": datetime.now().isoformat()
                 })
@@ -96,6 +134,7 @@ def run_constructive_experiment(files:list[str], files_to_run: list[int]) -> Non
                     elapsed = time.time() - start_time
                     benefit = aux.evaluate_packs(pack_benefits, pack_dep, solution)
                     evals = aux.get_evaluation_count()
+                    hits = aux.get_fitness_cache_hits()
                     capacity_used = capacity - aux.get_remaining_capacity(dep_sizes, solution, capacity)
                     
 
@@ -114,6 +153,7 @@ def run_constructive_experiment(files:list[str], files_to_run: list[int]) -> Non
                         "benefit": benefit,
                         "time": elapsed,
                         "evaluations": evals,
+                        "cache_hits": hits,
                         "capacity_used": capacity_used,
                         "timestamp": datetime.now().isoformat()
                     })
@@ -121,7 +161,7 @@ def run_constructive_experiment(files:list[str], files_to_run: list[int]) -> Non
                 print(f"    Completed 30 runs for {method_name}")
         
         # Save to .csv
-        aux.append_to_csv("constructive", results, OUTPUT_DIR)
+        save_results("constructive", results)
 
     print(f" OK Constructive experiments complete! Saved to constructive.csv\n")
 
@@ -132,7 +172,7 @@ def run_local_search_experiment(files:list[str], files_to_run: list[int], runs_p
         pack_benefits, dep_sizes, pack_dep, capacity = aux.load_instance(files[file_id])
         
         results: list[dict[str, Any]] = []
-        run_id: int = aux.get_next_run_id_number("local_search", OUTPUT_DIR)
+        run_id: int = get_next_run_id("local_search")
         
         # Configuration: 2 local search * 2 setups each * 30 runs
         experiments: list[dict[str, Any]] = [
@@ -221,6 +261,7 @@ def run_local_search_experiment(files:list[str], files_to_run: list[int], runs_p
                 
                 final_benefit: int = aux.evaluate_packs(pack_benefits, pack_dep, final_move[0])
                 evals: int = aux.get_evaluation_count()
+                hits: int = aux.get_fitness_cache_hits()
                 improvement: int = final_benefit - initial_benefit
                 improvement_pct: float = 100.0 * improvement / initial_benefit if initial_benefit > 0 else 0.0
                 capacity_ramaining:int = aux.get_remaining_capacity(dep_sizes, final_move[0], capacity)
@@ -240,13 +281,14 @@ def run_local_search_experiment(files:list[str], files_to_run: list[int], runs_p
                     "capacity_remaining": capacity_ramaining,
                     "time": elapsed,
                     "evaluations": evals,
+                    "cache_hits": hits,
                     "timestamp": datetime.now().isoformat()
                 })
                 run_id += 1
             print(f"    Completed {runs_per_file} runs for {exp['ls_method']}")
         
         # Save to .csv
-        aux.append_to_csv("local_search", results, OUTPUT_DIR)
+        save_results("local_search", results)
 
     print(f" OK Local search experiments complete! Saved to local_search.csv\n")
 
@@ -258,6 +300,7 @@ def run_simulated_annealing_experiment(files:list[str], files_to_run:list[int],
     print("Starting simulated annealing experiments...")
     
     run_with_initial_temp:bool = False # if false: will use useful_temp found in first run per file-parameters
+    temperature_method:str = sa.TEMPERATURE_ESTIMATOR_DEFAULT # "estimate" is cached per instance, "search" takes up to half the run
     
     # Parameters to be tested:
 #    test_alpha:list[float] = [0.95, 0.75]
@@ -276,9 +319,6 @@ def run_simulated_annealing_experiment(files:list[str], files_to_run:list[int],
         pack_benefits, dep_sizes, pack_dep, capacity = aux.load_instance(files[file_id])
         
         results: list[dict[str, Any]] = [] # for each file
-        run_id: int = aux.get_next_run_id_number("simulated_annealing", OUTPUT_DIR)
-        seed: int = aux.get_next_seed_per_file_name("simulated_annealing", files[file_id], OUTPUT_DIR)
-        
         for alpha in test_alpha:
             for beta in test_beta:
                 for gamma in test_gamma:
@@ -290,15 +330,16 @@ def run_simulated_annealing_experiment(files:list[str], files_to_run:list[int],
                             inner_start_time:float = time.time()
                             if outer_time_limit < time.time() - outer_start_time or inner_time_limit < time.time() -  inner_start_time: break
                             
-                            run_id: int = aux.get_next_run_id_number("simulated_annealing", OUTPUT_DIR)
-                            run_seed: int = aux.get_next_seed_per_file_name("simulated_annealing", files[file_id], OUTPUT_DIR)
+                            run_id: int = get_next_run_id("simulated_annealing")
+                            run_seed: int = get_next_seed("simulated_annealing", files[file_id])
                             random.seed(run_seed)
                             aux.reset_evaluation_count()
                         
                             first_sol = fs.create_randomic_solution(pack_benefits, dep_sizes, pack_dep, capacity, [])
 
                             if run_with_initial_temp or run == 0:
-                                (useful_temp, starting_temperature, beta, gamma) = sa.find_initial_temperature(
+                                (useful_temp, starting_temperature, beta, gamma) = sa.get_initial_temperature(
+                                        temperature_method,
                                         sol = first_sol,
                                         pack_benefits = pack_benefits,
                                         dep_sizes = dep_sizes,
@@ -307,7 +348,7 @@ def run_simulated_annealing_experiment(files:list[str], files_to_run:list[int],
                                         beta = beta,
                                         gamma = gamma,
                                         initial_temperature = initial_temp,
-                                        time_limit = (inner_time_limit - time.time() + inner_start_time)/2) # half time for finding initial temp
+                                        time_limit = (inner_time_limit - time.time() + inner_start_time)/2) # at most half time for finding initial temp
 
                             (solution, benefit, initial_temperature, final_temperature, alpha) = sa.simulated_annealing(
                                 sol = first_sol,
@@ -322,6 +363,7 @@ def run_simulated_annealing_experiment(files:list[str], files_to_run:list[int],
                             
                             elapsed: float = time.time() - inner_start_time # takes find initial temp into account, since it's done for every run
                             evals: int = aux.get_evaluation_count()
+                            hits: int = aux.get_fitness_cache_hits()
                             capacity_used: int = capacity - aux.get_remaining_capacity(dep_sizes, solution, capacity)
                             
                             results.append({
@@ -342,20 +384,108 @@ def run_simulated_annealing_experiment(files:list[str], files_to_run:list[int],
                                 "start_time": inner_start_time,
                                 "time": elapsed,
                                 "evaluations": evals,
+                                "cache_hits": hits,
                                 "capacity_used": capacity_used,
+                                "mode": "serial",
+                                "chains": 1,
+                                "neighborhoods": SERIAL_ANNEALING_NEIGHBORHOODS,
+                                "batch_evaluations": evals,
+                                "batch_cache_hits": hits,
                                 "timestamp": datetime.now().isoformat()})
 
                             print(f"  Run_id:{run_id} Seed: {run_seed} run for {files[file_id]} in {elapsed/60}min - Benefit: {benefit}")
                             print(f"\tAlpha={alpha}, Beta={beta}, Gamma={gamma}, Start_temp={initial_temp}")
                             run_id += 1
 
-                            # Save to .csv
-                            aux.append_to_csv("simulated_annealing", results, OUTPUT_DIR)
+                            # Save this run only (results keeps growing)
+                            save_results("simulated_annealing", [results[-1]])
 
 
 
         print(f" OK Simulated annealing experiments complete! Saved to simulated_annealing.csv\n")
 
+# Same grid and .csv as run_simulated_annealing_experiment, but the runs_per_file runs of a parameter set are chains of one
+# batch_annealing.multi_chain_simulated_annealing call: the temperature is found once (first run's solution) and every
+# chain gets the time left. The rows are not serial runs, they say so in their columns:
+# mode "batch", chains: chains of the call, neighborhoods: only flip_bit and swap_bits proposals
+# benefit / solution: that chain's best; time: wall time of the whole batch (temperature search included)
+# evaluations: that chain's own (every step evaluates one move per chain, so it's exact), cache_hits 0 (chains don't use the fitness cache)
+# batch_evaluations / batch_cache_hits: the whole call's, shared temperature search included
+def run_batch_simulated_annealing_experiment(files:list[str], files_to_run:list[int], outer_time_limit:float, inner_time_limit:float, runs_per_file:int) -> None:
+    if batch_annealing is None:
+        print("numpy not installed, running the serial simulated annealing experiments")
+        run_simulated_annealing_experiment(files, files_to_run, outer_time_limit, inner_time_limit, runs_per_file)
+        return
+    outer_start_time:float = time.time()
+    print("Starting batched simulated annealing experiments...")
+    test_alpha:list[float] = [0.9]
+    test_beta:list[float] = [1.5]
+    test_gamma:list[float] = [0.9, 0.8]
+    test_initial_temp:list[int] = [1000, 1500]
+
+    for file_id in files_to_run:
+        if outer_time_limit < time.time() - outer_start_time: break
+        if file_id >= len(files): break
+        pack_benefits, dep_sizes, pack_dep, capacity = aux.load_instance(files[file_id])
+        for alpha, beta, gamma, initial_temp in product(test_alpha, test_beta, test_gamma, test_initial_temp):
+            if outer_time_limit < time.time() - outer_start_time: break
+            inner_start_time:float = time.time()
+            aux.reset_evaluation_count()
+            run_ids:list[int] = [get_next_run_id("simulated_annealing") for _ in range(runs_per_file)]
+            run_seeds:list[int] = [get_next_seed("simulated_annealing", files[file_id]) for _ in range(runs_per_file)]
+            first_sols:list[list[bool]] = []
+            for run_seed in run_seeds: # each chain starts where the serial run with its seed would
+                random.seed(run_seed)
+                first_sols.append(fs.create_randomic_solution(pack_benefits, dep_sizes, pack_dep, capacity, []))
+            random.seed(run_seeds[0])
+            (useful_temp, starting_temperature, beta, gamma) = sa.get_initial_temperature(
+                    sa.TEMPERATURE_ESTIMATOR_DEFAULT,
+                    sol = first_sols[0], pack_benefits = pack_benefits, dep_sizes = dep_sizes, pack_dep = pack_dep, capacity = capacity,
+                    beta = beta, gamma = gamma, initial_temperature = initial_temp,
+                    time_limit = inner_time_limit/2) # at most half time for finding initial temp
+            temperature_evals:int = aux.get_evaluation_count()
+            chains = batch_annealing.multi_chain_simulated_annealing(
+                    first_sols, pack_benefits, dep_sizes, pack_dep, capacity,
+                    initial_temperature = useful_temp, alpha = alpha,
+                    time_limit = inner_time_limit - time.time() + inner_start_time, seed = run_seeds[0])
+            elapsed:float = time.time() - inner_start_time
+            batch_evals:int = aux.get_evaluation_count()
+            chain_evals:int = (batch_evals - temperature_evals) // runs_per_file
+
+            results:list[dict[str, Any]] = []
+            for run_id, run_seed, (solution, benefit, initial_temperature, final_temperature, alpha) in zip(run_ids, run_seeds, chains):
+                results.append({
+                    "run_id": f"simulated_annealing_{run_id}",
+                    "instance_file": files[file_id],
+                    "run_seed": run_seed,
+                    "solution": aux.list_bool_to_int(solution),
+                    "benefit": benefit,
+                    "first_solution": "random",
+                    "biggest_first": "",
+                    "starting_find_temp": starting_temperature,
+                    "initial_temp": initial_temperature,
+                    "final_temp": final_temperature,
+                    "alpha": alpha,
+                    "beta": beta,
+                    "gamma": gamma,
+                    "run_finding_initial_temp": False,
+                    "start_time": inner_start_time,
+                    "time": elapsed,
+                    "evaluations": chain_evals,
+                    "cache_hits": 0,
+                    "capacity_used": capacity - aux.get_remaining_capacity(dep_sizes, solution, capacity),
+                    "mode": "batch",
+                    "chains": runs_per_file,
+                    "neighborhoods": BATCH_ANNEALING_NEIGHBORHOODS,
+                    "batch_evaluations": batch_evals,
+                    "batch_cache_hits": aux.get_fitness_cache_hits(),
+                    "timestamp": datetime.now().isoformat()})
+            print(f"  Run_ids:{run_ids[0]}-{run_ids[-1]} run for {files[file_id]} in {elapsed/60}min - Best benefit: {max(row['benefit'] for row in results)}")
+            print(f"\tAlpha={alpha}, Beta={beta}, Gamma={gamma}, Start_temp={initial_temp}, Chains={runs_per_file}")
+            save_results("simulated_annealing", results)
+
+    print(f" OK Batched simulated annealing experiments complete! Saved to simulated_annealing.csv (mode batch)\n")
+
 
 #
 def run_genetic_algorithm_experiment(files:list[str], files_to_run:list[int], outer_time_limit:float, inner_time_limit:float, runs_per_file:int, verbose:bool = False) -> None:
@@ -368,8 +498,8 @@ def run_genetic_algorithm_experiment(files:list[str], files_to_run:list[int], ou
         pack_benefits, dep_sizes, pack_dep, capacity = aux.load_instance(files[file_id])
         
         results: list[dict[str, Any]] = [] # for each file
-        run_id: int = aux.get_next_run_id_number("genetic_algorithm", OUTPUT_DIR)
-        seed: int = aux.get_next_seed_per_file_name("genetic_algorithm", files[file_id], OUTPUT_DIR)
+        run_id: int = get_next_run_id("genetic_algorithm")
+        seed: int = get_next_seed("genetic_algorithm", files[file_id])
             
         for run in range(runs_per_file):
             inner_start_time:float = time.time()
@@ -394,6 +524,7 @@ def run_genetic_algorithm_experiment(files:list[str], files_to_run:list[int], ou
             
             elapsed: float = time.time() - inner_start_time # takes find initial temp into account, since it's done for every run
             evals: int = aux.get_evaluation_count()
+            hits: int = aux.get_fitness_cache_hits()
             capacity_used: int = capacity - aux.get_remaining_capacity(dep_sizes, solution, capacity)
             
             results.append({
@@ -416,6 +547,7 @@ def run_genetic_algorithm_experiment(files:list[str], files_to_run:list[int], ou
                 "start_time": inner_start_time,
                 "time": elapsed,
                 "evaluations": evals,
+                "cache_hits": hits,
                 "capacity_used": capacity_used,
                 "timestamp": datetime.now().isoformat()})
 
@@ -423,7 +555,7 @@ def run_genetic_algorithm_experiment(files:list[str], files_to_run:list[int], ou
             run_id += 1
 
         # Save to .csv
-        aux.append_to_csv("genetic_algorithm", results, OUTPUT_DIR)
+        save_results("genetic_algorithm", results)
 
         print(f" OK Genetic algorithm experiments complete! Saved to genetic_algorithm.csv\n")
 
@@ -449,9 +581,6 @@ def run_iterated_local_search(files:list[str], files_to_run:list[int], outer_tim
         pack_benefits, dep_sizes, pack_dep, capacity = aux.load_instance(files[file_id])
         
         results: list[dict[str, Any]] = [] # for each file
-        run_id: int = aux.get_next_run_id_number("iterated_local_search", OUTPUT_DIR)
-        seed: int = aux.get_next_seed_per_file_name("iterated_local_search", files[file_id], OUTPUT_DIR)
-        
         for first_sol_method in test_constructive_methods:
             for param in test_constructive_params:
                 for perturbation in test_perturbation_moves:
@@ -465,8 +594,8 @@ def run_iterated_local_search(files:list[str], files_to_run:list[int], outer_tim
                                             inner_start_time:float = time.time()
                                             if outer_time_limit < time.time() - outer_start_time or inner_time_limit < time.time() -  inner_start_time: break
                                             
-                                            run_id: int = aux.get_next_run_id_number("iterated_local_search", OUTPUT_DIR)
-                                            run_seed: int = aux.get_next_seed_per_file_name("iterated_local_search", files[file_id], OUTPUT_DIR)
+                                            run_id: int = get_next_run_id("iterated_local_search")
+                                            run_seed: int = get_next_seed("iterated_local_search", files[file_id])
                                             random.seed(run_seed)
                                             aux.reset_evaluation_count()
                                         
@@ -491,6 +620,7 @@ def run_iterated_local_search(files:list[str], files_to_run:list[int], outer_tim
                                             benefit = aux.evaluate_packs(pack_benefits, pack_dep, solution[0])
                                             elapsed: float = time.time() - inner_start_time # takes find initial temp into account, since it's done for every run
                                             evals: int = aux.get_evaluation_count()
+                                            hits: int = aux.get_fitness_cache_hits()
                                             capacity_used: int = capacity - aux.get_remaining_capacity(dep_sizes, solution[0], capacity)
                                             
                                             # Extract function names from ls_method list for CSV storage
@@ -513,6 +643,7 @@ def run_iterated_local_search(files:list[str], files_to_run:list[int], outer_tim
                                                 "start_time": inner_start_time,
                                                 "time": elapsed,
                                                 "evaluations": evals,
+                                                "cache_hits": hits,
                                                 "capacity_used": capacity_used,
                                                 "timestamp": datetime.now().isoformat()})
 
@@ -520,10 +651,399 @@ def run_iterated_local_search(files:list[str], files_to_run:list[int], outer_tim
                                             print(f"\tFirst solution: {first_sol_method}, LS methods: {ls_method_names}, ILS tries: {ils_max_tries}, LS tries: {ls_max_tries}")
                                             run_id += 1
 
-                                            # Save to .csv
-                                            aux.append_to_csv("iterated_local_search", results, OUTPUT_DIR)
-
-        # Save to .csv
-        aux.append_to_csv("iterated_local_search", results, OUTPUT_DIR)
+                                            # Save this run only (results keeps growing)
+                                            save_results("iterated_local_search", [results[-1]])
 
     print(f" OK Iterated local search experiments complete! Saved to iterated_local_search.csv\n")
+
+
+# 
+def run_tabu_search_experiment(files:list[str], files_to_run:list[int], outer_time_limit:float, inner_time_limit:float, runs_per_file:int) -> None:
+    outer_start_time:float = time.time()
+    print("Starting tabu search experiments...")
+
+    # Parameters to be tested:
+    test_first_solutions:list[str] = ["create_pack_benefit_greedy_solution", "create_randomic_solution"]
+    test_tenures:list[tuple[int, int]] = [(ts.TENURE_DEFAULT, ts.TENURE_RANDOM_DEFAULT), (15, 15)] # (tenure, tenure_random)
+    test_frequency_weights:list[float] = [0.0, 0.5]
+
+    for file_id in files_to_run:
+        if outer_time_limit < time.time() - outer_start_time: break
+        if file_id >= len(files): break
+
+        pack_benefits, dep_sizes, pack_dep, capacity = aux.load_instance(files[file_id])
+
+        results: list[dict[str, Any]] = [] # for each file
+        for first_sol_method, (tenure, tenure_random), frequency_weight in product(test_first_solutions, test_tenures, test_frequency_weights):
+            for run in range(runs_per_file):
+                inner_start_time:float = time.time()
+                if outer_time_limit < time.time() - outer_start_time: break
+
+                run_id: int = get_next_run_id("tabu_search")
+                run_seed: int = get_next_seed("tabu_search", files[file_id])
+                random.seed(run_seed)
+                aux.reset_evaluation_count()
+
+                first_sol: list[bool] = fs.create_first_solution(first_sol_method, pack_benefits, dep_sizes, pack_dep, capacity)
+                initial_benefit: int = aux.evaluate_packs(pack_benefits, pack_dep, first_sol)
+                solution, benefit, moves = ts.tabu_search(first_sol, pack_benefits, dep_sizes, pack_dep, capacity,
+                                                          tenure=tenure, tenure_random=tenure_random, frequency_weight=frequency_weight,
+                                                          time_limit=inner_time_limit - time.time() + inner_start_time)
+
+                elapsed: float = time.time() - inner_start_time
+                results.append({
+                    "run_id": f"tabu_search_{run_id}",
+                    "instance_file": files[file_id],
+                    "run_seed": run_seed,
+                    "solution": aux.list_bool_to_int(solution),
+                    "benefit": benefit,
+                    "first_solution": first_sol_method,
+                    "initial_benefit": initial_benefit,
+                    "tenure": tenure,
+                    "tenure_random": tenure_random,
+                    "frequency_weight": frequency_weight,
+                    "max_tries": ts.get_max_tries(len(dep_sizes)),
+                    "moves": moves,
+                    "moves_per_second": moves / elapsed if elapsed > 0 else 0.0,
+                    "start_time": inner_start_time,
+                    "time": elapsed,
+                    "evaluations": aux.get_evaluation_count(),
+                    "cache_hits": aux.get_fitness_cache_hits(),
+                    "capacity_used": capacity - aux.get_remaining_capacity(dep_sizes, solution, capacity),
+                    "timestamp": datetime.now().isoformat()})
+
+                print(f"  Run_id:{run_id} Seed: {run_seed} run for {files[file_id]} in {elapsed/60:.2f}min - Benefit: {benefit} ({moves} moves)")
+
+                # Save this run only (results keeps growing)
+                save_results("tabu_search", [results[-1]])
+
+    print(f" OK Tabu search experiments complete! Saved to tabu_search.csv\n")
+
+
+''' Parallel runner '''
+# Every (instance, configuration, seed) run is independent, so the grid is expanded into job dicts and run on a process pool
+# Each job seeds its own RNG and resets its own evaluation counter (both are per process), so a job gives the same row
+# whether it runs alone or in a pool. run_ids and seeds are reserved in the results store, up front, when the grid is expanded.
+# Results come back in job order and are appended to the same .csv files, with the same columns, as the serial runners.
+
+WORKERS_DEFAULT: int | None = None # None -> os.cpu_count()
+
+# Runs jobs on `workers` processes (1 -> in this process) and returns their result rows in job order
+# deadline (time.time() value) skips the jobs that haven't started by then, like outer_time_limit does in the serial runners
+def run_jobs(jobs:list[dict[str, Any]], workers:int | None = WORKERS_DEFAULT, deadline:float = float("inf")) -> list[dict[str, Any]]:
+    for job in jobs:
+        job["deadline"] = deadline
+    if workers == 1 or len(jobs) <= 1:
+        rows: list[dict[str, Any] | None] = [run_job(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            rows = list(executor.map(run_job, jobs))
+    return [row for row in rows if row is not None]
+
+# Expands the grid of experiment_type, runs it in parallel and appends the rows to <experiment_type>.csv
+def run_parallel_experiment(experiment_type:str, files:list[str], files_to_run:list[int], runs_per_file:int, inner_time_limit:float = 30.0, outer_time_limit:float = float("inf"), workers:int | None = WORKERS_DEFAULT) -> list[dict[str, Any]]:
+    if experiment_type not in job_expanders_dict:
+        raise ValueError(f"Unknown experiment type: {experiment_type}. Available: {list(job_expanders_dict.keys())}")
+    start_time: float = time.time()
+    jobs: list[dict[str, Any]] = job_expanders_dict[experiment_type](files, files_to_run, runs_per_file, inner_time_limit)
+    instance_cache.convert_instances(sorted({job["instance_file"] for job in jobs})) # workers only map the binary sidecars
+    print(f"Starting {experiment_type} experiments: {len(jobs)} runs on {workers or os.cpu_count()} workers...")
+    results: list[dict[str, Any]] = run_jobs(jobs, workers, start_time + outer_time_limit)
+    save_results(experiment_type, results)
+    print(f" OK {experiment_type} experiments complete! {len(results)} runs saved to {experiment_type}.csv\n")
+    return results
+
+# Runs one job in the current process, None if its deadline already passed
+def run_job(job:dict[str, Any]) -> dict[str, Any] | None:
+    if time.time() >= job["deadline"]:
+        return None
+    pack_benefits, dep_sizes, pack_dep, capacity = aux.load_instance(job["instance_file"])
+    random.seed(job["run_seed"])
+    aux.reset_evaluation_count()
+    return job_runners_dict[job["experiment"]](job, pack_benefits, dep_sizes, pack_dep, capacity)
+
+''' Job expansion '''
+# One dict per run: experiment, run_id, instance_file, run_seed, time_limit and the configuration of the run
+
+# Same 4 configurations as run_local_search_experiment, seeds 0..runs_per_file-1 for every file
+def expand_local_search_jobs(files:list[str], files_to_run:list[int], runs_per_file:int, inner_time_limit:float = 30.0) -> list[dict[str, Any]]:
+    configurations: list[tuple[str, list[str], list[str]]] = [ # (ls_method, refinement heuristics, neighborhoods)
+        ("hill_climbing", ["random_best_step"], ["flip_bit", "swap_bits"]),
+        ("hill_climbing", ["first_best_step"], ["flip_bit"]),
+        ("variable_neighborhood_descent", ["random_best_step", "first_best_step"], ["flip_bit", "swap_bits"]),
+        ("variable_neighborhood_descent", ["absolute_best_step"], ["flip_bit"])
+    ]
+    jobs: list[dict[str, Any]] = []
+    for file_id in files_to_run:
+        if file_id >= len(files): break
+        for ls_method, refinement_names, neighborhoods in configurations:
+            for seed in range(runs_per_file):
+                jobs.append({"experiment": "local_search", "run_id": get_next_run_id("local_search"), "instance_file": files[file_id], "run_seed": seed, "time_limit": inner_time_limit,
+                             "ls_method": ls_method, "refinement_names": refinement_names, "neighborhoods": neighborhoods})
+    return jobs
+
+# Same parameter grid as run_simulated_annealing_experiment
+# Every job finds its own initial temperature (run_finding_initial_temp=True): reusing the one of the first run would chain the jobs
+def expand_simulated_annealing_jobs(files:list[str], files_to_run:list[int], runs_per_file:int, inner_time_limit:float = 30.0) -> list[dict[str, Any]]:
+    test_alpha:list[float] = [0.9]
+    test_beta:list[float] = [1.5]
+    test_gamma:list[float] = [0.9, 0.8]
+    test_initial_temp:list[int] = [1000, 1500]
+    jobs: list[dict[str, Any]] = []
+    for file_id in files_to_run:
+        if file_id >= len(files): break
+        for alpha in test_alpha:
+            for beta in test_beta:
+                for gamma in test_gamma:
+                    for initial_temp in test_initial_temp:
+                        for run in range(runs_per_file):
+                            jobs.append({"experiment": "simulated_annealing", "run_id": get_next_run_id("simulated_annealing"), "instance_file": files[file_id],
+                                         "run_seed": get_next_seed("simulated_annealing", files[file_id]), "time_limit": inner_time_limit,
+                                         "alpha": alpha, "beta": beta, "gamma": gamma, "initial_temp": initial_temp})
+    return jobs
+
+# Same setup as run_genetic_algorithm_experiment
+def expand_genetic_algorithm_jobs(files:list[str], files_to_run:list[int], runs_per_file:int, inner_time_limit:float = 30.0) -> list[dict[str, Any]]:
+    jobs: list[dict[str, Any]] = []
+    for file_id in files_to_run:
+        if file_id >= len(files): break
+        for run in range(runs_per_file):
+            jobs.append({"experiment": "genetic_algorithm", "run_id": get_next_run_id("genetic_algorithm"), "instance_file": files[file_id],
+                         "run_seed": get_next_seed("genetic_algorithm", files[file_id]), "time_limit": inner_time_limit})
+    return jobs
+
+# Same parameter grid as run_iterated_local_search
+def expand_iterated_local_search_jobs(files:list[str], files_to_run:list[int], runs_per_file:int, inner_time_limit:float = 30.0) -> list[dict[str, Any]]:
+    test_constructive_methods:list[str] = fs.first_solutions_list
+    test_constructive_params:list[bool] = [True, False]
+    test_perturbation_moves:list[list[str]] = [[]]
+    test_local_search_methods:list[list[str]] = [["variable_neighborhood_descent"]] # names, so jobs stay plain data
+    test_refinement_heuristics:list[list[str]] = [[]]
+    test_neighborhood_names:list[list[str]] = [[]]
+    test_ils_max_tries:list[int] = [ils.ILS_MAX_TRIES_DEFAULT]
+    test_ls_max_tries:list[int] = [ils.LS_MAX_TRIES_DEFAULT]
+    jobs: list[dict[str, Any]] = []
+    for file_id in files_to_run:
+        if file_id >= len(files): break
+        for first_sol_method, param, perturbation, ls_methods, rheu, neighbor_name, ils_max_tries, ls_max_tries in product(
+                test_constructive_methods, test_constructive_params, test_perturbation_moves, test_local_search_methods,
+                test_refinement_heuristics, test_neighborhood_names, test_ils_max_tries, test_ls_max_tries):
+            for run in range(runs_per_file):
+                jobs.append({"experiment": "iterated_local_search", "run_id": get_next_run_id("iterated_local_search"), "instance_file": files[file_id],
+                             "run_seed": get_next_seed("iterated_local_search", files[file_id]), "time_limit": inner_time_limit,
+                             "first_solution": first_sol_method, "biggest_first": param, "perturbation": perturbation, "ls_methods": ls_methods,
+                             "refinement_heuristics": rheu, "neighborhood_names": neighbor_name, "ils_max_tries": ils_max_tries, "ls_max_tries": ls_max_tries})
+    return jobs
+
+# Same parameter grid as run_tabu_search_experiment
+def expand_tabu_search_jobs(files:list[str], files_to_run:list[int], runs_per_file:int, inner_time_limit:float = 30.0) -> list[dict[str, Any]]:
+    test_first_solutions:list[str] = ["create_pack_benefit_greedy_solution", "create_randomic_solution"]
+    test_tenures:list[tuple[int, int]] = [(ts.TENURE_DEFAULT, ts.TENURE_RANDOM_DEFAULT), (15, 15)]
+    test_frequency_weights:list[float] = [0.0, 0.5]
+    jobs: list[dict[str, Any]] = []
+    for file_id in files_to_run:
+        if file_id >= len(files): break
+        for first_sol_method, (tenure, tenure_random), frequency_weight in product(test_first_solutions, test_tenures, test_frequency_weights):
+            for run in range(runs_per_file):
+                jobs.append({"experiment": "tabu_search", "run_id": get_next_run_id("tabu_search"), "instance_file": files[file_id],
+                             "run_seed": get_next_seed("tabu_search", files[file_id]), "time_limit": inner_time_limit,
+                             "first_solution": first_sol_method, "tenure": tenure, "tenure_random": tenure_random, "frequency_weight": frequency_weight})
+    return jobs
+
+''' Job runners '''
+# Same runs and result rows as the bodies of the serial runners
+
+#
+def run_local_search_job(job:dict[str, Any], pack_benefits:list[int], dep_sizes:list[int], pack_dep:list[tuple[int, int]], capacity:int) -> dict[str, Any]:
+    initial_sol: list[bool] = fs.create_first_solution("create_ratio_greedy_solution", pack_benefits, dep_sizes, pack_dep, capacity)
+    initial_benefit: int = aux.evaluate_packs(pack_benefits, pack_dep, initial_sol)
+    start_time: float = time.time()
+    final_move: move.move_type = ls.local_search_dict[job["ls_method"]](
+        initial_sol, pack_benefits, dep_sizes, pack_dep, capacity,
+        [rh.heuristics_dict[name] for name in job["refinement_names"]], job["neighborhoods"], job["time_limit"], 1000)
+    elapsed: float = time.time() - start_time
+
+    final_benefit: int = aux.evaluate_packs(pack_benefits, pack_dep, final_move[0])
+    improvement: int = final_benefit - initial_benefit
+    return {
+        "run_id": f"local_search_{job['run_id']}",
+        "instance_file": job["instance_file"],
+        "ls_method": job["ls_method"],
+        "refinement_heuristics": str(job["refinement_names"]),
+        "neighborhoods": str(job["neighborhoods"]),
+        "initial_method": "create_ratio_greedy_solution",
+        "seed": job["run_seed"],
+        "initial_benefit": initial_benefit,
+        "benefit": final_benefit,
+        "improvement": improvement,
+        "improvement_pct": 100.0 * improvement / initial_benefit if initial_benefit > 0 else 0.0,
+        "capacity_remaining": aux.get_remaining_capacity(dep_sizes, final_move[0], capacity),
+        "time": elapsed,
+        "evaluations": aux.get_evaluation_count(),
+        "cache_hits": aux.get_fitness_cache_hits(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+# 
+def run_simulated_annealing_job(job:dict[str, Any], pack_benefits:list[int], dep_sizes:list[int], pack_dep:list[tuple[int, int]], capacity:int) -> dict[str, Any]:
+    start_time: float = time.time()
+    first_sol: list[bool] = fs.create_randomic_solution(pack_benefits, dep_sizes, pack_dep, capacity, [])
+    (useful_temp, starting_temperature, beta, gamma) = sa.get_initial_temperature(
+        job.get("temperature_method", sa.TEMPERATURE_ESTIMATOR_DEFAULT),
+        sol = first_sol, pack_benefits = pack_benefits, dep_sizes = dep_sizes, pack_dep = pack_dep, capacity = capacity,
+        beta = job["beta"], gamma = job["gamma"], initial_temperature = job["initial_temp"],
+        time_limit = job["time_limit"]/2) # at most half time for finding initial temp
+    (solution, benefit, initial_temperature, final_temperature, alpha) = sa.simulated_annealing(
+        sol = first_sol, pack_benefits = pack_benefits, dep_sizes = dep_sizes, pack_dep = pack_dep, capacity = capacity,
+        initial_temperature = useful_temp, alpha = job["alpha"],
+        time_limit = job["time_limit"] - time.time() + start_time)
+    elapsed: float = time.time() - start_time
+    print(f"  Run_id:{job['run_id']} Seed: {job['run_seed']} run for {job['instance_file']} in {elapsed/60}min - Benefit: {benefit}")
+    return {
+        "run_id": f"simulated_annealing_{job['run_id']}",
+        "instance_file": job["instance_file"],
+        "run_seed": job["run_seed"],
+        "solution": aux.list_bool_to_int(solution),
+        "benefit": benefit,
+        "first_solution": "random",
+        "biggest_first": "",
+        "starting_find_temp": starting_temperature,
+        "initial_temp": initial_temperature,
+        "final_temp": final_temperature,
+        "alpha": alpha,
+        "beta": beta,
+        "gamma": gamma,
+        "run_finding_initial_temp": True,
+        "start_time": start_time,
+        "time": elapsed,
+        "evaluations": aux.get_evaluation_count(),
+        "cache_hits": aux.get_fitness_cache_hits(),
+        "capacity_used": capacity - aux.get_remaining_capacity(dep_sizes, solution, capacity),
+        "timestamp": datetime.now().isoformat()
+    }
+
+# 
+def run_genetic_algorithm_job(job:dict[str, Any], pack_benefits:list[int], dep_sizes:list[int], pack_dep:list[tuple[int, int]], capacity:int) -> dict[str, Any]:
+    start_time: float = time.time()
+    (solution, benefit, initial_sol, neighborhood_names, generations, elite_number, parents_per_generation,
+     parents_survive, parent_selection_name, two_offsprings, crossover_points, mutation, mutations_per_gene, time_limit) = ga.genetic_algorithm(
+        sol = [], pack_benefits = pack_benefits, dep_sizes = dep_sizes, pack_dep = pack_dep, capacity = capacity,
+        time_limit = job["time_limit"], elite_number = 0, parents_survive = False,
+        mutation = 0.1, # 10%
+        mutations_per_gene = 10) # 10 bits will change
+    elapsed: float = time.time() - start_time
+    print(f"  [{job['run_id']}] {job['run_seed']} run for {job['instance_file']} - Benefit: {benefit}")
+    return {
+        "run_id": f"genetic_algorithm_{job['run_id']}",
+        "instance_file": job["instance_file"],
+        "run_seed": job["run_seed"],
+        "solution": aux.list_bool_to_int(solution),
+        "benefit": benefit,
+        "initial_sol": aux.list_bool_to_int(initial_sol),
+        "initial_sol_neighborhood": neighborhood_names,
+        "generations": generations,
+        "elite_number": elite_number,
+        "parents_per_generation": parents_per_generation,
+        "parents_survive": parents_survive,
+        "parent_selection": parent_selection_name,
+        "two_offsprings": two_offsprings,
+        "crossover_points": crossover_points,
+        "mutation_rate": mutation,
+        "mutations_per_gene": mutations_per_gene,
+        "start_time": start_time,
+        "time": elapsed,
+        "evaluations": aux.get_evaluation_count(),
+        "cache_hits": aux.get_fitness_cache_hits(),
+        "capacity_used": capacity - aux.get_remaining_capacity(dep_sizes, solution, capacity),
+        "timestamp": datetime.now().isoformat()
+    }
+
+# 
+def run_iterated_local_search_job(job:dict[str, Any], pack_benefits:list[int], dep_sizes:list[int], pack_dep:list[tuple[int, int]], capacity:int) -> dict[str, Any]:
+    start_time: float = time.time()
+    first_sol: list[bool] = fs.create_first_solution(job["first_solution"], pack_benefits, dep_sizes, pack_dep, capacity, job["biggest_first"])
+    solution: move.move_type = ils.iterated_local_search(
+        first_sol[:], pack_benefits, dep_sizes, pack_dep, capacity,
+        job["perturbation"],
+        [ls.local_search_dict[name] for name in job["ls_methods"]],
+        [rh.heuristics_dict[name] for name in job["refinement_heuristics"]],
+        job["neighborhood_names"],
+        time_limit = job["time_limit"] - time.time() + start_time,
+        ils_max_tries = job["ils_max_tries"],
+        ls_max_tries = job["ls_max_tries"])
+    benefit: int = aux.evaluate_packs(pack_benefits, pack_dep, solution[0])
+    elapsed: float = time.time() - start_time
+    print(f"  Run_id:{job['run_id']} Seed: {job['run_seed']} run for {job['instance_file']} in {elapsed/60:.2f}min - Benefit: {benefit}")
+    return {
+        "run_id": f"iterated_local_search_{job['run_id']}",
+        "instance_file": job["instance_file"],
+        "run_seed": job["run_seed"],
+        "solution": aux.list_bool_to_int(solution[0]),
+        "benefit": benefit,
+        "first_solution": job["first_solution"],
+        "parameters": "biggest_first:" + str(job["biggest_first"]),
+        "perturbation": job["perturbation"],
+        "ls_method": str(job["ls_methods"]),
+        "refinement_heuristics": job["refinement_heuristics"],
+        "neighborhood_names": job["neighborhood_names"],
+        "ils_max_tries": job["ils_max_tries"],
+        "ls_max_tries": job["ls_max_tries"],
+        "start_time": start_time,
+        "time": elapsed,
+        "evaluations": aux.get_evaluation_count(),
+        "cache_hits": aux.get_fitness_cache_hits(),
+        "capacity_used": capacity - aux.get_remaining_capacity(dep_sizes, solution[0], capacity),
+        "timestamp": datetime.now().isoformat()
+    }
+
+# 
+def run_tabu_search_job(job:dict[str, Any], pack_benefits:list[int], dep_sizes:list[int], pack_dep:list[tuple[int, int]], capacity:int) -> dict[str, Any]:
+    start_time: float = time.time()
+    first_sol: list[bool] = fs.create_first_solution(job["first_solution"], pack_benefits, dep_sizes, pack_dep, capacity)
+    initial_benefit: int = aux.evaluate_packs(pack_benefits, pack_dep, first_sol)
+    solution, benefit, moves = ts.tabu_search(first_sol, pack_benefits, dep_sizes, pack_dep, capacity,
+                                              tenure=job["tenure"], tenure_random=job["tenure_random"], frequency_weight=job["frequency_weight"],
+                                              time_limit=job["time_limit"] - time.time() + start_time)
+    elapsed: float = time.time() - start_time
+    print(f"  Run_id:{job['run_id']} Seed: {job['run_seed']} run for {job['instance_file']} in {elapsed/60:.2f}min - Benefit: {benefit} ({moves} moves)")
+    return {
+        "run_id": f"tabu_search_{job['run_id']}",
+        "instance_file": job["instance_file"],
+        "run_seed": job["run_seed"],
+        "solution": aux.list_bool_to_int(solution),
+        "benefit": benefit,
+        "first_solution": job["first_solution"],
+        "initial_benefit": initial_benefit,
+        "tenure": job["tenure"],
+        "tenure_random": job["tenure_random"],
+        "frequency_weight": job["frequency_weight"],
+        "max_tries": ts.get_max_tries(len(dep_sizes)),
+        "moves": moves,
+        "moves_per_second": moves / elapsed if elapsed > 0 else 0.0,
+        "start_time": start_time,
+        "time": elapsed,
+        "evaluations": aux.get_evaluation_count(),
+        "cache_hits": aux.get_fitness_cache_hits(),
+        "capacity_used": capacity - aux.get_remaining_capacity(dep_sizes, solution, capacity),
+        "timestamp": datetime.now().isoformat()
+    }
+
+''' Dictionaries for the parallel runner '''
+
+# 
+job_expanders_dict: dict[str, Callable[[list[str], list[int], int, float], list[dict[str, Any]]]] = {
+    "local_search": expand_local_search_jobs,
+    "simulated_annealing": expand_simulated_annealing_jobs,
+    "genetic_algorithm": expand_genetic_algorithm_jobs,
+    "iterated_local_search": expand_iterated_local_search_jobs,
+    "tabu_search": expand_tabu_search_jobs
+}
+
+# 
+job_runners_dict: dict[str, Callable[..., dict[str, Any]]] = {
+    "local_search": run_local_search_job,
+    "simulated_annealing": run_simulated_annealing_job,
+    "genetic_algorithm": run_genetic_algorithm_job,
+    "iterated_local_search": run_iterated_local_search_job,
+    "tabu_search": run_tabu_search_job
+}
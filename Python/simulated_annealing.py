@@ -1,10 +1,14 @@
 # Python 3.13.4
 
 import random
-import time
-from auxiliary_functions import evaluate_packs, get_remaining_capacity
-from move import move_type, get_valid_random_move, random_move
-from math import e
+from move import neighborhood_type, changed_by
+from feasible_sampler import FeasibleMoveSampler, get_feasible_sampler
+from incremental_evaluation import IncrementalEvaluator
+from auxiliary_functions import compile_instance
+from instance import Instance
+from identity_memo import IdentityMemo
+from budget import Budget, get_budget
+from math import e, exp, log
 
 INITIAL_TEMPERATURE_DEFAULT:int = 1000
 TIME_LIMIT_DEFAULT:float = 90.0
@@ -12,50 +16,62 @@ MAX_TRIES_DEFAULT:int = 10000
 ALPHA_DEFAULT:float = 0.95 # how slow temperature decreases in SA
 BETA_DEFAULT:float = 1.125 # how temperature increases in find inital temperature
 GAMMA_DEFAULT:float = 0.9 # acceptance rate in find initial temperature
+SAMPLE_MOVES_DEFAULT:int = 500 # random moves estimate_initial_temperature samples
+BEN_AMEUR_P_DEFAULT:float = 1.0 # exponent of the Ben-Ameur update, higher -> smaller steps
+BEN_AMEUR_TOLERANCE_DEFAULT:float = 1e-3 # relative distance to the target acceptance that stops the iteration
+BEN_AMEUR_MAX_ITERATIONS:int = 100
+TEMPERATURE_ESTIMATOR_DEFAULT:str = "estimate" # get_initial_temperature: "estimate" (one sample) or "search" (find_initial_temperature)
+
+_temperatures:IdentityMemo = IdentityMemo() # (instance, neighborhood names, gamma) -> estimated temperature
 
 #
-def simulated_annealing(sol:list[bool], pack_benefits:list[int], dep_sizes:list[int], pack_dep:list[tuple[int, int]], capacity:int, neighborhood_names:list[str] = [], initial_temperature:float = INITIAL_TEMPERATURE_DEFAULT, alpha:float = ALPHA_DEFAULT, time_limit: float = TIME_LIMIT_DEFAULT, max_tries: int = MAX_TRIES_DEFAULT) -> tuple[list[bool], int, float, float, float]:
-    current_sol:list[bool] = sol[:]
-    current_benefit:int = evaluate_packs(pack_benefits, pack_dep, current_sol)
+def simulated_annealing(sol:list[bool], pack_benefits:list[int], dep_sizes:list[int], pack_dep:list[tuple[int, int]], capacity:int, neighborhood_names:list[str] = [], initial_temperature:float = INITIAL_TEMPERATURE_DEFAULT, alpha:float = ALPHA_DEFAULT, time_limit: float = TIME_LIMIT_DEFAULT, max_tries: int = MAX_TRIES_DEFAULT, budget: Budget | None = None) -> tuple[list[bool], int, float, float, float]:
+    evaluator:IncrementalEvaluator = IncrementalEvaluator(pack_benefits, dep_sizes, pack_dep, capacity, sol)
+    current_sol:list[bool] = evaluator.sol # moved in place by the accepted flips, never copied
+    current_benefit:int = evaluator.get_benefit()
+    sampler:FeasibleMoveSampler = get_feasible_sampler(current_sol, pack_benefits, dep_sizes, pack_dep, capacity)
     tries:int = 0
     temperature:float = initial_temperature
-    start_time:float = time.time()
+    budget = get_budget(budget, time_limit) # a budget passed down replaces time_limit
 
-    while temperature > 0/initial_temperature and time.time() - start_time < time_limit and tries < max_tries:
-        if time.time() - start_time >= time_limit: print("Expired time - simulated_annealing"); break
-        new_move:move_type = get_valid_random_move(current_sol, neighborhood_names, max_tries)
-        if new_move[1] == "error": continue # couldn't find a new solution
-        if get_remaining_capacity(dep_sizes, new_move[0], capacity) < 0: continue # invalid solution
-        new_benefit:int = evaluate_packs(pack_benefits, pack_dep, new_move[0])
-        delta:int = new_benefit - current_benefit
+    while temperature > 0/initial_temperature and tries < max_tries and not budget.expired():
+        neighbor:neighborhood_type = sampler.random_neighbor(neighborhood_names) # always fits the capacity
+        if neighbor[0] == "error": tries += 1; continue # couldn't find a new solution
+        changed:list[int] = changed_by(current_sol, neighbor)
+        delta:int = evaluator.delta_if_flips(changed)
         if delta > 0 or random.random() < min(1, e**(delta / temperature)):
-            current_sol = new_move[0]
-            current_benefit = new_benefit
+            for dep in changed: evaluator.flip(dep); sampler.flip(dep)
+            evaluator.commit()
+            current_benefit = evaluator.get_benefit()
+        budget.report(current_benefit)
         tries += 1
         temperature *= alpha
 
     return (current_sol, current_benefit, initial_temperature, temperature, alpha)
 
 # 
-def find_initial_temperature(sol:list[bool], pack_benefits:list[int], dep_sizes:list[int], pack_dep:list[tuple[int, int]], capacity:int, neighborhood_names:list[str] = [], initial_temperature:float = INITIAL_TEMPERATURE_DEFAULT, beta:float =BETA_DEFAULT, gamma:float = GAMMA_DEFAULT, time_limit: float = TIME_LIMIT_DEFAULT, max_tries: int = MAX_TRIES_DEFAULT) -> tuple[float, float, float, float]:
+def find_initial_temperature(sol:list[bool], pack_benefits:list[int], dep_sizes:list[int], pack_dep:list[tuple[int, int]], capacity:int, neighborhood_names:list[str] = [], initial_temperature:float = INITIAL_TEMPERATURE_DEFAULT, beta:float =BETA_DEFAULT, gamma:float = GAMMA_DEFAULT, time_limit: float = TIME_LIMIT_DEFAULT, max_tries: int = MAX_TRIES_DEFAULT, budget: Budget | None = None) -> tuple[float, float, float, float]:
     current_temp:float = initial_temperature
-    current_sol:list[bool] = sol[:]
-    current_benefit:int = evaluate_packs(pack_benefits, pack_dep, current_sol)
-    start_time:float = time.time()
-    while time.time() - start_time < time_limit:
+    evaluator:IncrementalEvaluator = IncrementalEvaluator(pack_benefits, dep_sizes, pack_dep, capacity, sol)
+    current_sol:list[bool] = evaluator.sol # moved in place by the accepted flips
+    current_benefit:int = evaluator.get_benefit()
+    sampler:FeasibleMoveSampler = get_feasible_sampler(current_sol, pack_benefits, dep_sizes, pack_dep, capacity)
+    budget = get_budget(budget, time_limit)
+    while not budget.expired():
         print(f"Trying T = {current_temp}")
         accepted:int = 0 # moves accepted with current T
         for tries in range (max_tries):
-            if time.time() - start_time >= time_limit: print("Expired time - find_initial_temperature"); break
-            new_move:move_type = get_valid_random_move(current_sol, neighborhood_names)
-            if new_move[1] == "error": print("new move is error"); continue # couldn't find a new solution
-            if get_remaining_capacity(dep_sizes, new_move[0], capacity) < 0: continue # invalid solution
-            new_benefit:int = evaluate_packs(pack_benefits, pack_dep, new_move[0])
-            delta:int = new_benefit - current_benefit
+            if budget.expired(): print("Expired time - find_initial_temperature"); break
+            neighbor:neighborhood_type = sampler.random_neighbor(neighborhood_names) # always fits the capacity
+            if neighbor[0] == "error": print("new move is error"); continue # couldn't find a new solution
+            changed:list[int] = changed_by(current_sol, neighbor)
+            delta:int = evaluator.delta_if_flips(changed)
+            new_benefit:int = current_benefit + delta
             #print(f"try number: {tries}, current benefit:{current_benefit}, new tested benefit: {new_benefit}, delta: {delta}")
             if delta > 0 or random.random() < min(1, e**(delta / current_temp)): 
                 accepted += 1
-                current_sol = new_move[0]
+                for dep in changed: evaluator.flip(dep); sampler.flip(dep)
+                evaluator.commit()
                 current_benefit = new_benefit
         if accepted >= gamma * max_tries: 
             print(f"Found T = {current_temp} with acceptance rate {accepted / max_tries}")
@@ -63,5 +79,72 @@ def find_initial_temperature(sol:list[bool], pack_benefits:list[int], dep_sizes:
         else: current_temp *= beta
     return (current_temp, initial_temperature, beta, gamma)
 
+''' Temperature estimation '''
+# One sample instead of find_initial_temperature's search (max_tries moves per candidate temperature, half of a run's time)
+# sample_moves feasible random moves along a random walk from sol (every move is taken, so the sample isn't stuck around sol)
+# gamma is the acceptance of the worsening moves (Ben-Ameur's chi_0): improving and neutral moves are always accepted, and
+# around a poor solution they are almost all of them, so a target over every move would be met by any temperature
+# Ben-Ameur (2004): with b_before > b_after the benefits around each worsening move, the acceptance at T is estimated as
+#   chi(T) = sum exp(b_after / T) / sum exp(b_before / T)
+# and T_next = T * (ln chi(T) / ln target) ^ (1/p) until chi(T) is within tolerance of the target; the closed form
+# mean loss / ln(1/target) of the empirical losses is the starting point
+# The result is cached per (instance, neighborhood names, gamma), so the next runs on the instance skip the sample
+
+# Initial temperature accepting about gamma of the moves around sol (cached)
+def estimate_initial_temperature(sol:list[bool], pack_benefits:list[int], dep_sizes:list[int], pack_dep:list[tuple[int, int]], capacity:int, neighborhood_names:list[str] = [], gamma:float = GAMMA_DEFAULT, sample_moves:int = SAMPLE_MOVES_DEFAULT, p:float = BEN_AMEUR_P_DEFAULT) -> float:
+    instance:Instance = compile_instance(pack_benefits, dep_sizes, pack_dep, capacity)
+    names:tuple[str, ...] = tuple(sorted(neighborhood_names))
+    cached:float | None = _temperatures.get(instance, names, gamma)
+    if cached is not None:
+        return cached
+
+    evaluator:IncrementalEvaluator = IncrementalEvaluator.from_instance(instance, sol)
+    current_sol:list[bool] = evaluator.sol # the walk moves it in place
+    sampler:FeasibleMoveSampler = get_feasible_sampler(current_sol, pack_benefits, dep_sizes, pack_dep, capacity)
+    before:list[int] = [] # benefits around each worsening move
+    after:list[int] = []
+    for _ in range(sample_moves):
+        neighbor:neighborhood_type = sampler.random_neighbor(neighborhood_names) # always fits the capacity
+        if neighbor[0] == "error": continue
+        changed:list[int] = changed_by(current_sol, neighbor)
+        delta:int = evaluator.delta_if_flips(changed)
+        if delta < 0:
+            before.append(evaluator.get_benefit())
+            after.append(evaluator.get_benefit() + delta)
+        for dep in changed: evaluator.flip(dep); sampler.flip(dep)
+        evaluator.commit()
+
+    temperature:float = INITIAL_TEMPERATURE_DEFAULT # nothing worsening was seen: no sample to estimate from
+    if before:
+        temperature = ben_ameur_temperature(before, after, gamma, p)
+    _temperatures.put(instance, temperature, names, gamma)
+    return temperature
+
+# Temperature whose estimated acceptance of the sampled worsening moves (benefit before -> after) is target
+def ben_ameur_temperature(before:list[int], after:list[int], target:float, p:float = BEN_AMEUR_P_DEFAULT, tolerance:float = BEN_AMEUR_TOLERANCE_DEFAULT, max_iterations:int = BEN_AMEUR_MAX_ITERATIONS) -> float:
+    top:int = max(before) # both sums are scaled by exp(-top / T), chi doesn't change and nothing overflows
+    temperature:float = (sum(before) - sum(after)) / len(before) / log(1 / target)
+    for _ in range(max_iterations):
+        accepted:float = sum(exp((benefit - top) / temperature) for benefit in after) / sum(exp((benefit - top) / temperature) for benefit in before)
+        if abs(accepted - target) <= tolerance * target:
+            break
+        if accepted <= 0.0: # every term underflowed, far too cold
+            temperature *= 2
+            continue
+        temperature *= (log(accepted) / log(target)) ** (1 / p)
+    return temperature
+
+# Initial temperature by method ("estimate" or "search") -> same tuple as find_initial_temperature
+# "estimate" takes a fraction of a second, so a caller giving SA the time left gives it almost all of its budget
+def get_initial_temperature(method:str, sol:list[bool], pack_benefits:list[int], dep_sizes:list[int], pack_dep:list[tuple[int, int]], capacity:int, neighborhood_names:list[str] = [], initial_temperature:float = INITIAL_TEMPERATURE_DEFAULT, beta:float = BETA_DEFAULT, gamma:float = GAMMA_DEFAULT, time_limit:float = TIME_LIMIT_DEFAULT, max_tries:int = MAX_TRIES_DEFAULT, budget:Budget | None = None) -> tuple[float, float, float, float]:
+    match method:
+        case "estimate":
+            return (estimate_initial_temperature(sol, pack_benefits, dep_sizes, pack_dep, capacity, neighborhood_names, gamma), initial_temperature, beta, gamma)
+        case "search":
+            return find_initial_temperature(sol, pack_benefits, dep_sizes, pack_dep, capacity, neighborhood_names, initial_temperature, beta, gamma, time_limit, max_tries, budget)
+        case _:
+            raise ValueError(f"Unknown temperature method: {method}. Available: {temperature_methods_list}")
 
+''' Lists '''
 
+temperature_methods_list:list[str] = ["estimate", "search"]
@@ -0,0 +1,221 @@
+# Python 3.13.4
+
+import csv
+import math
+import statistics
+from collections import defaultdict
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+EXACT_LIMIT_DEFAULT: int = 2048 # values kept per group for exact median/quartiles, past this the P² sketches take over
+CHUNK_SIZE_DEFAULT: int = 4096 # csv rows read per chunk
+QUARTILES: tuple[float, float, float] = (0.25, 0.5, 0.75)
+OUTLIER_EXAMPLES: int = 3
+
+''' P² quantile sketch '''
+
+# Jain & Chlamtac P² estimator: one quantile in O(1) memory, 5 markers moved with piecewise-parabolic interpolation
+class P2Quantile:
+    def __init__(self, q:float, values:list[float]) -> None:
+        self.q:float = q
+        self.increments:list[float] = [0.0, q/2, q, (1 + q)/2, 1.0]
+        self._start(sorted(values))
+
+    # Starts the markers from the sorted values seen so far (at least 5): each marker at the rank it should have
+    def _start(self, values:list[float]) -> None:
+        count:int = len(values)
+        self.desired:list[float] = [1 + (count - 1)*increment for increment in self.increments]
+        self.positions:list[int] = []
+        for i, desired in enumerate(self.desired):
+            position:int = min(max(round(desired), self.positions[-1] + 1 if self.positions else 1), count - 4 + i)
+            self.positions.append(position)
+        self.heights:list[float] = [values[position - 1] for position in self.positions]
+
+    def add(self, value:float) -> None:
+        heights:list[float] = self.heights
+        positions:list[int] = self.positions
+        if value < heights[0]:
+            heights[0] = value
+            cell:int = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            cell = 3
+        else:
+            cell = next(i for i in range(4) if heights[i] <= value < heights[i + 1])
+        for i in range(cell + 1, 5):
+            positions[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        for i in range(1, 4):
+            offset:float = self.desired[i] - positions[i]
+            if (offset >= 1 and positions[i + 1] - positions[i] > 1) or (offset <= -1 and positions[i - 1] - positions[i] < -1):
+                step:int = 1 if offset > 0 else -1
+                height:float = self._parabolic(i, step)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = heights[i] + step*(heights[i + step] - heights[i])/(positions[i + step] - positions[i])
+                heights[i] = height
+                positions[i] += step
+
+    def _parabolic(self, i:int, step:int) -> float:
+        heights:list[float] = self.heights
+        positions:list[int] = self.positions
+        return heights[i] + step/(positions[i + 1] - positions[i - 1]) * (
+            (positions[i] - positions[i - 1] + step)*(heights[i + 1] - heights[i])/(positions[i + 1] - positions[i]) +
+            (positions[i + 1] - positions[i] - step)*(heights[i] - heights[i - 1])/(positions[i] - positions[i - 1]))
+
+    def value(self) -> float:
+        return self.heights[2]
+
+''' Running statistics '''
+
+# Count, mean and variance (Welford), best, and median/quartiles of a stream of values
+# Up to exact_limit values the median, quartiles and outliers are exact (the same numbers statistics gives)
+# Past that the values are dropped and P² sketches estimate the quartiles, so memory stays flat as the files grow;
+# outliers are then counted against the fences of the moment each value arrives
+class RunningStats:
+    def __init__(self, exact_limit:int = EXACT_LIMIT_DEFAULT, quantiles:bool = True) -> None:
+        self.count:int = 0
+        self.mean:float = 0.0
+        self._m2:float = 0.0
+        self.best:float = -math.inf
+        self.exact_limit:int = exact_limit
+        self.values:list[float] | None = [] if quantiles else None
+        self.sketches:list[P2Quantile] | None = None
+        self.outliers_count:int = 0
+        self.outliers_examples:list[float] = []
+
+    def add(self, value:float) -> None:
+        self.count += 1
+        difference:float = value - self.mean
+        self.mean += difference / self.count
+        self._m2 += difference * (value - self.mean)
+        if value > self.best:
+            self.best = value
+        if self.sketches is not None:
+            self._count_outlier(value)
+            for sketch in self.sketches:
+                sketch.add(value)
+        elif self.values is not None:
+            self.values.append(value)
+            if len(self.values) > self.exact_limit and len(self.values) >= 5:
+                self._start_sketches()
+
+    def std(self) -> float:
+        return math.sqrt(self._m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+    # (first quartile, median, third quartile)
+    def quartiles(self) -> tuple[float, float, float]:
+        if self.sketches is not None:
+            first_quartile, median, third_quartile = (sketch.value() for sketch in self.sketches)
+            return first_quartile, median, third_quartile
+        if not self.values:
+            return 0.0, 0.0, 0.0
+        median = statistics.median(self.values)
+        if len(self.values) < 3: # quantiles requires at least 3 data points
+            return median, median, median
+        first_quartile, _, third_quartile = statistics.quantiles(self.values, n=4)
+        return first_quartile, median, third_quartile
+
+    # Same dict analyze_results always printed: count, best, median, avg, std, iqr, outliers_count, outliers_examples
+    def get_stats(self) -> dict[str, Any]:
+        if self.count == 0:
+            return {"count": 0, "best": 0.0, "median": 0.0, "avg": 0.0, "std": 0.0, "iqr": 0.0, "outliers_count": 0}
+        first_quartile, median, third_quartile = self.quartiles()
+        if self.sketches is None and self.values is not None:
+            outliers:list[float] = _get_outliers(self.values, first_quartile, third_quartile)
+            outliers_count, outliers_examples = len(outliers), outliers[:OUTLIER_EXAMPLES]
+        else:
+            outliers_count, outliers_examples = self.outliers_count, self.outliers_examples
+        return {"count": self.count, "best": float(self.best), "median": median, "avg": self.mean, "std": self.std(),
+                "iqr": third_quartile - first_quartile, "outliers_count": outliers_count, "outliers_examples": outliers_examples}
+
+    def _start_sketches(self) -> None:
+        values:list[float] = self.values or []
+        first_quartile, _, third_quartile = self.quartiles()
+        outliers:list[float] = _get_outliers(values, first_quartile, third_quartile)
+        self.outliers_count = len(outliers)
+        self.outliers_examples = outliers[:OUTLIER_EXAMPLES]
+        self.sketches = [P2Quantile(q, values) for q in QUARTILES]
+        self.values = None
+
+    def _count_outlier(self, value:float) -> None:
+        first_quartile, _, third_quartile = self.quartiles()
+        if value in _get_outliers([value], first_quartile, third_quartile):
+            self.outliers_count += 1
+            if len(self.outliers_examples) < OUTLIER_EXAMPLES:
+                self.outliers_examples.append(value)
+
+# Values outside Q1 - 1.5*IQR .. Q3 + 1.5*IQR (none when IQR is 0)
+def _get_outliers(values:list[float], first_quartile:float, third_quartile:float) -> list[float]:
+    interquartile_range:float = third_quartile - first_quartile
+    if interquartile_range <= 0:
+        return []
+    return [value for value in values if value < first_quartile - 1.5*interquartile_range or value > third_quartile + 1.5*interquartile_range]
+
+''' Accumulators '''
+
+# Benefit and time statistics per group key
+class GroupedStats:
+    def __init__(self, exact_limit:int = EXACT_LIMIT_DEFAULT) -> None:
+        self.exact_limit:int = exact_limit
+        self.groups:dict[str, tuple[RunningStats, RunningStats]] = {}
+
+    def add(self, key:str, benefit:float, time:float) -> None:
+        group = self.groups.get(key)
+        if group is None:
+            group = self.groups[key] = (RunningStats(self.exact_limit), RunningStats(quantiles=False))
+        group[0].add(benefit)
+        group[1].add(time)
+
+    def items(self) -> list[tuple[str, tuple[RunningStats, RunningStats]]]:
+        return list(self.groups.items())
+
+# Best row per key: larger benefit wins, on equal benefit the smaller time (the first one on a full tie)
+# Only the current bests are kept; rows are stored as given, so pass a copy if another consumer changes them
+class BestRows:
+    def __init__(self) -> None:
+        self.rows:dict[Any, dict[str, str]] = {}
+        self._scores:dict[Any, tuple[float, float]] = {}
+
+    def add(self, key:Any, row:dict[str, str], benefit:float, time:float) -> None:
+        score:tuple[float, float] = (benefit, -time)
+        if key not in self._scores or score > self._scores[key]:
+            self._scores[key] = score
+            self.rows[key] = row
+
+''' Streaming analysis '''
+
+# Reads every experiment .csv once, in chunks, and hands each row to every consumer registered for that file
+# Consumers get (row, index of the row in its file) and keep only accumulators, never the rows themselves
+class StreamingAnalysis:
+    def __init__(self, chunk_size:int = CHUNK_SIZE_DEFAULT) -> None:
+        self.chunk_size:int = chunk_size
+        self.consumers:defaultdict[str, list[Callable[[dict[str, str], int], None]]] = defaultdict(list)
+
+    def add_consumer(self, file_name:str, consumer:Callable[[dict[str, str], int], None]) -> None:
+        self.consumers[file_name].append(consumer)
+
+    # One pass over the files of output_dir that have consumers, returns the names of the files found
+    def run(self, output_dir:Path) -> set[str]:
+        found:set[str] = set()
+        for file_name, consumers in self.consumers.items():
+            csv_file:Path = Path(output_dir) / file_name
+            if not csv_file.exists():
+                continue
+            found.add(file_name)
+            index:int = 0
+            for chunk in read_chunks(csv_file, self.chunk_size):
+                for row in chunk:
+                    for consumer in consumers:
+                        consumer(row, index)
+                    index += 1
+        return found
+
+# Rows of csv_file, chunk_size at a time
+def read_chunks(csv_file:Path, chunk_size:int = CHUNK_SIZE_DEFAULT) -> Iterator[list[dict[str, str]]]:
+    with open(csv_file, "r", newline='') as f:
+        reader = csv.DictReader(f)
+        while chunk := list(islice(reader, chunk_size)):
+            yield chunk
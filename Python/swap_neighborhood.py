@@ -0,0 +1,117 @@
+# Python 3.13.4
+
+from bisect import bisect_right
+
+from incremental_evaluation import IncrementalEvaluator
+from budget import Budget, get_budget
+
+MAX_CANDIDATES_DEFAULT: int = 64 # k > 0 -> only the k best by benefit-to-size ratio, 0 -> every candidate (exact search)
+# Local search runs on the sukp and prob-software instances never had more than ~20 candidates, so 64 only cuts worst cases
+
+''' Swap neighborhood '''
+# Only swaps between a selected and an unselected dep change the solution: a swap is a removal plus an addition
+# delta(swap) = delta(remove s) + delta(add u after removing s) <= delta(remove s) + delta(add u)
+# delta(remove s) <= 0, so an improving swap needs an added dep that completes a pack on its own -> the candidate list
+# Candidates are tried from the largest gain down and each removal stops once gain + loss can't beat the best delta
+# find_first_swap keeps generate_swap_bits order instead (first_best_step returns the same swap as the plain scan)
+
+# Unselected deps that complete at least one pack when added -> [(dep, gain)], largest gain first
+# max_candidates > 0 keeps only the best benefit-to-size ratios (faster, no longer exact)
+def get_swap_candidates(evaluator:IncrementalEvaluator, max_candidates:int = MAX_CANDIDATES_DEFAULT) -> list[tuple[int, int]]:
+    candidates:list[tuple[int, int]] = []
+    for dep, selected in enumerate(evaluator.sol):
+        if selected: continue
+        gain:int = evaluator.delta_if_flip(dep)
+        if gain > 0:
+            candidates.append((dep, gain))
+    if 0 < max_candidates < len(candidates):
+        dep_sizes:tuple[int, ...] = evaluator.dep_sizes
+        candidates.sort(key=lambda candidate: candidate[1] / max(dep_sizes[candidate[0]], 1), reverse=True)
+        del candidates[max_candidates:]
+    candidates.sort(key=lambda candidate: candidate[1], reverse=True)
+    return candidates
+
+# Best (or first, if first_improvement) swap with delta > min_delta that fits -> (index1, index2, delta), index1 < index2
+# Ties keep the pair that comes first in generate_swap_bits order, same as scanning it with a strict >
+# Returns (-1, -1, min_delta) if there is none - a budget passed down replaces time_limit
+def find_best_swap(evaluator:IncrementalEvaluator, min_delta:int = 0, first_improvement:bool = False, max_candidates:int = MAX_CANDIDATES_DEFAULT, time_limit:float = float("inf"), budget:Budget | None = None) -> tuple[int, int, int]:
+    budget = get_budget(budget, time_limit)
+    best:tuple[int, int, int] = (-1, -1, min_delta)
+    candidates:list[tuple[int, int]] = get_swap_candidates(evaluator, max_candidates)
+    if not candidates:
+        return best
+    dep_sizes:tuple[int, ...] = evaluator.dep_sizes
+    free:int = evaluator.get_remaining_capacity()
+    found:bool = False
+
+    for removed in [dep for dep, selected in enumerate(evaluator.sol) if selected]:
+        if budget.expired():
+            break
+        loss:int = evaluator.delta_if_flip(removed)
+        if _cannot_beat(candidates[0][1] + loss, best[2], found):
+            continue
+        evaluator.flip(removed)
+        for added, gain in candidates:
+            if _cannot_beat(gain + loss, best[2], found):
+                break
+            if dep_sizes[added] - dep_sizes[removed] > free:
+                continue
+            delta:int = loss + evaluator.delta_if_flip(added)
+            pair:tuple[int, int] = (min(removed, added), max(removed, added))
+            if delta > best[2] or (found and delta == best[2] and pair < best[:2]):
+                best = (pair[0], pair[1], delta)
+                found = True
+                if first_improvement:
+                    break
+        evaluator.undo()
+        if found and first_improvement:
+            break
+    return best
+
+# First swap in generate_swap_bits order (by index1, then index2) that fits and improves -> (index1, index2, delta)
+# Returns (-1, -1, 0) if there is none - a budget passed down replaces time_limit
+def find_first_swap(evaluator:IncrementalEvaluator, max_candidates:int = MAX_CANDIDATES_DEFAULT, time_limit:float = float("inf"), budget:Budget | None = None) -> tuple[int, int, int]:
+    budget = get_budget(budget, time_limit)
+    candidates:list[tuple[int, int]] = get_swap_candidates(evaluator, max_candidates)
+    if not candidates:
+        return (-1, -1, 0)
+    gains:dict[int, int] = dict(candidates)
+    added_deps:list[int] = sorted(gains)
+    removed_deps:list[int] = [dep for dep, selected in enumerate(evaluator.sol) if selected]
+    max_gain:int = candidates[0][1]
+
+    for index1, selected in enumerate(evaluator.sol):
+        if budget.expired():
+            break
+        if selected: # pairs (index1, added) for the candidates after index1
+            loss:int = evaluator.delta_if_flip(index1)
+            if loss + max_gain <= 0:
+                continue
+            for index2 in added_deps[bisect_right(added_deps, index1):]:
+                if loss + gains[index2] <= 0:
+                    continue
+                delta:int | None = _swap_delta(evaluator, index1, index2, loss)
+                if delta is not None and delta > 0:
+                    return (index1, index2, delta)
+        elif index1 in gains: # pairs (index1, removed) for the selected deps after index1
+            for index2 in removed_deps[bisect_right(removed_deps, index1):]:
+                loss = evaluator.delta_if_flip(index2)
+                if loss + gains[index1] <= 0:
+                    continue
+                delta = _swap_delta(evaluator, index2, index1, loss)
+                if delta is not None and delta > 0:
+                    return (index1, index2, delta)
+    return (-1, -1, 0)
+
+# Delta of removing removed (loss already known) and adding added, None if the swap doesn't fit
+def _swap_delta(evaluator:IncrementalEvaluator, removed:int, added:int, loss:int) -> int | None:
+    if evaluator.dep_sizes[added] - evaluator.dep_sizes[removed] > evaluator.get_remaining_capacity():
+        return None
+    evaluator.flip(removed)
+    delta:int = loss + evaluator.delta_if_flip(added)
+    evaluator.undo()
+    return delta
+
+# True if a swap whose delta is at most bound can't replace the best one
+def _cannot_beat(bound:int, best_delta:int, found:bool) -> bool:
+    return bound < best_delta or (bound == best_delta and not found)
@@ -0,0 +1,330 @@
+# Python 3.13.4
+
+import random
+from bisect import bisect_left, insort
+from auxiliary_functions import compile_instance, add_evaluation_count
+from flip_gain import FlipGainTracker
+from incremental_evaluation import IncrementalEvaluator
+from budget import Budget, get_budget
+from instance import Instance
+from zobrist import get_zobrist_keys, zobrist_hash
+
+TIME_LIMIT_DEFAULT:float = 90.0
+MAX_TRIES_DEFAULT:int | None = None # moves in a row without a new best solution, None -> TRIES_PER_DEP_DEFAULT * number of deps
+# Stagnation runs of 60k-230k moves still ended in a new best on sukp12 and sukp29 (400 and 485 deps); at the
+# 13k-34k moves/s measured on sukp28/29 (depends on the start: ratio greedy is the slowest) a fixed 20000 stopped runs within 1-2s
+TRIES_PER_DEP_DEFAULT:int = 500
+TENURE_DEFAULT:int = 7 # iterations a flipped dep stays tabu
+TENURE_RANDOM_DEFAULT:int = 7 # plus a random 0..tenure_random, so cycles of a fixed length don't survive
+FREQUENCY_WEIGHT_DEFAULT:float = 0.0 # 0 -> no long-term memory
+REVISIT_TENURE_DEFAULT:int = 1000 # moves during which a solution can't be visited again, 0 -> no solution memory
+CANDIDATES_DEFAULT:int = 8 # additions and removals combined into swaps (candidates^2 pairs per move)
+WALK_LIMIT_DEFAULT:int = 16 # additions and removals looked at per move, largest gain first
+TABU_NEIGHBORHOODS:list[str] = ["flip_bit", "swap_bits"]
+
+_ABSENT:int = -(1 << 62) # key of the deps that aren't on that side (selected / unselected)
+
+''' Sorted keys '''
+# Every flip changes the keys of a dozen or more deps, and every move reads the largest few keys of both sides
+# The keys of one side are kept in a sorted list: a change is a bisect, a del and an insort (C memmoves over a few
+# hundred ints) and the largest keys are the end of the list - no heap to pop and push back on every walk
+# A smaller key isn't even moved: the listed key stays above the real one, which only puts the item too close to the end,
+# and largest moves it down when it gets there - most of the keys a flip lowers are never read before they change again
+# Keys are unique (their last digit, base num_items, is num_items - 1 - item), so an item is read back from its key
+class SortedKeys:
+    def __init__(self, keys:list[int]) -> None:
+        self.keys:list[int] = keys[:] # keys[item], _ABSENT -> not in the list
+        self.listed:list[int] = keys[:] # key the item has in the list, never below keys[item]
+        self.num_items:int = len(keys)
+        self.sorted:list[int] = sorted(key for key in keys if key != _ABSENT)
+
+    # A key not above the listed one can also be written straight into keys (the walks of tabu_search._flip do)
+    def update(self, item:int, key:int) -> None:
+        self.keys[item] = key
+        listed:int = self.listed[item]
+        if key <= listed and key != _ABSENT:
+            return # moved down if it reaches the end of the list
+        if listed != _ABSENT:
+            del self.sorted[bisect_left(self.sorted, listed)]
+        self.listed[item] = key
+        if key != _ABSENT:
+            insort(self.sorted, key)
+
+    # Item with the largest key, -1 if there is none
+    def top(self) -> int:
+        items:list[int] = self.largest(1)
+        return items[0] if items else -1
+
+    # Items from the largest key down, at most limit of them
+    # A listed key is never below the real one: once the last limit listed keys are all real, they're the largest keys
+    def largest(self, limit:int) -> list[int]:
+        keys:list[int] = self.keys
+        listed:list[int] = self.listed
+        num_items:int = self.num_items
+        while True:
+            items:list[int] = [num_items - 1 - key % num_items for key in self.sorted[:-limit - 1:-1]]
+            stale:list[int] = [item for item in items if keys[item] != listed[item]]
+            if not stale:
+                return items
+            for item in stale: # moved down to their real keys, the next ones come up
+                del self.sorted[bisect_left(self.sorted, listed[item])]
+                insort(self.sorted, keys[item])
+                listed[item] = keys[item]
+
+''' Tabu search '''
+# The state is a FlipGainTracker: gain[dep] of every flip is kept up to date, so scoring a flip is O(1)
+# A swap (remove s, add u) scores gain[s] + gain[u] minus the packs that u would complete but that also need s:
+# those packs miss only u, so they're found among the packs of u with missing == 1 (usually none or one)
+# Additions and removals are walked best-first on two sorted key lists, one for the unselected deps and one for the selected
+# Every move is taken, improving or not: the best allowed flip or swap of the candidate lists
+# Attribute-based tabu: a flipped dep can't be flipped again for tenure + random(0..tenure_random) moves,
+# unless the move gives a new best solution (aspiration)
+# Solution memory (revisit_tenure > 0): the zobrist hash of every visited solution is kept with the move it was left on,
+# a move back to one of them within revisit_tenure moves is tabu too (unless aspirated) - this breaks the longer cycles
+# that per-dep tenures let through; the hash of a candidate is the current one xor the flipped deps' keys, O(1)
+# Long-term memory (frequency_weight > 0): non-aspirated moves pay frequency_weight * mean pack benefit * (flips of the dep / moves),
+# pushing the search towards deps it rarely touched
+
+class TabuSearch:
+    def __init__(self, instance:Instance, sol:list[bool], tenure:int = TENURE_DEFAULT, tenure_random:int = TENURE_RANDOM_DEFAULT, frequency_weight:float = FREQUENCY_WEIGHT_DEFAULT, candidates:int = CANDIDATES_DEFAULT, walk_limit:int = WALK_LIMIT_DEFAULT, neighborhood_names:list[str] = [], revisit_tenure:int = REVISIT_TENURE_DEFAULT) -> None:
+        self.instance:Instance = instance
+        self.tracker:FlipGainTracker = FlipGainTracker(instance, sol, keep_heap=False, keep_near=True) # the two key lists below order the deps
+        self.evaluator:IncrementalEvaluator = self.tracker.evaluator
+        self.tenure:int = tenure
+        self.tenure_random:int = tenure_random
+        self.candidates:int = candidates
+        self.walk_limit:int = walk_limit
+        names:list[str] = [name for name in neighborhood_names if name in TABU_NEIGHBORHOODS] or TABU_NEIGHBORHOODS
+        self.use_flips:bool = "flip_bit" in names
+        self.use_swaps:bool = "swap_bits" in names
+        num_deps:int = instance.num_deps
+        self.pack_dep_sets:list[frozenset[int]] = [frozenset(deps) for deps in instance.pack_deps]
+        selected:list[bool] = self.evaluator.sol # the evaluator's copy of sol
+        near_scale:int = sum(instance.pack_benefits) + 1
+        size_scale:int = max(instance.dep_sizes, default=0) + 1
+        # Keys (see _addition_key) as gain*gain_weight (+ near*near_weight) + a per-dep tie part, one multiply-add per update
+        self.near_weight:int = size_scale * num_deps
+        self.addition_gain_weight:int = near_scale * self.near_weight
+        self.removal_gain_weight:int = size_scale * num_deps
+        self.addition_ties:list[int] = [(size_scale - 1 - instance.dep_sizes[dep])*num_deps + num_deps - 1 - dep for dep in range(num_deps)]
+        self.removal_ties:list[int] = [instance.dep_sizes[dep]*num_deps + num_deps - 1 - dep for dep in range(num_deps)]
+        self.addition_keys:SortedKeys = SortedKeys([_ABSENT if selected[dep] else self._addition_key(dep) for dep in range(num_deps)])
+        self.removal_keys:SortedKeys = SortedKeys([self._removal_key(dep) if selected[dep] else _ABSENT for dep in range(num_deps)])
+
+        self.tabu_until:list[int] = [0]*num_deps # move number until which the dep is tabu
+        self.frequency:list[int] = [0]*num_deps # flips of each dep
+        mean_benefit:float = sum(instance.pack_benefits) / max(len(instance.pack_benefits), 1)
+        self.penalty_scale:float = frequency_weight * mean_benefit
+        self.moves:int = 0
+        self.keys:list[int] = get_zobrist_keys(num_deps)
+        self.hash:int = zobrist_hash(sol)
+        self.revisit_tenure:int = revisit_tenure
+        self.visited:dict[int, int] = {} # hash -> move number on which the search left that solution
+        self.best_sol:list[bool] = self.evaluator.sol[:]
+        self.best_benefit:int = self.evaluator.get_benefit()
+
+    # Chooses and makes one move -> False if every candidate was tabu (the move number still advances, so tenures run out)
+    def step(self) -> bool:
+        self.moves += 1
+        free:int = self.evaluator.get_remaining_capacity()
+        aspiration:int = self.best_benefit - self.evaluator.get_benefit() # deltas above this give a new best
+        additions:list[int] = [] # swap candidates, filled by the flip walks
+        removals:list[int] = []
+        # (score, removed dep or -1, added dep or -1)
+        best:tuple[float, int, int] = (float("-inf"), -1, -1)
+        # The largest gain on the other side bounds the swaps of a candidate (removals lose benefit, additions don't)
+        best = self._best_flip(self.addition_keys.largest(self.walk_limit), additions, self._top_gain(self.removal_keys), free, aspiration, best, added=True)
+        best = self._best_flip(self.removal_keys.largest(self.walk_limit), removals, self._top_gain(self.addition_keys), free, aspiration, best, added=False)
+        if self.use_swaps:
+            best = self._best_swap(additions, removals, free, aspiration, best)
+
+        if best[1] < 0 and best[2] < 0:
+            return False
+        if self.revisit_tenure > 0:
+            self._remember(self.hash)
+        for dep in best[1:]: # removal first, so the addition fits
+            if dep >= 0:
+                self._flip(dep)
+        benefit:int = self.evaluator.get_benefit()
+        if benefit > self.best_benefit:
+            self.best_benefit = benefit
+            self.best_sol = self.evaluator.sol[:]
+        return True
+
+    def _flip(self, dep:int) -> None:
+        self.tracker.flip(dep)
+        sol:list[bool] = self.evaluator.sol
+        near:list[int] = self.tracker.near
+        changed:set[int] = self.tracker.last_changed # gain or near changed
+        # only dep changes sides, the others only move inside the keys of their side (inlined from _*_key)
+        # a lower key is only written down, SortedKeys moves the item when it's read (see update)
+        gains:list[int] = self.tracker.gains
+        addition_gain_weight:int = self.addition_gain_weight
+        near_weight:int = self.near_weight
+        removal_gain_weight:int = self.removal_gain_weight
+        addition_ties:list[int] = self.addition_ties
+        removal_ties:list[int] = self.removal_ties
+        addition_keys:list[int] = self.addition_keys.keys
+        addition_listed:list[int] = self.addition_keys.listed
+        removal_keys:list[int] = self.removal_keys.keys
+        removal_listed:list[int] = self.removal_keys.listed
+        for other in changed:
+            if sol[other]:
+                key:int = gains[other]*removal_gain_weight + removal_ties[other]
+                if key > removal_listed[other]:
+                    self.removal_keys.update(other, key)
+                else:
+                    removal_keys[other] = key
+            else:
+                key = gains[other]*addition_gain_weight + near[other]*near_weight + addition_ties[other]
+                if key > addition_listed[other]:
+                    self.addition_keys.update(other, key)
+                else:
+                    addition_keys[other] = key
+        if sol[dep]:
+            self.addition_keys.update(dep, _ABSENT)
+        else:
+            self.removal_keys.update(dep, _ABSENT)
+        self.tabu_until[dep] = self.moves + self.tenure + random.randint(0, self.tenure_random)
+        self.frequency[dep] += 1
+        self.hash ^= self.keys[dep]
+
+    # Records the solution being left, dropping the memories older than revisit_tenure once there are twice as many
+    def _remember(self, hash:int) -> None:
+        visited:dict[int, int] = self.visited
+        visited[hash] = self.moves
+        if len(visited) > 2 * self.revisit_tenure:
+            oldest:int = self.moves - self.revisit_tenure
+            self.visited = {key: move for key, move in visited.items() if move > oldest}
+
+    # True if the solution with this hash was left less than revisit_tenure moves ago
+    def _revisits(self, hash:int) -> bool:
+        left:int | None = self.visited.get(hash)
+        return left is not None and left + self.revisit_tenure >= self.moves
+
+    # Best of best and the allowed flips of deps (largest gain first) that fit -> (score, removed, added)
+    # Up to `candidates` deps go to seen for the swaps, while gain + partner_gain (best gain on the other side) can beat best
+    # Scores never exceed gains and best only grows, so the walk stops once neither a flip nor a swap candidate is left
+    def _best_flip(self, deps:list[int], seen:list[int], partner_gain:float, free:int, aspiration:int, best:tuple[float, int, int], added:bool) -> tuple[float, int, int]:
+        gains:list[int] = self.tracker.gains
+        dep_sizes:tuple[int, ...] = self.instance.dep_sizes
+        tabu_until:list[int] = self.tabu_until
+        moves:int = self.moves
+        candidates:int = self.candidates if self.use_swaps else 0
+        use_flips:bool = self.use_flips
+        keys:list[int] = self.keys
+        revisit:bool = self.revisit_tenure > 0
+        best_score:float = best[0]
+        looked:int = 0
+        for dep in deps:
+            gain:int = gains[dep]
+            swap_candidate:bool = looked < candidates and gain + partner_gain > best_score # swap candidates are a prefix of the walk, len(seen) == looked
+            flip_candidate:bool = use_flips and gain > best_score
+            if not swap_candidate and not flip_candidate:
+                break
+            looked += 1
+            if swap_candidate:
+                seen.append(dep)
+            if not flip_candidate:
+                continue
+            if added and dep_sizes[dep] > free:
+                continue
+            if gain > aspiration:
+                score:float = gain
+            elif tabu_until[dep] > moves:
+                continue
+            else:
+                score = gain - self.penalty_scale * self.frequency[dep] / moves
+                if score > best_score and revisit and self._revisits(self.hash ^ keys[dep]):
+                    continue
+            if score > best_score:
+                best = (score, -1, dep) if added else (score, dep, -1)
+                best_score = score
+        add_evaluation_count(looked)
+        return best
+
+    # Best of best and the allowed swaps of the candidate pairs -> (score, removed, added)
+    # gain[added] + gain[removed] bounds the delta of a pair, and both lists come largest gain first
+    def _best_swap(self, additions:list[int], removals:list[int], free:int, aspiration:int, best:tuple[float, int, int]) -> tuple[float, int, int]:
+        if not additions or not removals:
+            return best
+        gains:list[int] = self.tracker.gains
+        missing:list[int] = self.evaluator.missing
+        dep_sizes:tuple[int, ...] = self.instance.dep_sizes
+        pack_benefits:tuple[int, ...] = self.instance.pack_benefits
+        dep_packs:tuple[tuple[int, ...], ...] = self.instance.dep_packs
+        pack_dep_sets:list[frozenset[int]] = self.pack_dep_sets
+        tabu_until:list[int] = self.tabu_until
+        frequency:list[int] = self.frequency
+        moves:int = self.moves
+        penalty:float = self.penalty_scale / moves
+        keys:list[int] = self.keys
+        revisit:bool = self.revisit_tenure > 0
+        best_removal_gain:int = gains[removals[0]]
+        pairs:int = 0
+
+        for added in additions:
+            added_gain:int = gains[added]
+            if added_gain + best_removal_gain <= best[0]:
+                break
+            completed:list[int] | None = None # packs that only added misses, found on the first pair that fits
+            added_tabu:bool = tabu_until[added] > moves
+            for removed in removals:
+                delta:int = added_gain + gains[removed]
+                if delta <= best[0]:
+                    break
+                if dep_sizes[added] - dep_sizes[removed] > free:
+                    continue
+                pairs += 1
+                if completed is None:
+                    completed = [pack for pack in dep_packs[added] if missing[pack] == 1] if added_gain > 0 else []
+                for pack in completed:
+                    if removed in pack_dep_sets[pack]:
+                        delta -= pack_benefits[pack]
+                if delta > aspiration:
+                    score:float = delta
+                elif added_tabu or tabu_until[removed] > moves:
+                    continue
+                else:
+                    score = delta - penalty*(frequency[added] + frequency[removed])
+                    if score > best[0] and revisit and self._revisits(self.hash ^ keys[added] ^ keys[removed]):
+                        continue
+                if score > best[0]:
+                    best = (score, removed, added)
+        add_evaluation_count(pairs)
+        return best
+
+    # Largest gain of one side, -inf if it's empty
+    def _top_gain(self, side:SortedKeys) -> float:
+        top:int = side.top()
+        return self.tracker.gains[top] if top >= 0 else float("-inf")
+
+    # Keys: gain first, then the lowest dep
+    # Equal gains (a plateau) are broken by near for additions, so a dep that completes nothing still brings the packs
+    # closest to completion one step closer, then by size: smaller additions, larger removals (more capacity left)
+    def _addition_key(self, dep:int) -> int:
+        return self.tracker.gains[dep]*self.addition_gain_weight + self.tracker.near[dep]*self.near_weight + self.addition_ties[dep]
+
+    def _removal_key(self, dep:int) -> int:
+        return self.tracker.gains[dep]*self.removal_gain_weight + self.removal_ties[dep]
+
+''' Functions '''
+
+# Stagnation cap of tabu_search: max_tries, or TRIES_PER_DEP_DEFAULT moves per dep if it's None
+def get_max_tries(num_deps:int, max_tries:int | None = MAX_TRIES_DEFAULT) -> int:
+    return max_tries if max_tries is not None else TRIES_PER_DEP_DEFAULT * max(num_deps, 1)
+
+# Tabu search from sol (must fit the capacity) -> (best solution, best benefit, moves made)
+# Stops after max_tries moves without a new best (get_max_tries) or when the budget expires - a budget passed down replaces time_limit
+def tabu_search(sol:list[bool], pack_benefits:list[int], dep_sizes:list[int], pack_dep:list[tuple[int, int]], capacity:int, neighborhood_names:list[str] = [], tenure:int = TENURE_DEFAULT, tenure_random:int = TENURE_RANDOM_DEFAULT, frequency_weight:float = FREQUENCY_WEIGHT_DEFAULT, time_limit:float = TIME_LIMIT_DEFAULT, max_tries:int | None = MAX_TRIES_DEFAULT, budget:Budget | None = None, revisit_tenure:int = REVISIT_TENURE_DEFAULT) -> tuple[list[bool], int, int]:
+    budget = get_budget(budget, time_limit)
+    instance:Instance = compile_instance(pack_benefits, dep_sizes, pack_dep, capacity)
+    max_tries = get_max_tries(instance.num_deps, max_tries)
+    search:TabuSearch = TabuSearch(instance, sol, tenure, tenure_random, frequency_weight, neighborhood_names=neighborhood_names, revisit_tenure=revisit_tenure)
+    tries:int = 0
+    while tries < max_tries and not budget.expired():
+        best_benefit:int = search.best_benefit
+        search.step()
+        tries = 0 if search.best_benefit > best_benefit else tries + 1
+        budget.report(search.evaluator.get_benefit())
+    return search.best_sol, search.best_benefit, search.moves
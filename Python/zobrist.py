@@ -0,0 +1,59 @@
+# Python 3.13.4
+
+import random
+from functools import reduce
+from itertools import compress
+from operator import xor
+
+ZOBRIST_SEED:int = 0x5EED_2B15 # same keys in every process and run, so hashes can be compared between them
+ZOBRIST_BITS:int = 64
+
+''' Zobrist keys '''
+# Every dep gets a random 64-bit key, the hash of a solution is the xor of the keys of its selected deps
+# Flipping dep changes the hash by keys[dep] (O(1)), any k-bit edit by k xors
+# Deps past the end of a short solution count as not selected (same as evaluate_packs), so the hash doesn't depend on the length
+# The keys are generated once, in order, by their own Random: the global random sequence of a seeded run isn't touched
+
+_keys:list[int] = []
+_random:random.Random = random.Random(ZOBRIST_SEED)
+
+# Keys of deps 0..num_deps-1 (the list can be longer), extended on demand
+def get_zobrist_keys(num_deps:int) -> list[int]:
+    while len(_keys) < num_deps:
+        _keys.append(_random.getrandbits(ZOBRIST_BITS))
+    return _keys
+
+''' Functions '''
+
+# Full hash of sol, O(len(sol))
+def zobrist_hash(sol:list[bool]) -> int:
+    return reduce(xor, compress(get_zobrist_keys(len(sol)), sol), 0)
+
+# Hash after flipping every dep in deps (a dep flipped twice cancels, same as the solution)
+def flip_hash(hash:int, deps:list[int]) -> int:
+    keys:list[int] = get_zobrist_keys(max(deps, default=-1) + 1)
+    for dep in deps:
+        hash ^= keys[dep]
+    return hash
+
+# Hash of sol[start:end]
+def segment_hash(sol:list[bool], start:int, end:int) -> int:
+    return reduce(xor, compress(get_zobrist_keys(end)[start:end], sol[start:end]), 0)
+
+# Hashes of the two offsprings genetic_algorithm.crossover_at builds from these parents and points (ending with len(sol))
+# Offspring 1 is parent1 with the odd segments of parent2 and offspring 2 the other way round, so both differ from their
+# parent by the same D = xor of segment_hash(parent1) ^ segment_hash(parent2) over the odd segments
+# Over all segments that xor is hash1 ^ hash2, so D is taken from the odd or the even segments, whichever are shorter
+def crossover_hashes(parent1:list[bool], hash1:int, parent2:list[bool], hash2:int, points:list[int]) -> tuple[int, int]:
+    segments:list[list[tuple[int, int]]] = [[], []] # even, odd segments
+    lengths:list[int] = [0, 0]
+    previous_point:int = 0
+    for i, point in enumerate(points):
+        segments[i % 2].append((previous_point, point))
+        lengths[i % 2] += point - previous_point
+        previous_point = point
+    shorter:int = 0 if lengths[0] < lengths[1] else 1
+    difference:int = 0 if shorter == 1 else hash1 ^ hash2
+    for start, end in segments[shorter]:
+        difference ^= segment_hash(parent1, start, end) ^ segment_hash(parent2, start, end)
+    return hash1 ^ difference, hash2 ^ difference